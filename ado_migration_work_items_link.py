@@ -2,6 +2,10 @@ import os
 import requests
 import base64
 import re
+import json
+import subprocess
+import time
+import concurrent.futures
 
 from dotenv import load_dotenv
 
@@ -20,6 +24,48 @@ TARGET_ORGANIZATION=os.getenv("TARGET_ORGANIZATION")
 TARGET_PROJECT=os.getenv("TARGET_PROJECT")
 TARGET_PAT = os.getenv("TARGET_PAT")
 
+# Optional - a local Git repository converted by 'git-tfs' and the name of the target Git repository it was pushed to.
+# When set, TFVC changeset links are remapped to the Git commits that 'git-tfs' produced (TFVC-to-Git migrations).
+LOCAL_GIT_REPOSITORY_PATH = os.getenv("LOCAL_GIT_REPOSITORY_PATH")
+TARGET_GIT_REPOSITORY_NAME = os.getenv("TARGET_GIT_REPOSITORY_NAME")
+
+# List APIs (commits, changesets and pull requests) are fetched page by page - 'PAGE_SIZE' objects per request.
+# When 'PAGING_WORKERS' is greater than 1, the pages are fetched concurrently ('$skip' windows).
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", 1000))
+PAGING_WORKERS = int(os.getenv("PAGING_WORKERS", 1))
+
+# Linked commits are confirmed in the target repositories in bulk - 'COMMITS_BATCH_SIZE' commits per commits batch API request.
+COMMITS_BATCH_SIZE = int(os.getenv("COMMITS_BATCH_SIZE", 100))
+# A commits batch request that is throttled (429), fails on the server side (5xx) or fails to connect is retried up to 'COMMITS_BATCH_RETRIES'
+# times, waiting for the 'Retry-After' header (or an exponential backoff) between the attempts.
+COMMITS_BATCH_RETRIES = int(os.getenv("COMMITS_BATCH_RETRIES", 5))
+
+# Links are created in bulk - the links of each work item are grouped into one JSON-patch document, and the documents of up to
+# 'LINKS_BATCH_SIZE' work items are sent per work item batch API request (200 at most).
+LINKS_BATCH_SIZE = int(os.getenv("LINKS_BATCH_SIZE", 200))
+
+# The relations of the target work items are preloaded in bulk, and only the missing links are added. When 'REMOVE_STALE_LINKS' is enabled,
+# codebase links of a target work item that are not links of its source work item are removed as well (the target matches the source).
+REMOVE_STALE_LINKS = os.getenv("REMOVE_STALE_LINKS", "false").lower() == "true"
+CODEBASE_LINK_PREFIXES = ("vstfs:///Git/", "vstfs:///VersionControl/Changeset/")
+
+# Work items are fetched in batches of 200 by 'WORK_ITEM_FETCH_WORKERS' workers concurrently, and each caller downloads only what it needs:
+# • "fields" - only the fields that the work items are mapped by.
+# • "relations" - the fields and the relations (links) of the work items; the API cannot combine a fields projection with an expansion.
+# • "all" - all fields, relations and links.
+WORK_ITEM_FETCH_WORKERS = int(os.getenv("WORK_ITEM_FETCH_WORKERS", 8))
+WORK_ITEM_PROFILES = {
+    "fields": {"fields": "System.Id,System.Title,System.WorkItemType"},
+    "relations": {"$expand": "relations"},
+    "all": {"$expand": "all"}
+}
+
+# Work item IDs are enumerated by WIQL queries over ranges of 'WIQL_PARTITION_SIZE' IDs, queried by 'WIQL_WORKERS' workers concurrently.
+# A WIQL query returns at most 'WIQL_RESULT_CAP' work items, so a range that hits the cap is split in halves and queried again.
+WIQL_RESULT_CAP = 20000
+WIQL_PARTITION_SIZE = int(os.getenv("WIQL_PARTITION_SIZE", 100000))
+WIQL_WORKERS = int(os.getenv("WIQL_WORKERS", 4))
+
 # Azure DevOps REST APIs require Basic Authentication, and since PAT is used here, the username is not required.
 # Encoding ensures that special characters in the PAT (such as : or @) are safely transmitted without breaking the HTTP header's format.
 SOURCE_AUTHENTICATION_HEADER = {
@@ -60,75 +106,181 @@ def get_project_id(organization, project_name, authentication_header):
         print(f"\033[1;31m[ERROR] An error occurred while fetching project ID: {e}\033[0m")
         return None
 
-def get_work_items(organization, project_name, authentication_header, work_item_ids=None):
+def get_work_items_batch(organization, project_name, authentication_header, batch_ids, profile="all"):
     """
-    This function fetches all work items of a project.
+    This function fetches a single batch of work items (up to 200), projected by a 'WORK_ITEM_PROFILES' profile.
+
+    Returns: List of work items (an empty list if the batch could not be retrieved).
     """
     api_version = "7.1"
-    
-    #print("##############################")
-    print(f"\n[INFO] Fetching work items from '{project_name}' in '{organization}'...")
-    
+    url = f"{organization}/{project_name}/_apis/wit/workitems"
+
+    params = {
+        "ids": ",".join(map(str, batch_ids)), # Converts the list of IDs to a comma-separated string.
+        "api-version": api_version,
+        **WORK_ITEM_PROFILES[profile]
+    }
+
     try:
-        if work_item_ids is not None:
-            if len(work_item_ids) == 0:
-                print(f"[INFO] No work item IDs provided, returning empty list.")
-                return []
-            
-            work_items = []
-            batch_size = 200  # Azure DevOps' API limit.
-            
-            for i in range(0, len(work_item_ids), batch_size):
-                batch_ids = work_item_ids[i:i+batch_size]
-                ids_parameters = ",".join(map(str, batch_ids)) # Converts the list of IDs to a comma-separated string.
+        response = requests.get(url, headers=authentication_header, params=params)
+        #print(f"[DEBUG] Request's Status Code: {response.status_code}")
 
-                # The '$expand=all' parameter requests all related information for each work item.
-                url = f"{organization}/{project_name}/_apis/wit/workitems?ids={ids_parameters}&api-version={api_version}&$expand=all"
-                
-                response = requests.get(url, headers=authentication_header)
-                #print(f"[DEBUG] Request's Status Code: {response.status_code}")
+        if response.status_code == 200:
+            batch_items = response.json().get("value", [])
+            #print(f"\n{batch_items}\n")
+            print(f"[INFO] Retrieved {len(batch_items)} work items in batch.")
+            return batch_items
 
-                if response.status_code == 200:
-                    batch_items = response.json().get("value", [])
-                    #print(f"\n{batch_items}\n")
-                    work_items.extend(batch_items)
-                    print(f"[INFO] Retrieved {len(batch_items)} work items in batch.")
+        else:
+            print(f"\033[1;31m[ERROR] Failed to fetch work items batch from '{project_name}' project.\033[0m")
+            print(f"[DEBUG] Request's Status Code: {response.status_code}")
+            print(f"[DEBUG] Response Body: {response.text}")
+            return []
+
+    except requests.exceptions.RequestException as e:
+        print(f"\033[1;31m[ERROR] An error occurred while fetching work items batch: {e}\033[0m")
+        return []
+
+def query_work_item_ids(organization, project_name, authentication_header, min_id=None, max_id=None, top=WIQL_RESULT_CAP, descending=False):
+    """
+    This function queries the IDs of the (basic) work items of a project, optionally within an ID range ('min_id' inclusive, 'max_id' exclusive).
+
+    Returns: List of work item IDs (at most 'top'), or None if the query failed.
+    """
+    api_version = "7.1"
+    wiql_url = f"{organization}/{project_name}/_apis/wit/wiql?$top={top}&api-version={api_version}"
+
+    id_range = ""
+
+    if min_id is not None:
+        id_range += f" AND [System.Id] >= {min_id}"
+
+    if max_id is not None:
+        id_range += f" AND [System.Id] < {max_id}"
+
+    wiql_query = {
+        "query": "SELECT [System.Id] FROM WorkItems WHERE [System.TeamProject] = @project AND [System.WorkItemType] NOT IN ('Test Case', 'Test Suite', 'Test Plan','Shared Steps','Shared Parameter','Feedback Request')"
+                 f"{id_range} ORDER BY [System.Id]{' DESC' if descending else ''}"
+    } # Queries only for basic work items in the project.
+
+    try:
+        wiql_response = requests.post(wiql_url, headers=authentication_header, json=wiql_query)
+        #print(f"[DEBUG] Request's Status Code: {wiql_response.status_code}")
+
+        if wiql_response.status_code == 200:
+            return [item["id"] for item in wiql_response.json().get("workItems", [])]
 
-                else:
-                    print(f"\033[1;31m[ERROR] Failed to fetch work items batch from '{project_name}' project.\033[0m")
-                    print(f"[DEBUG] Request's Status Code: {response.status_code}")
-                    print(f"[DEBUG] Response Body: {response.text}")
-            
-            print(f"[INFO] Successfully retrieved {len(work_items)} work items.")
-            return work_items
-            
         else:
-            wiql_url = f"{organization}/{project_name}/_apis/wit/wiql?api-version={api_version}"
-            wiql_query = {
-                "query": "SELECT [System.Id] FROM WorkItems WHERE [System.TeamProject] = @project AND [System.WorkItemType] NOT IN ('Test Case', 'Test Suite', 'Test Plan','Shared Steps','Shared Parameter','Feedback Request') ORDER BY [System.Id]"
-            } # Queries only for basic work items in the project.
-            
-            wiql_response = requests.post(wiql_url, headers=authentication_header, json=wiql_query)
-            #print(f"[DEBUG] Request's Status Code: {wiql_response.status_code}")
-            
-            if wiql_response.status_code == 200:
-                work_item_references = wiql_response.json().get("workItems", [])
-                all_work_item_ids = [item["id"] for item in work_item_references]
-                
-                print(f"[INFO] Found {len(all_work_item_ids)} work item IDs.")
-                
-                # Calls the function recursively to fetch all work items in batches.
-                return get_work_items(organization, project_name, authentication_header, work_item_ids=all_work_item_ids)
-            else:
-                print(f"\033[1;31m[ERROR] Failed to query work item IDs from '{project_name}' project.\033[0m")
-                print(f"[DEBUG] Request's Status Code: {wiql_response.status_code}")
-                print(f"[DEBUG] Response Body: {wiql_response.text}")
-                return []
-    
+            print(f"\033[1;31m[ERROR] Failed to query work item IDs from '{project_name}' project.\033[0m")
+            print(f"[DEBUG] Request's Status Code: {wiql_response.status_code}")
+            print(f"[DEBUG] Response Body: {wiql_response.text}")
+            return None
+
     except requests.exceptions.RequestException as e:
-        print(f"\033[1;31m[ERROR] An error occurred while fetching work items: {e}\033[0m")
+        print(f"\033[1;31m[ERROR] An error occurred while querying work item IDs: {e}\033[0m")
+        return None
+
+def iterate_work_item_ids(organization, project_name, authentication_header, partition_size=WIQL_PARTITION_SIZE, workers=WIQL_WORKERS):
+    """
+    This function is a generator that yields the IDs of all (basic) work items of a project, partition by partition.
+
+    A single WIQL query returns at most 'WIQL_RESULT_CAP' (20,000) work items, so the ID space is split into ranges of 'partition_size' IDs
+    that are queried concurrently. A range that hits the cap is split in halves and queried again, until every range is below the cap.
+    The IDs of each range are yielded as soon as its query completes (not in the order of the IDs). When a query fails,
+    'requests.exceptions.RequestException' is raised (so a partial enumeration is never taken as complete).
+    """
+    latest_ids = query_work_item_ids(organization, project_name, authentication_header, top=1, descending=True)
+
+    if latest_ids is None:
+        raise requests.exceptions.RequestException("Failed to query the latest work item ID")
+
+    if not latest_ids:
+        return
+
+    max_id = latest_ids[0] + 1
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending_partitions = {executor.submit(query_work_item_ids, organization, project_name, authentication_header, min_id, min(min_id + partition_size, max_id)):
+                              (min_id, min(min_id + partition_size, max_id)) for min_id in range(1, max_id, partition_size)}
+
+        while pending_partitions:
+            done_partitions, _ = concurrent.futures.wait(pending_partitions, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done_partitions:
+                min_id, partition_max_id = pending_partitions.pop(future)
+                partition_ids = future.result()
+
+                if partition_ids is None:
+                    for pending_future in pending_partitions:
+                        pending_future.cancel()
+
+                    raise requests.exceptions.RequestException(f"Failed to query the work item IDs {min_id}-{partition_max_id - 1}")
+
+                # The partition may have been truncated by the cap, so it is split in halves (a range narrower than the cap cannot hit it).
+                if len(partition_ids) >= WIQL_RESULT_CAP and partition_max_id - min_id > WIQL_RESULT_CAP:
+                    middle_id = (min_id + partition_max_id) // 2
+                    print(f"[INFO] The work item IDs {min_id}-{partition_max_id - 1} hit the WIQL result cap; splitting the range in halves...")
+
+                    for sub_min_id, sub_max_id in ((min_id, middle_id), (middle_id, partition_max_id)):
+                        pending_partitions[executor.submit(query_work_item_ids, organization, project_name, authentication_header, sub_min_id, sub_max_id)] = (sub_min_id, sub_max_id)
+
+                    continue
+
+                yield partition_ids
+
+def get_work_items(organization, project_name, authentication_header, work_item_ids=None, profile="all", workers=WORK_ITEM_FETCH_WORKERS):
+    """
+    This function fetches all work items of a project.
+
+    • The work items are fetched in batches of 200 by a pool of 'workers' concurrently, and reassembled in the order of 'work_item_ids'.
+    • 'profile' selects what is downloaded for each work item (see 'WORK_ITEM_PROFILES') - e.g., "fields" for mapping by title and type,
+      or "relations" for reading the links.
+    • When no IDs are provided, the IDs are enumerated by partitioned WIQL queries ('iterate_work_item_ids'), and the batches of each
+      partition are fetched as soon as the partition's query completes.
+
+    Returns: List of work items, or None if the work item IDs could not be enumerated.
+    """
+    #print("##############################")
+    print(f"\n[INFO] Fetching work items from '{project_name}' in '{organization}' (profile: '{profile}')...")
+
+    if work_item_ids is not None and len(work_item_ids) == 0:
+        print(f"[INFO] No work item IDs provided, returning empty list.")
         return []
 
+    work_items = []
+    batch_size = 200  # Azure DevOps' API limit.
+    found_ids_count = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        batch_futures = []
+        id_partitions = [work_item_ids] if work_item_ids is not None else iterate_work_item_ids(organization, project_name, authentication_header)
+
+        try:
+            for partition_ids in id_partitions:
+                found_ids_count += len(partition_ids)
+                batch_futures.extend(executor.submit(get_work_items_batch, organization, project_name, authentication_header, partition_ids[i:i+batch_size], profile)
+                                     for i in range(0, len(partition_ids), batch_size))
+
+        except requests.exceptions.RequestException as e:
+            print(f"\033[1;31m[ERROR] An error occurred while enumerating work items (after {found_ids_count} work item IDs): {e}\033[0m")
+
+            for future in batch_futures:
+                future.cancel()
+
+            return None
+
+        for future in batch_futures:
+            work_items.extend(future.result())
+
+    if work_item_ids is None:
+        print(f"[INFO] Found {found_ids_count} work item IDs.")
+
+        # The partitions complete in any order, so the work items are reassembled in the order of their IDs.
+        work_items.sort(key=lambda work_item: work_item.get('id', 0))
+
+    print(f"[INFO] Successfully retrieved {len(work_items)} work items.")
+    return work_items
+
 def get_codebase_objects(organization, project_name, authentication_header, repository_info=None):
     """
     This function fetches all codebase objects of a repository.
@@ -197,6 +349,9 @@ def get_codebase_objects(organization, project_name, authentication_header, repo
         if has_tfvc:
             print(f"[INFO] A TFVC-based repository was detected, fetching TFVC codebase objects...")
             result['tfvc']['changesets'] = get_tfvc_changesets(organization, project_name, authentication_header)
+
+            if result['tfvc']['changesets'] is None:
+                return None
         
         # Has Git repositories.
         for repo in git_repos:
@@ -205,8 +360,15 @@ def get_codebase_objects(organization, project_name, authentication_header, repo
 
             print(f"[INFO] Fetching Git codebase objects for repository '{repository_name}' (id: '{repository_id}')...")
             
-            result['git']['commits'].extend(get_git_commits(organization, project_name, authentication_header, repository_id))
-            result['git']['pull_requests'].extend(get_git_pullrequests(organization, project_name, authentication_header, repository_id))
+            commits = get_git_commits(organization, project_name, authentication_header, repository_id)
+            pull_requests = get_git_pullrequests(organization, project_name, authentication_header, repository_id)
+
+            # A partial listing is never returned as complete.
+            if commits is None or pull_requests is None:
+                return None
+
+            result['git']['commits'].extend(commits)
+            result['git']['pull_requests'].extend(pull_requests)
             result['git']['branches'].extend(get_git_branches(organization, project_name, authentication_header, repository_id))
     
     else:
@@ -216,12 +378,18 @@ def get_codebase_objects(organization, project_name, authentication_header, repo
         if repository_type == 'tfvc':
             print(f"[INFO] Fetching TFVC codebase objects...")
             result['tfvc']['changesets'] = get_tfvc_changesets(organization, project_name, authentication_header)
+
+            if result['tfvc']['changesets'] is None:
+                return None
         
         elif repository_type == 'git' and repository_id:
             print(f"[INFO] Fetching Git codebase objects for repository id '{repository_id}'...")
             result['git']['commits'] = get_git_commits(organization, project_name, authentication_header, repository_id)
             result['git']['pull_requests'] = get_git_pullrequests(organization, project_name, authentication_header, repository_id)
             result['git']['branches'] = get_git_branches(organization, project_name, authentication_header, repository_id)
+
+            if result['git']['commits'] is None or result['git']['pull_requests'] is None:
+                return None
         
         else:
             print(f"\033[1;31m[ERROR] Invalid repository details; must include 'type' ('tfvc' or 'git') field and 'id' field for Git repositories.\033[0m")
@@ -236,38 +404,123 @@ def get_codebase_objects(organization, project_name, authentication_header, repo
     
     return result
 
+def get_objects_page(url, authentication_header, params):
+    """
+    This function fetches a single page of objects.
+
+    Returns: Tuple (objects, continuation_token).
+    Raises: 'requests.exceptions.RequestException' if the page could not be retrieved (so a partial listing is never taken as complete).
+    """
+    response = requests.get(url, headers=authentication_header, params=params)
+
+    if response.status_code != 200:
+        print(f"\033[1;31m[ERROR] Failed to fetch a page of objects from '{url}'.\033[0m")
+        print(f"[DEBUG] Request's Status Code: {response.status_code}")
+        print(f"[DEBUG] Response Body: {response.text}")
+        raise requests.exceptions.HTTPError(f"{response.status_code} while fetching a page of objects", response=response)
+
+    return response.json().get("value", []), response.headers.get("x-ms-continuationtoken")
+
+def iterate_paged_objects(url, authentication_header, params=None, page_size=PAGE_SIZE, top_parameter="$top", skip_parameter="$skip",
+                          workers=PAGING_WORKERS):
+    """
+    This function is a generator that yields all objects of a paged Azure DevOps list API.
+
+    • Pages are requested with the 'top_parameter' and 'skip_parameter' query parameters; when the server returns a continuation token
+      (the 'x-ms-continuationtoken' header), the next page is requested by the token instead.
+    • When 'workers' is greater than 1, pages are requested concurrently in '$skip' windows - 'workers' windows at a time, until a page
+      comes back empty (the list APIs do not report the total number of objects).
+
+    A partially filled page does not end the listing, as the server may cap '$top' below 'page_size'; the listing ends on an empty page.
+
+    The objects are yielded in the server's order. When a page fails, 'requests.exceptions.RequestException' is raised.
+    """
+    params = dict(params or {})
+
+    if workers > 1:
+        yield from iterate_paged_objects_concurrently(url, authentication_header, params, page_size, top_parameter, skip_parameter, workers)
+        return
+
+    skip = 0
+    continuation_token = None
+
+    while True:
+        page_params = dict(params, **{top_parameter: page_size})
+
+        if continuation_token:
+            page_params["continuationToken"] = continuation_token
+
+        else:
+            page_params[skip_parameter] = skip
+
+        objects, continuation_token = get_objects_page(url, authentication_header, page_params)
+        yield from objects
+        skip += len(objects)
+
+        if not continuation_token and not objects:
+            return
+
+def iterate_paged_objects_concurrently(url, authentication_header, params, page_size, top_parameter, skip_parameter, workers):
+    """
+    This function is a generator that yields all objects of a paged Azure DevOps list API, requesting '$skip' windows concurrently.
+
+    A partially filled window means that the server caps the page size (or that the list ends), so the windows are shrunk to the
+    returned page size and requested again from the next object - no object is skipped between the windows.
+    """
+    next_skip = 0
+    window_size = page_size
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            futures = [(skip, executor.submit(get_objects_page, url, authentication_header, dict(params, **{top_parameter: window_size, skip_parameter: skip})))
+                       for skip in range(next_skip, next_skip + workers * window_size, window_size)]
+
+            try:
+                for skip, future in futures:
+                    objects = future.result()[0]
+                    yield from objects
+                    next_skip = skip + len(objects)
+
+                    if not objects:
+                        return
+
+                    if len(objects) < window_size:
+                        window_size = len(objects)
+                        break
+
+            finally:
+                for skip, future in futures:
+                    future.cancel()
+
 def get_tfvc_changesets(organization, project_name, authentication_header):
     """
-    This function fetches all changesets of a TFVC repository.
+    This function fetches all changesets of a TFVC repository (page by page, see 'iterate_paged_objects').
+
+    Returns: List of changesets, or None if any page could not be retrieved.
     """
     api_version = "7.1"
-    url = f"{organization}/{project_name}/_apis/tfvc/changesets?api-version={api_version}"
+    url = f"{organization}/{project_name}/_apis/tfvc/changesets"
+    params = {
+        "api-version": api_version
+    }
 
     print(f"\n[INFO] Fetching TFVC changesets from '{project_name}' in '{organization}'...")
-    
+
+    changesets = []
+
     try:
-        response = requests.get(url, headers=authentication_header)
-        #print(f"[DEBUG] Request's Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            changesets = response.json().get("value", [])
-            print(f"[INFO] Found {len(changesets)} TFVC changeset(s).")
-            
+        for changeset in iterate_paged_objects(url, authentication_header, params):
             # Appends source control type for reference.
-            for changeset in changesets:
-                changeset["sourceControlType"] = "TFVC"
-            
-            return changesets
-        
-        else:
-            print(f"\033[1;31m[ERROR] Failed to fetch TFVC changesets.\033[0m")
-            print(f"[DEBUG] Request's Status Code: {response.status_code}")
-            print(f"[DEBUG] Response Body: {response.text}")
-            return []
-            
+            changeset["sourceControlType"] = "TFVC"
+            changesets.append(changeset)
+
     except requests.exceptions.RequestException as e:
-        print(f"\033[1;31m[ERROR] An error occurred while fetching TFVC changesets: {e}\033[0m")
-        return []
+        print(f"\033[1;31m[ERROR] An error occurred while fetching TFVC changesets (after {len(changesets)} changesets): {e}\033[0m")
+        return None
+
+    print(f"[INFO] Found {len(changesets)} TFVC changeset(s).")
+
+    return changesets
 
 def get_git_repositories(organization, project_name, authentication_header):
     """
@@ -309,71 +562,136 @@ def get_git_repositories(organization, project_name, authentication_header):
 
 def get_git_commits(organization, project_name, authentication_header, repository_id):
     """
-    This function fetches all commits of a Git repository.
+    This function fetches all commits of a Git repository (page by page, see 'iterate_paged_objects').
+
+    Returns: List of commits, or None if any page could not be retrieved.
     """
     api_version = "7.1"
-    url = f"{organization}/{project_name}/_apis/git/repositories/{repository_id}/commits?api-version={api_version}"
+    url = f"{organization}/{project_name}/_apis/git/repositories/{repository_id}/commits"
+    params = {
+        "api-version": api_version
+    }
 
     print(f"\n[INFO] Fetching Git commits from repository id '{repository_id}'...")
-    
+
+    commits = []
+
     try:
-        response = requests.get(url, headers=authentication_header)
-        #print(f"[DEBUG] Request's Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            commits = response.json().get("value", [])
-            print(f"[INFO] Found {len(commits)} Git commit(s) in repository id '{repository_id}'.")
-            
+        for commit in iterate_paged_objects(url, authentication_header, params, top_parameter="searchCriteria.$top", skip_parameter="searchCriteria.$skip"):
             # Appends repository and source control info for reference.
-            for commit in commits:
-                commit["repositoryId"] = repository_id
-                commit["sourceControlType"] = "Git"
-            
-            return commits
-        
-        else:
-            print(f"\033[1;31m[ERROR] Failed to fetch Git commits.\033[0m")
-            print(f"[DEBUG] Request's Status Code: {response.status_code}")
-            print(f"[DEBUG] Response Body: {response.text}")
-            return []
-            
+            commit["repositoryId"] = repository_id
+            commit["sourceControlType"] = "Git"
+            commits.append(commit)
+
     except requests.exceptions.RequestException as e:
-        print(f"\033[1;31m[ERROR] An error occurred while fetching Git commits: {e}\033[0m")
-        return []
+        print(f"\033[1;31m[ERROR] An error occurred while fetching Git commits (after {len(commits)} commits): {e}\033[0m")
+        return None
+
+    print(f"[INFO] Found {len(commits)} Git commit(s) in repository id '{repository_id}'.")
+
+    return commits
 
 def get_git_pullrequests(organization, project_name, authentication_header, repository_id):
     """
-    This function fetches all pull requests of a Git repository.
+    This function fetches all pull requests of a Git repository (page by page, see 'iterate_paged_objects').
+
+    Returns: List of pull requests, or None if any page could not be retrieved.
     """
     api_version = "7.1"
-    url = f"{organization}/{project_name}/_apis/git/repositories/{repository_id}/pullrequests?api-version={api_version}&searchCriteria.status=all"
+    url = f"{organization}/{project_name}/_apis/git/repositories/{repository_id}/pullrequests"
+    params = {
+        "api-version": api_version,
+        "searchCriteria.status": "all"
+    }
 
     print(f"\n[INFO] Fetching Git pull requests from repository id '{repository_id}'...")
 
+    pull_requests = []
+
     try:
-        response = requests.get(url, headers=authentication_header)
-        print(f"[DEBUG] Request's Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            pull_requests = response.json().get("value", [])
-            print(f"[INFO] Found {len(pull_requests)} Git pull request(s) in repository id '{repository_id}'.")
-            
+        for pr in iterate_paged_objects(url, authentication_header, params):
             # Appends repository and source control info for reference.
-            for pr in pull_requests:
-                pr["repositoryId"] = repository_id
-                pr["sourceControlType"] = "Git"
-            
-            return pull_requests
-        
+            pr["repositoryId"] = repository_id
+            pr["sourceControlType"] = "Git"
+            pull_requests.append(pr)
+
+    except requests.exceptions.RequestException as e:
+        print(f"\033[1;31m[ERROR] An error occurred while fetching Git pull requests (after {len(pull_requests)} pull requests): {e}\033[0m")
+        return None
+
+    print(f"[INFO] Found {len(pull_requests)} Git pull request(s) in repository id '{repository_id}'.")
+
+    return pull_requests
+
+def get_existing_git_commits(organization, project_name, authentication_header, repository_id, commit_ids, batch_size=COMMITS_BATCH_SIZE):
+    """
+    This function checks which of the given commits exist in a Git repository, in bulk (the commits batch API).
+
+    A batch that fails (e.g., because one of its commits does not exist) is split in halves, down to single commits, so the existing
+    commits of the batch are still found. A batch that fails transiently (throttling, server errors, connection errors) is retried.
+
+    Returns: Set of the commit hashes that exist in the repository, or None if a batch still fails after 'COMMITS_BATCH_RETRIES' retries.
+    """
+    api_version = "7.1"
+    url = f"{organization}/{project_name}/_apis/git/repositories/{repository_id}/commitsbatch?api-version={api_version}"
+
+    commit_ids = sorted(set(commit_ids))
+    pending_batches = [commit_ids[index:index + batch_size] for index in range(0, len(commit_ids), batch_size)]
+    existing_commits = set()
+
+    while pending_batches:
+        batch = pending_batches.pop()
+        payload = {
+            "ids": batch,
+            "$top": len(batch)
+        }
+
+        for attempt in range(COMMITS_BATCH_RETRIES + 1):
+            retry_after = 2 ** attempt
+
+            try:
+                response = requests.post(url, headers=authentication_header, json=payload)
+
+                if response.status_code != 429 and response.status_code < 500:
+                    break
+
+                print(f"\033[1;38;5;214m[WARNING] Failed to fetch a batch of {len(batch)} Git commits (status code {response.status_code}).\033[0m")
+                retry_after_header = response.headers.get("Retry-After", "")
+                
+                if retry_after_header.isdigit():
+                    retry_after = int(retry_after_header)
+
+            except requests.exceptions.RequestException as e:
+                response = None
+                print(f"\033[1;38;5;214m[WARNING] An error occurred while fetching a batch of Git commits: {e}\033[0m")
+
+            if attempt < COMMITS_BATCH_RETRIES:
+                print(f"[INFO] Retrying in {retry_after} second(s)... (attempt {attempt + 2}/{COMMITS_BATCH_RETRIES + 1})")
+                time.sleep(retry_after)
+
         else:
-            print(f"\033[1;31m[ERROR] Failed to fetch Git pull requests.\033[0m")
+            print(f"\033[1;31m[ERROR] Failed to fetch a batch of {len(batch)} Git commits after {COMMITS_BATCH_RETRIES + 1} attempt(s).\033[0m")
+            
+            if response is not None:
+                print(f"[DEBUG] Response Body: {response.text}")
+            
+            return None
+
+        if response.status_code == 200:
+            existing_commits.update(commit.get('commitId') for commit in response.json().get("value", []))
+            continue
+
+        if response.status_code not in (400, 404):
+            print(f"\033[1;31m[ERROR] Failed to fetch a batch of {len(batch)} Git commits.\033[0m")
             print(f"[DEBUG] Request's Status Code: {response.status_code}")
             print(f"[DEBUG] Response Body: {response.text}")
-            return []
-            
-    except requests.exceptions.RequestException as e:
-        print(f"\033[1;31m[ERROR] An error occurred while fetching Git pull requests: {e}\033[0m")
-        return []
+            return None
+
+        # The batch has (at least one) commit that does not exist in the repository.
+        if len(batch) > 1:
+            pending_batches.extend([batch[:len(batch) // 2], batch[len(batch) // 2:]])
+
+    return existing_commits
 
 def get_git_branches(organization, project_name, authentication_header, repository_id):
     """
@@ -558,9 +876,14 @@ def extract_work_item_references(work_items):
     return work_item_to_codebase
 
 def map_objects(source_organization, source_project, source_authentication_header,
-                              target_organization, target_project, target_authentication_header):
+                              target_organization, target_project, target_authentication_header, work_items_links=None):
     """
     Builds comprehensive mapping between source and target objects.
+
+    When the links of the source work items ('extract_work_item_references') are provided, only the linked commits are mapped - they are
+    confirmed in the target repositories in bulk, without listing the commits of either repository.
+
+    Returns: The mapping dictionary, or None if any listing failed (a partial mapping would silently drop links).
     """
     mapping = {
         'work_items': {},
@@ -568,7 +891,8 @@ def map_objects(source_organization, source_project, source_authentication_heade
         'git_commits': {},
         'git_branches': {},
         'git_pullrequests': {},
-        'tfvc_changesets': {}
+        'tfvc_changesets': {},
+        'tfvc_changeset_commits': {}
     }
     
     # Step 1: Maps work items by their title and type.
@@ -577,6 +901,9 @@ def map_objects(source_organization, source_project, source_authentication_heade
         target_organization, target_project, target_authentication_header
     )
 
+    if work_items_mapping is None:
+        return None
+
     mapping['work_items'] = work_items_mapping['work_items']
     
     # Step 2: Maps Git repositories by their name.
@@ -594,35 +921,49 @@ def map_objects(source_organization, source_project, source_authentication_heade
     
     # Step 3: For each mapped repository, maps commits, branches, and pull requests.
     for source_repository_id, target_repository_id in mapping['git_repositories'].items():
-        # Step 3.1: Maps Git commits by their hash value.
-        source_commits = get_git_commits(source_organization, source_project, source_authentication_header, source_repository_id)
-        target_commits = get_git_commits(target_organization, target_project, target_authentication_header, target_repository_id)
-        
-        for source_commit in source_commits:
-            source_hash = source_commit.get('commitId')
-            for target_commit in target_commits:
-                target_hash = target_commit.get('commitId')
-                if source_hash == target_hash:
-                    mapping['git_commits'][source_hash] = target_hash
-                    break
+        # Step 3.1: Maps Git commits by their hash value (a migrated commit keeps its hash).
+        if work_items_links is not None:
+            linked_commits = {link['id'] for links in work_items_links.values() for link in links
+                              if link['type'] == 'git_commit' and link.get('id') and link.get('repository_id') == source_repository_id}
+            target_hashes = get_existing_git_commits(target_organization, target_project, target_authentication_header, target_repository_id, linked_commits)
+
+            if target_hashes is None:
+                print(f"\033[1;31m[ERROR] Failed to confirm the linked commits in target repository id '{target_repository_id}'; the mapping is aborted.\033[0m")
+                return None
+
+            print(f"[INFO] {len(target_hashes)} out of {len(linked_commits)} linked commit(s) exist in target repository id '{target_repository_id}'.")
+
+        else:
+            source_commits = get_git_commits(source_organization, source_project, source_authentication_header, source_repository_id)
+            target_commits = get_git_commits(target_organization, target_project, target_authentication_header, target_repository_id)
+
+            if source_commits is None or target_commits is None:
+                print(f"\033[1;31m[ERROR] Failed to list the commits of repository id '{source_repository_id}'; the mapping is aborted.\033[0m")
+                return None
+
+            linked_commits = {source_commit.get('commitId') for source_commit in source_commits}
+            target_hashes = {target_commit.get('commitId') for target_commit in target_commits}
+
+        for source_hash in linked_commits & target_hashes:
+            mapping['git_commits'][source_hash] = source_hash
         
         # Step 3.2: Maps Git branches by their name.
         source_branches = get_git_branches(source_organization, source_project, source_authentication_header, source_repository_id)
         target_branches = get_git_branches(target_organization, target_project, target_authentication_header, target_repository_id)
-        
-        for source_branch in source_branches:
-            source_name = source_branch.get('name', '').replace('refs/heads/', '')
-            
-            for target_branch in target_branches:
-                target_name = target_branch.get('name', '').replace('refs/heads/', '')
-                
-                if source_name == target_name:
-                    mapping['git_branches'][source_name] = target_name
-                    break
+
+        source_branch_names = {source_branch.get('name', '').replace('refs/heads/', '') for source_branch in source_branches}
+        target_branch_names = {target_branch.get('name', '').replace('refs/heads/', '') for target_branch in target_branches}
+
+        for branch_name in source_branch_names & target_branch_names:
+            mapping['git_branches'][branch_name] = branch_name
         
         # Step 3.3: Maps Git pull requests by their title and associated work items.
         source_prs = get_git_pullrequests(source_organization, source_project, source_authentication_header, source_repository_id)
         target_prs = get_git_pullrequests(target_organization, target_project, target_authentication_header, target_repository_id)
+
+        if source_prs is None or target_prs is None:
+            print(f"\033[1;31m[ERROR] Failed to list the pull requests of repository id '{source_repository_id}'; the mapping is aborted.\033[0m")
+            return None
         '''
         pr_mapping = map_pull_requests(source_prs, target_prs, mapping['work_items'])
         mapping['git_pullrequests'].update(pr_mapping)
@@ -634,7 +975,22 @@ def map_objects(source_organization, source_project, source_authentication_heade
         target_organization, target_project, target_authentication_header
     )
 
+    if tfvc_changesets_mapping is None:
+        print(f"\033[1;31m[ERROR] Failed to map the TFVC changesets; the mapping is aborted.\033[0m")
+        return None
+
     mapping['tfvc_changesets'].update(tfvc_changesets_mapping)
+
+    # Step 5: Maps TFVC changesets to the Git commits produced by 'git-tfs' (TFVC-to-Git migrations).
+    if LOCAL_GIT_REPOSITORY_PATH and TARGET_GIT_REPOSITORY_NAME:
+        target_repository = next((repository for repository in target_repositories if repository.get('name') == TARGET_GIT_REPOSITORY_NAME), None)
+
+        if target_repository:
+            mapping['tfvc_changeset_commits'] = build_changeset_commit_index(LOCAL_GIT_REPOSITORY_PATH)
+            mapping['tfvc_changeset_commits_repository'] = target_repository.get('id')
+
+        else:
+            print(f"\033[1;38;5;214m[WARNING] Target Git repository '{TARGET_GIT_REPOSITORY_NAME}' was not found; TFVC changeset links will not be remapped to commits.\033[0m")
     
     return mapping
 
@@ -642,13 +998,19 @@ def map_work_items(source_organization, source_project, source_authentication_he
                           target_organization, target_project, target_authentication_header):
     """
     This function maps work items between source and target environments using title and type.
+
+    Returns: Dictionary {'work_items': {source_id: target_id}}, or None if the work items could not be enumerated.
     """
     work_items_mapping = {'work_items': {}}
     
     print("\n[INFO] Mapping work items...")
     
-    source_work_items = get_work_items(source_organization, source_project, source_authentication_header)
-    target_work_items = get_work_items(target_organization, target_project, target_authentication_header)
+    source_work_items = get_work_items(source_organization, source_project, source_authentication_header, profile="fields")
+    target_work_items = get_work_items(target_organization, target_project, target_authentication_header, profile="fields")
+
+    if source_work_items is None or target_work_items is None:
+        print(f"\033[1;31m[ERROR] Failed to enumerate the work items; the work items cannot be mapped.\033[0m")
+        return None
     
     # Creates a lookup dictionary for faster matching.
     target_lookup = {}
@@ -767,6 +1129,8 @@ def map_tfvc_changesets(source_organization, source_project, source_authenticati
                                target_organization, target_project, target_authentication_header):
     """
     This function maps TFVC changesets between source and target environments by examining changeset's comment.
+
+    Returns: Dictionary {source_changeset_id: target_changeset_id}, or None if the changesets could not be retrieved.
     """
     tfvc_changesets_mapping = {}
     multiple_mappings_count = 0
@@ -775,11 +1139,15 @@ def map_tfvc_changesets(source_organization, source_project, source_authenticati
     
     source_changesets = get_tfvc_changesets(source_organization, source_project, source_authentication_header)
     target_changesets = get_tfvc_changesets(target_organization, target_project, target_authentication_header)
+
+    if source_changesets is None or target_changesets is None:
+        return None
     
     # regex patterns to extract source changeset IDs from target comments.
     patterns = [
         r"Migrated from changeset no\. (\d+)",
-        r"Migrated changeset no\. (\d+)"
+        r"Migrated changeset no\. (\d+)",
+        r"^#(\d+(?:,#\d+)*)(?::|$)" # "#<id>: ..." or a coalesced group "#<id1>,#<id2>: ..." (the 'tfvc_to_tfvc_codebase.py' check-in comment).
     ]
     
     # Compiles the regex patterns for improved and efficient performance.
@@ -796,16 +1164,19 @@ def map_tfvc_changesets(source_organization, source_project, source_authenticati
             match = pattern.search(target_comment)
 
             if match:
-                source_id = int(match.group(1))
-                
-                # Because of a possible case(s) of multiple mappings, the function checks if the source ID is already mapped to a target ID.
-                # If it is, it will map the source ID to the most recent target ID.
-                if source_id in tfvc_changesets_mapping:
-                    multiple_mappings_count += 1
-                    print(f"[INFO] Source changeset {source_id} is currently mapped to target changeset {tfvc_changesets_mapping[source_id]}, "
-                          f"but will be remapped to a more recent target changeset {target_id}.")
-                
-                tfvc_changesets_mapping[source_id] = target_id
+                # All the changesets of a coalesced group are mapped to the same target changeset.
+                source_ids = [int(source_id) for source_id in match.group(1).replace('#', '').split(',')]
+
+                for source_id in source_ids:
+                    # Because of a possible case(s) of multiple mappings, the function checks if the source ID is already mapped to a target ID.
+                    # If it is, it will map the source ID to the most recent target ID.
+                    if source_id in tfvc_changesets_mapping:
+                        multiple_mappings_count += 1
+                        print(f"[INFO] Source changeset {source_id} is currently mapped to target changeset {tfvc_changesets_mapping[source_id]}, "
+                              f"but will be remapped to a more recent target changeset {target_id}.")
+                    
+                    tfvc_changesets_mapping[source_id] = target_id
+
                 break
     
     total_source = len(source_changesets)
@@ -816,6 +1187,76 @@ def map_tfvc_changesets(source_organization, source_project, source_authenticati
 
     return tfvc_changesets_mapping
 
+def build_changeset_commit_index(repository_path, index_file=None, rebuild=False):
+    """
+    This function builds a TFVC changeset → Git commit index from a local repository converted by 'git-tfs'.
+
+    'git-tfs' appends a 'git-tfs-id: [<collection_url>]<tfvc_path>;C<changeset_id>' line to every commit message it creates.
+    The function streams the 'git log' output once (line by line, so memory usage does not depend on the size of the history),
+    and saves the index to a JSON file so subsequent runs do not have to scan the repository again.
+
+    Returns:
+    • Dictionary mapping changeset IDs (int) to commit hashes, e.g. {42: '3f2a...'}
+    """
+    if index_file is None:
+        index_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "changeset_commit_index.json")
+
+    # The saved index is reused as long as it was built from the same repository state (the same refs).
+    refs_output = subprocess.run(["git", "for-each-ref", "--format=%(objectname) %(refname)"], cwd=repository_path,
+                                 capture_output=True, text=True)
+
+    if refs_output.returncode != 0:
+        print(f"\033[1;31m[ERROR] '{repository_path}' is not a Git repository: {refs_output.stderr.strip()}\033[0m")
+        return {}
+
+    refs_state = refs_output.stdout
+
+    if not rebuild and os.path.exists(index_file):
+        with open(index_file, "r") as f:
+            saved_index = json.load(f)
+
+        if saved_index.get("repository") == os.path.abspath(repository_path) and saved_index.get("refs") == refs_state:
+            print(f"[INFO] Loaded {len(saved_index['changesets'])} changeset → commit entries from '{index_file}'.")
+            return {int(changeset_id): commit for changeset_id, commit in saved_index["changesets"].items()}
+
+    print(f"\n[INFO] Indexing 'git-tfs' metadata in '{repository_path}'...")
+
+    git_tfs_id_pattern = re.compile(r"^git-tfs-id: \[.*?\].*;C(\d+)\s*$")
+    changeset_commit_index = {}
+    current_commit = None
+
+    # Every commit starts with a record separator (0x1E) followed by its hash, and then its full message.
+    process = subprocess.Popen(["git", "log", "--all", "--format=%x1e%H%n%B"], cwd=repository_path,
+                               stdout=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+
+    for line in process.stdout:
+        if line.startswith("\x1e"):
+            current_commit = line[1:].strip()
+            continue
+
+        match = git_tfs_id_pattern.match(line)
+
+        if match and current_commit:
+            # 'git log' lists newer commits first, so the first commit found for a changeset is kept (e.g. over a later cherry-pick).
+            changeset_commit_index.setdefault(int(match.group(1)), current_commit)
+
+    process.wait()
+
+    if process.returncode != 0:
+        print(f"\033[1;31m[ERROR] Failed to read the history of '{repository_path}'.\033[0m")
+        return {}
+
+    with open(index_file, "w") as f:
+        json.dump({
+            "repository": os.path.abspath(repository_path),
+            "refs": refs_state,
+            "changesets": {str(changeset_id): commit for changeset_id, commit in changeset_commit_index.items()}
+        }, f, indent=4)
+
+    print(f"[INFO] Indexed {len(changeset_commit_index)} TFVC changeset(s); index saved to '{index_file}'.")
+
+    return changeset_commit_index
+
 def link_work_items(target_organization, target_project, target_authentication_header):
     """
     This function replicates links between work items and codebase objects from source environment to target environment.
@@ -832,18 +1273,31 @@ def link_work_items(target_organization, target_project, target_authentication_h
         'success': 0,
         'failed': 0,
         'skipped': 0,
+        'removed': 0,
         'details': {}
     }
 
-    source_work_items = get_work_items(SOURCE_ORGANIZATION, SOURCE_PROJECT, SOURCE_AUTHENTICATION_HEADER)
+    source_work_items = get_work_items(SOURCE_ORGANIZATION, SOURCE_PROJECT, SOURCE_AUTHENTICATION_HEADER, profile="relations")
+
+    if source_work_items is None:
+        print(f"\033[1;31m[ERROR] Failed to enumerate the source work items; no links were recreated.\033[0m")
+        return results
+
     work_items_links = extract_work_item_references(source_work_items)
     objects_mapping = map_objects(SOURCE_ORGANIZATION, SOURCE_PROJECT, SOURCE_AUTHENTICATION_HEADER,
-                                  TARGET_ORGANIZATION, TARGET_PROJECT, TARGET_AUTHENTICATION_HEADER)
+                                  TARGET_ORGANIZATION, TARGET_PROJECT, TARGET_AUTHENTICATION_HEADER, work_items_links)
+
+    if objects_mapping is None:
+        print(f"\033[1;31m[ERROR] Failed to map the codebase objects; no links were recreated.\033[0m")
+        return results
 
     work_item_id_map = {}
 
     if objects_mapping and 'work_items' in objects_mapping:
         work_item_id_map = objects_mapping['work_items']
+
+    # The target project ID is part of every Git reference URL, so it is resolved only once.
+    target_project_id = get_project_id(target_organization, target_project, target_authentication_header)
     
     '''{
         '123': [
@@ -864,62 +1318,142 @@ def link_work_items(target_organization, target_project, target_authentication_h
         print("\n" + "\033[1m-\033[0m" * 50)
         print(f"[INFO] Recreating links for the following mapped work items: {source_work_item_id} → {target_work_item_id}")
         
-        work_item_results = {
+        # Several source work items can be mapped to the same target work item, so their links are accumulated into one record.
+        work_item_results = results['details'].setdefault(target_work_item_id, {
             'success': 0,
             'failed': 0,
             'skipped': 0,
+            'removed': 0,
+            'unresolved': 0,
             'links': []
-        }
+        })
         
         for link in codebase_links:
             link_type = link.get('type')
             link_name = link.get('name')
             source_link_url = link.get('url')
             
-            target_reference = create_target_reference_url(link, objects_mapping)
+            target_reference = create_target_reference_url(link, objects_mapping, target_project_id)
             
             if not target_reference:
                 print(f"\033[1;38;5;214m[WARNING] Could not create target reference url for '{link_type}' link type. Skipping...\033[0m")
                 work_item_results['skipped'] += 1
+                work_item_results['unresolved'] += 1
                 continue
-            
-            # Creates the link in the target environment.
-            success, message = create_link(
-                target_organization, 
-                target_project, 
-                target_authentication_header, 
-                target_work_item_id, 
-                target_reference,
-                link_name
-            )
-
-            # Checks whether the target link already configured for the current processed work item.
-            if message == "Link already exists": 
-                work_item_results['skipped'] += 1
-                print(f"\n\033[1;33m[INFO] There is already a '{link_type}' link for work item {target_work_item_id}. Skipping...\033[0m")
 
-            elif success:
-                work_item_results['success'] += 1
-                print(f"\n\033[1;32m[SUCCESS] Successfully created '{link_type}' link for work item {target_work_item_id}.\033[0m")
+            # A changeset link that was remapped to a commit has to use the commit's link name (e.g. "Fixed in Changeset" → "Fixed in Commit").
+            if link_type == 'tfvc_changeset' and target_reference.startswith("vstfs:///Git/Commit/"):
+                link_name = link_name.replace("Changeset", "Commit")
 
-            else:
-                work_item_results['failed'] += 1
-                print(f"\n\033[1;31m[ERROR] Failed to create '{link_type}' link for work item {target_work_item_id}: {message}.\033[0m")
+            # The same link cannot be added twice in one JSON-patch document (also when it is a link of another source work item mapped to the same target).
+            if any(link_record['target_reference'] == target_reference and link_record['name'] == link_name for link_record in work_item_results['links']):
+                work_item_results['skipped'] += 1
+                continue
             
             work_item_results['links'].append({
                 'type': link_type,
                 'name': link_name,
                 'source_url': source_link_url,
                 'target_reference': target_reference,
-                'success': success,
-                'message': message
+                'success': None,
+                'message': None
             })
-        
-        # Updates overall results.
+
+    # Preloads the relations of all mapped target work items, so the existing links are known without a request per link.
+    target_relations = get_work_item_relations(target_organization, target_authentication_header, list(results['details'].keys()))
+
+    existing_links = {(work_item_id, relation.get('url'), relation.get('attributes', {}).get('name'))
+                      for work_item_id, work_item_relations in target_relations.items()
+                      for relation in work_item_relations['relations'] if relation.get('rel') == 'ArtifactLink'}
+    
+    links_to_add = {}
+    relations_to_remove = {}
+
+    for target_work_item_id, work_item_results in results['details'].items():
+        for link_record in work_item_results['links']:
+            if (target_work_item_id, link_record['target_reference'], link_record['name']) in existing_links:
+                link_record['success'], link_record['message'] = "skipped", "Link already exists"
+                work_item_results['skipped'] += 1
+
+            else:
+                links_to_add.setdefault(target_work_item_id, []).append((link_record['target_reference'], link_record['name']))
+
+        # Codebase links of the target work item that are not links of its source work item are removed (optional). Work items with
+        # links that could not be translated are left untouched, since their desired links are not fully known.
+        if REMOVE_STALE_LINKS and target_work_item_id in target_relations and not work_item_results['unresolved']:
+            desired_links = {(link_record['target_reference'], link_record['name']) for link_record in work_item_results['links']}
+            stale_relations = [relation_index for relation_index, relation in enumerate(target_relations[target_work_item_id]['relations'])
+                               if relation.get('rel') == 'ArtifactLink' and relation.get('url', '').startswith(CODEBASE_LINK_PREFIXES)
+                               and (relation.get('url'), relation.get('attributes', {}).get('name')) not in desired_links]
+
+            if stale_relations:
+                relations_to_remove[target_work_item_id] = stale_relations
+
+    print(f"[INFO] {len(existing_links)} link(s) already exist; {sum(len(links) for links in links_to_add.values())} link(s) will be added "
+          f"and {sum(len(relations) for relations in relations_to_remove.values())} stale link(s) will be removed.")
+
+    # Updates the links of all work items in bulk.
+    batch_results = update_links_in_batches(target_organization, target_authentication_header, links_to_add, relations_to_remove,
+                                            {work_item_id: work_item_relations['rev'] for work_item_id, work_item_relations in target_relations.items()})
+
+    for target_work_item_id, work_item_results in results['details'].items():
+        if target_work_item_id not in batch_results:
+            continue
+
+        batch_success, batch_message = batch_results[target_work_item_id]
+        pending_links = [link_record for link_record in work_item_results['links'] if link_record['success'] is None]
+        removed_count = len(relations_to_remove.get(target_work_item_id, []))
+
+        if batch_success:
+            for link_record in pending_links:
+                link_record['success'], link_record['message'] = True, batch_message
+
+            work_item_results['success'] += len(pending_links)
+            work_item_results['removed'] += removed_count
+            print(f"\n\033[1;32m[SUCCESS] Successfully created {len(pending_links)} link(s) (and removed {removed_count} stale link(s)) for work item {target_work_item_id}.\033[0m")
+
+        else:
+            # The whole document of the work item failed, so its links are created one by one (existing links are detected and skipped).
+            print(f"\n\033[1;38;5;214m[WARNING] Failed to update the links of work item {target_work_item_id} in bulk ({batch_message}); creating them one by one...\033[0m")
+
+            if removed_count:
+                print(f"\033[1;31m[ERROR] {removed_count} stale link(s) of work item {target_work_item_id} were not removed.\033[0m")
+                work_item_results['failed'] += removed_count
+
+            for link_record in pending_links:
+                link_type = link_record['type']
+
+                # Creates the link in the target environment.
+                success, message = create_link(
+                    target_organization, 
+                    target_project, 
+                    target_authentication_header, 
+                    target_work_item_id, 
+                    link_record['target_reference'],
+                    link_record['name']
+                )
+
+                # Checks whether the target link already configured for the current processed work item.
+                if message == "Link already exists": 
+                    work_item_results['skipped'] += 1
+                    print(f"\n\033[1;33m[INFO] There is already a '{link_type}' link for work item {target_work_item_id}. Skipping...\033[0m")
+
+                elif success:
+                    work_item_results['success'] += 1
+                    print(f"\n\033[1;32m[SUCCESS] Successfully created '{link_type}' link for work item {target_work_item_id}.\033[0m")
+
+                else:
+                    work_item_results['failed'] += 1
+                    print(f"\n\033[1;31m[ERROR] Failed to create '{link_type}' link for work item {target_work_item_id}: {message}.\033[0m")
+
+                link_record['success'], link_record['message'] = success, message
+
+    # Updates overall results.
+    for work_item_results in results['details'].values():
         results['success'] += work_item_results['success']
         results['failed'] += work_item_results['failed']
         results['skipped'] += work_item_results['skipped']
-        results['details'][target_work_item_id] = work_item_results
+        results['removed'] += work_item_results['removed']
     
     print("\n" + "\033[1m=\033[0m" * 100)
     print("\033[1mLINK RECREATION SUMMARY\033[0m")
@@ -928,18 +1462,23 @@ def link_work_items(target_organization, target_project, target_authentication_h
     print(f"• Total links successfully recreated: {results['success']}")
     print(f"• Total links failed to be recreated: {results['failed']}")
     print(f"• Total links skipped: {results['skipped']}")
+    print(f"• Total stale links removed: {results['removed']}")
     
     return results
 
-def create_target_reference_url(link, id_mapping):
+def create_target_reference_url(link, id_mapping, project_id=None):
     """
     This function translates a source codebase object link into the corresponding reference URL in the target environment.
+
+    'project_id' is the ID of the target project (resolved once by the caller); it is fetched when not provided.
     """
     if not id_mapping:
         print(f"\033[1;38;5;214m[WARNING] No ID mapping provided for codebase objects.\033[0m")
         return None
     
-    project_id = get_project_id(TARGET_ORGANIZATION, TARGET_PROJECT, TARGET_AUTHENTICATION_HEADER)
+    if project_id is None:
+        project_id = get_project_id(TARGET_ORGANIZATION, TARGET_PROJECT, TARGET_AUTHENTICATION_HEADER)
+
     link_type = link.get('type')
     link_id = link.get('id')
     
@@ -1017,6 +1556,13 @@ def create_target_reference_url(link, id_mapping):
             target_changeset_id = id_mapping['tfvc_changesets'][int(link_id)]
             return f"vstfs:///VersionControl/Changeset/{target_changeset_id}"
         
+        # The TFVC repository was migrated to Git - the changeset is remapped to the commit 'git-tfs' produced for it.
+        elif int(link_id) in id_mapping.get('tfvc_changeset_commits', {}):
+            target_commit = id_mapping['tfvc_changeset_commits'][int(link_id)]
+            target_repo_id = id_mapping.get('tfvc_changeset_commits_repository')
+
+            return f"vstfs:///Git/Commit/{project_id}%2F{target_repo_id}%2F{target_commit}"
+        
         else:
             print(f"\033[1;38;5;214m[WARNING] A TFVC changeset link type was detected, but no mapping found for source TFVC changeset {link_id}.\033[0m")
             return None
@@ -1030,6 +1576,137 @@ def create_target_reference_url(link, id_mapping):
         print(f" • Changesets (for TFVC)")
         return None
 
+def get_work_item_relations(organization, authentication_header, work_item_ids, batch_size=200):
+    """
+    This function fetches the relations of work items in bulk (the work items batch API, up to 200 work items per request).
+
+    Returns: Dictionary {work_item_id: {'rev': ..., 'relations': [...]}} (work items that could not be retrieved are missing).
+    """
+    api_version = "7.1"
+    url = f"{organization}/_apis/wit/workitemsbatch?api-version={api_version}"
+
+    work_item_relations = {}
+
+    print(f"\n[INFO] Preloading the relations of {len(work_item_ids)} target work item(s)...")
+
+    for index in range(0, len(work_item_ids), batch_size):
+        payload = {
+            "ids": work_item_ids[index:index + batch_size],
+            "$expand": "Relations",
+            "errorPolicy": "Omit" # Work items that cannot be read (e.g., deleted) are omitted instead of failing the whole batch.
+        }
+
+        try:
+            response = requests.post(url, headers=authentication_header, json=payload)
+
+            if response.status_code == 200:
+                for work_item in response.json().get("value", []):
+                    if work_item:
+                        work_item_relations[work_item['id']] = {'rev': work_item.get('rev'), 'relations': work_item.get('relations', [])}
+
+            else:
+                print(f"\033[1;31m[ERROR] Failed to fetch the relations of a batch of work items.\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                print(f"[DEBUG] Response Body: {response.text}")
+
+        except requests.exceptions.RequestException as e:
+            print(f"\033[1;31m[ERROR] An error occurred while fetching the relations of work items: {e}\033[0m")
+
+    print(f"[INFO] Preloaded the relations of {len(work_item_relations)} work item(s).")
+
+    return work_item_relations
+
+def update_links_in_batches(organization, authentication_header, links_to_add, relations_to_remove=None, revisions=None, batch_size=LINKS_BATCH_SIZE):
+    """
+    This function adds (and removes) links between work items and codebase objects in bulk.
+
+    • All link changes of a work item are grouped into a single JSON-patch document - the removals (by relation index, from the last one,
+      guarded by a test of the work item's revision) and then the additions.
+    • Up to 'batch_size' work item documents are sent per request, through the work item batch API ('$batch').
+
+    A document fails as a whole (e.g., when one of its links already exists, or the work item changed since its relations were read), so
+    the failed work items are reported to the caller, which can create their links one by one.
+
+    Returns: Dictionary {work_item_id: (success, message)}.
+    """
+    api_version = "7.1"
+    url = f"{organization}/_apis/wit/$batch?api-version={api_version}"
+
+    headers = {
+        **authentication_header,
+        "Content-Type": "application/json"
+    }
+
+    relations_to_remove = relations_to_remove or {}
+    revisions = revisions or {}
+
+    work_item_ids = list(dict.fromkeys(list(links_to_add.keys()) + list(relations_to_remove.keys())))
+    batch_results = {}
+
+    for index in range(0, len(work_item_ids), batch_size):
+        batch_work_item_ids = work_item_ids[index:index + batch_size]
+        payload = []
+
+        for work_item_id in batch_work_item_ids:
+            operations = []
+
+            if relations_to_remove.get(work_item_id):
+                # The relation indexes are only valid for the revision they were read at.
+                operations.append({"op": "test", "path": "/rev", "value": revisions[work_item_id]})
+                operations.extend({"op": "remove", "path": f"/relations/{relation_index}"}
+                                  for relation_index in sorted(relations_to_remove[work_item_id], reverse=True))
+
+            operations.extend(
+                {
+                    "op": "add",
+                    "path": "/relations/-", # Appends to the 'relations' array.
+                    "value": {
+                        "rel": "ArtifactLink",
+                        "url": reference_url,
+                        "attributes": {
+                            "name": link_name
+                        }
+                    }
+                }
+                for reference_url, link_name in links_to_add.get(work_item_id, [])
+            )
+
+            payload.append({
+                "method": "PATCH",
+                "uri": f"/_apis/wit/workitems/{work_item_id}?api-version={api_version}",
+                "headers": {
+                    "Content-Type": "application/json-patch+json" # A required content type for PATCH operations using Azure DevOps' REST API.
+                },
+                "body": operations
+            })
+
+        print(f"[INFO] Updating the links of {len(batch_work_item_ids)} work item(s) in a single batch request...")
+
+        try:
+            response = requests.post(url, headers=headers, json=payload)
+
+            if response.status_code == 200:
+                # The responses are returned in the order of the requests.
+                for work_item_id, item_response in zip(batch_work_item_ids, response.json().get("value", [])):
+                    if item_response.get("code") in (200, 201):
+                        batch_results[work_item_id] = (True, "[SUCCESS] Links updated successfully")
+
+                    else:
+                        batch_results[work_item_id] = (False, f"{item_response.get('code')}: {item_response.get('body')}")
+
+            else:
+                print(f"\033[1;31m[ERROR] Failed to send a batch of {len(batch_work_item_ids)} work item(s).\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                print(f"[DEBUG] Response Body: {response.text}")
+
+        except requests.exceptions.RequestException as e:
+            print(f"\033[1;31m[ERROR] An error occurred while sending a batch of work items: {e}\033[0m")
+
+        for work_item_id in batch_work_item_ids:
+            batch_results.setdefault(work_item_id, (False, "The batch request failed"))
+
+    return batch_results
+
 def create_link(organization, project_name, authentication_header, work_item_id, reference_url, link_name):
     """
     This function creates a link between a work item and a codebase object.
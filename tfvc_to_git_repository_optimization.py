@@ -0,0 +1,372 @@
+import subprocess
+import os
+import time
+import datetime
+import json
+import heapq
+import traceback
+import pyfiglet
+
+"""
+CLARIFICATIONS:
+• This script optimizes a local Git repository converted by 'git-tfs', after the conversion and before the push to Azure DevOps.
+• The script does not rewrite history - it only repacks the repository, writes the commit-graph and multi-pack-index files,
+    and reports whether a history rewrite or a Git LFS migration is needed before pushing.
+
+PREREQUISITES:
+• A local Git repository converted by 'git-tfs' (see step 4.1 in the README).
+• Git 2.34 (or newer) installed and available in PATH.
+"""
+
+local_git_repository_path = r"P:\Work\Project\Main"
+
+# Repack settings - a larger window and depth produce smaller packs (better deltas) at the cost of a longer repack.
+repack_window = 250
+repack_depth = 50
+
+# Number of largest blobs/paths/extensions to include in the report.
+report_top_count = 50
+
+# Blobs larger than this size are candidates for a Git LFS migration.
+lfs_candidate_threshold_bytes = 50 * 1024 * 1024 # 50 MB.
+
+# Azure DevOps rejects pushes larger than 5 GB - larger repositories have to be pushed in batches.
+push_size_limit_bytes = 5 * 1024 * 1024 * 1024
+
+def execute_git_command(arguments, repository_path):
+    """
+    This function executes a 'git' command in the repository directory and returns its output (None on failure).
+    """
+    print(f"\033[1m[COMMAND EXECUTION] Executing the following command: git {' '.join(arguments)}\033[0m")
+
+    try:
+        result = subprocess.run(["git", *arguments], cwd=repository_path, capture_output=True, text=True, check=True)
+        return result.stdout
+
+    except subprocess.CalledProcessError as e:
+        print(f"\n\033[1;31m[ERROR] An error occurred while executing the 'git' command: {e}\033[0m")
+        print(f"\033[1;31m[ERROR] Output: {e.stderr}\033[0m\n")
+        return None
+
+def get_object_statistics(repository_path):
+    """
+    This function fetches the object statistics of the repository ('git count-objects -v').
+
+    Returns: Dictionary with the number of loose/packed objects and their size in bytes.
+    """
+    output = execute_git_command(["count-objects", "-v"], repository_path)
+
+    if output is None:
+        return {}
+
+    statistics = {}
+
+    for line in output.splitlines():
+        key, _, value = line.partition(":")
+
+        try:
+            statistics[key.strip()] = int(value.strip())
+
+        except ValueError:
+            continue
+
+    # 'git count-objects' reports sizes in KiB, so they are converted to bytes for consistency with the rest of the report.
+    for key in ["size", "size-pack", "size-garbage"]:
+        if key in statistics:
+            statistics[key] = statistics[key] * 1024
+
+    return statistics
+
+def run_optimization_stage(stage_name, arguments, repository_path, stages):
+    """
+    This function runs a single optimization stage and records its outcome and duration in the 'stages' list.
+    """
+    print(f"\n\033[1m[INFO] Running '{stage_name}' stage...\033[0m")
+    start_time = time.time()
+
+    output = execute_git_command(arguments, repository_path)
+    duration = round(time.time() - start_time, 2)
+
+    stages.append({
+        "stage": stage_name,
+        "command": f"git {' '.join(arguments)}",
+        "success": output is not None,
+        "duration_seconds": duration
+    })
+
+    if output is not None:
+        print(f"\033[1;32m[SUCCESS] '{stage_name}' stage completed (took {duration:.2f} seconds)!\033[0m")
+
+    else:
+        print(f"\033[1;38;5;214m[WARNING] '{stage_name}' stage failed, continuing with the next stage...\033[0m")
+
+    return output is not None
+
+def optimize_repository(repository_path):
+    """
+    This function repacks the repository with tuned window and depth, and writes the commit-graph and multi-pack-index files.
+
+    Returns: List of the executed stages and their outcome.
+    """
+    stages = []
+
+    run_optimization_stage("pack refs", ["pack-refs", "--all"], repository_path, stages)
+
+    # '-f' recomputes all deltas with the tuned window and depth, instead of reusing the (usually poor) deltas created during the conversion.
+    run_optimization_stage("repack", ["repack", "-a", "-d", "-f", "--write-bitmap-index", f"--window={repack_window}", f"--depth={repack_depth}", "--threads=0"],
+                           repository_path, stages)
+
+    run_optimization_stage("commit-graph", ["commit-graph", "write", "--reachable", "--changed-paths"], repository_path, stages)
+    run_optimization_stage("multi-pack-index", ["multi-pack-index", "write"], repository_path, stages)
+
+    return stages
+
+def get_history_statistics(repository_path):
+    """
+    This function collects statistics about the repository history (commits, branches, tags, and first/last commit dates).
+    """
+    statistics = {
+        "commits": 0,
+        "branches": 0,
+        "tags": 0,
+        "first_commit_date": None,
+        "last_commit_date": None
+    }
+
+    commit_count = execute_git_command(["rev-list", "--all", "--count"], repository_path)
+
+    if commit_count:
+        statistics["commits"] = int(commit_count.strip())
+
+    refs = execute_git_command(["for-each-ref", "--format=%(refname)"], repository_path)
+
+    if refs:
+        for ref in refs.splitlines():
+            if ref.startswith("refs/heads/") or ref.startswith("refs/remotes/tfs/"):
+                statistics["branches"] += 1
+
+            elif ref.startswith("refs/tags/"):
+                statistics["tags"] += 1
+
+    # Commit dates are fetched in chronological order, so the first and last lines are the oldest and newest commits.
+    dates = execute_git_command(["log", "--all", "--format=%cI", "--reverse", "--date-order"], repository_path)
+
+    if dates:
+        date_lines = dates.splitlines()
+
+        if date_lines:
+            statistics["first_commit_date"] = date_lines[0]
+            statistics["last_commit_date"] = date_lines[-1]
+
+    return statistics
+
+def scan_repository_blobs(repository_path):
+    """
+    This function streams every object reachable from any ref ('git rev-list --objects --all') through 'git cat-file --batch-check',
+    and collects the largest blobs, and the total size per path and per file extension.
+
+    The output is processed line by line, so memory usage does not depend on the size of the history.
+    """
+    print(f"\n\033[1m[INFO] Scanning all blobs in the repository history (this may take some time for large repositories)...\033[0m")
+
+    largest_blobs = [] # Min-heap of (size, blob_id, path) holding the 'report_top_count' largest blobs.
+    path_sizes = {}
+    extension_sizes = {}
+    blob_count = 0
+    total_blob_size = 0
+
+    rev_list = subprocess.Popen(["git", "rev-list", "--objects", "--all"], cwd=repository_path, stdout=subprocess.PIPE)
+    cat_file = subprocess.Popen(["git", "cat-file", "--batch-check=%(objecttype) %(objectname) %(objectsize) %(rest)"],
+                                cwd=repository_path, stdin=rev_list.stdout, stdout=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+    rev_list.stdout.close() # Allows 'rev-list' to receive a SIGPIPE if 'cat-file' exits early.
+
+    for line in cat_file.stdout:
+        parts = line.rstrip("\n").split(" ", 3)
+
+        if len(parts) < 4 or parts[0] != "blob":
+            continue
+
+        blob_id, size, path = parts[1], int(parts[2]), parts[3]
+
+        blob_count += 1
+        total_blob_size += size
+        path_sizes[path] = path_sizes.get(path, 0) + size
+
+        file_name = path.split('/')[-1]
+        extension = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else "(none)"
+        extension_sizes[extension] = extension_sizes.get(extension, 0) + size
+
+        if len(largest_blobs) < report_top_count:
+            heapq.heappush(largest_blobs, (size, blob_id, path))
+
+        elif size > largest_blobs[0][0]:
+            heapq.heapreplace(largest_blobs, (size, blob_id, path))
+
+    cat_file.wait()
+    rev_list.wait()
+
+    if cat_file.returncode != 0 or rev_list.returncode != 0:
+        print(f"\033[1;38;5;214m[WARNING] The blob scan did not complete successfully; the report may be partial.\033[0m")
+
+    largest_paths = heapq.nlargest(report_top_count, path_sizes.items(), key=lambda x: x[1])
+    largest_extensions = heapq.nlargest(report_top_count, extension_sizes.items(), key=lambda x: x[1])
+
+    return {
+        "blob_count": blob_count,
+        "total_blob_size": total_blob_size,
+        "unique_paths": len(path_sizes),
+        "largest_blobs": [{"blob_id": blob_id, "path": path, "size": size} for size, blob_id, path in sorted(largest_blobs, reverse=True)],
+        "largest_paths": [{"path": path, "total_size": size} for path, size in largest_paths],
+        "largest_extensions": [{"extension": extension, "total_size": size} for extension, size in largest_extensions]
+    }
+
+def get_branch_tip_blobs(repository_path, blob_ids):
+    """
+    This function checks which of the given blobs still exist at the tip of any branch.
+    Blobs that exist only in history can be removed by a history rewrite, while blobs at the tips require a Git LFS migration.
+    """
+    tip_blobs = set()
+    branches = execute_git_command(["for-each-ref", "--format=%(refname)", "refs/heads/", "refs/remotes/tfs/"], repository_path)
+
+    if not branches or not blob_ids:
+        return tip_blobs
+
+    for branch in branches.splitlines():
+        tree = execute_git_command(["ls-tree", "-r", "--full-tree", branch], repository_path)
+
+        if not tree:
+            continue
+
+        for line in tree.splitlines():
+            # Format: "<mode> <type> <object_id>\t<path>"
+            object_id = line.split("\t", 1)[0].split(" ")[-1]
+
+            if object_id in blob_ids:
+                tip_blobs.add(object_id)
+
+    return tip_blobs
+
+def build_recommendations(object_statistics, blob_scan, tip_blobs):
+    """
+    This function decides whether a history rewrite and/or a Git LFS migration is needed before pushing.
+    """
+    lfs_candidates = []
+    rewrite_candidates = []
+
+    for blob in blob_scan["largest_blobs"]:
+        if blob["size"] < lfs_candidate_threshold_bytes:
+            continue
+
+        if blob["blob_id"] in tip_blobs:
+            lfs_candidates.append(blob["path"])
+
+        else:
+            rewrite_candidates.append(blob["path"])
+
+    # Git LFS tracks files by pattern, so the candidates are also grouped by their extension.
+    lfs_patterns = sorted({f"*.{path.split('/')[-1].rsplit('.', 1)[-1].lower()}" for path in lfs_candidates if '.' in path.split('/')[-1]})
+    pack_size = object_statistics.get("size-pack", 0) + object_statistics.get("size", 0)
+
+    return {
+        "lfs_migration_needed": bool(lfs_candidates),
+        "history_rewrite_needed": bool(rewrite_candidates),
+        "exceeds_push_size_limit": pack_size > push_size_limit_bytes,
+        "lfs_candidates": sorted(set(lfs_candidates)),
+        "lfs_patterns": lfs_patterns,
+        "rewrite_candidates": sorted(set(rewrite_candidates))
+    }
+
+def save_optimization_report(report):
+    """
+    This function saves the optimization report as a JSON file in the script's directory.
+    """
+    script_directory = os.path.dirname(os.path.abspath(__file__))
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file_path = os.path.join(script_directory, f"repository_optimization_report_{timestamp}.json")
+
+    with open(report_file_path, "w") as report_file:
+        json.dump(report, report_file, indent=4)
+
+    return report_file_path
+
+def optimize_converted_repository(repository_path):
+    """
+    This function optimizes a converted Git repository and reports its size and layout.
+
+    Returns: The report dictionary (also saved as a JSON file).
+    """
+    os.system('cls' if os.name == 'nt' else 'clear')
+    ascii_art = pyfiglet.figlet_format("by codewizard", font="ogre")
+    print(ascii_art)
+
+    print("\n" + "\033[1m=\033[0m" * 100)
+    print(f"\033[1mSTARTING REPOSITORY OPTIMIZATION\033[0m")
+    print("\033[1m=\033[0m" * 100)
+
+    if not os.path.isdir(os.path.join(repository_path, ".git")):
+        print(f"\n\033[1;31m[ERROR] '{repository_path}' is not a Git repository.\033[0m")
+        return None
+
+    start_time = time.time()
+
+    try:
+        statistics_before = get_object_statistics(repository_path)
+        stages = optimize_repository(repository_path)
+        statistics_after = get_object_statistics(repository_path)
+
+        history_statistics = get_history_statistics(repository_path)
+        blob_scan = scan_repository_blobs(repository_path)
+
+        large_blob_ids = {blob["blob_id"] for blob in blob_scan["largest_blobs"] if blob["size"] >= lfs_candidate_threshold_bytes}
+        tip_blobs = get_branch_tip_blobs(repository_path, large_blob_ids)
+
+        recommendations = build_recommendations(statistics_after, blob_scan, tip_blobs)
+
+    except Exception as e:
+        print(f"\033[1;31m[ERROR] An error occurred while optimizing the repository: {e}\033[0m")
+        traceback.print_exc() # A detailed output of the exception.
+        return None
+
+    report = {
+        "repository": os.path.abspath(repository_path),
+        "timestamp": datetime.datetime.now().isoformat(),
+        "duration_seconds": round(time.time() - start_time, 2),
+        "settings": {
+            "repack_window": repack_window,
+            "repack_depth": repack_depth,
+            "lfs_candidate_threshold_bytes": lfs_candidate_threshold_bytes,
+            "push_size_limit_bytes": push_size_limit_bytes
+        },
+        "stages": stages,
+        "objects_before": statistics_before,
+        "objects_after": statistics_after,
+        "history": history_statistics,
+        "blobs": {
+            "count": blob_scan["blob_count"],
+            "total_size": blob_scan["total_blob_size"],
+            "unique_paths": blob_scan["unique_paths"]
+        },
+        "largest_blobs": blob_scan["largest_blobs"],
+        "largest_paths": blob_scan["largest_paths"],
+        "largest_extensions": blob_scan["largest_extensions"],
+        "recommendations": recommendations
+    }
+
+    report_file_path = save_optimization_report(report)
+
+    print("\n" + "\033[1m=\033[0m" * 100)
+    print("\033[1mOPTIMIZATION SUMMARY\033[0m")
+    print("\033[1m=\033[0m" * 100)
+    print(f"• Pack size: {statistics_before.get('size-pack', 0) / 1024 / 1024:.2f} MB → {statistics_after.get('size-pack', 0) / 1024 / 1024:.2f} MB")
+    print(f"• Commits: {history_statistics['commits']}, branches: {history_statistics['branches']}, tags: {history_statistics['tags']}")
+    print(f"• Blobs: {blob_scan['blob_count']} ({blob_scan['total_blob_size'] / 1024 / 1024:.2f} MB uncompressed, {blob_scan['unique_paths']} unique paths)")
+    print(f"• Git LFS migration needed: {'YES' if recommendations['lfs_migration_needed'] else 'NO'} ({len(recommendations['lfs_candidates'])} files)")
+    print(f"• History rewrite needed: {'YES' if recommendations['history_rewrite_needed'] else 'NO'} ({len(recommendations['rewrite_candidates'])} files)")
+    print(f"• Exceeds push size limit: {'YES' if recommendations['exceeds_push_size_limit'] else 'NO'}")
+    print(f"• Total time: {report['duration_seconds']:.2f} seconds")
+    print(f"\n\033[1;33m[INFO] Report saved to: {report_file_path}\033[0m")
+
+    return report
+
+if __name__ == "__main__":
+    optimize_converted_repository(local_git_repository_path)
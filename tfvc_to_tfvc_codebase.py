@@ -8,6 +8,11 @@ import time
 import datetime
 import json
 import traceback
+import fnmatch
+import mmap
+import concurrent.futures
+import base64
+import requests
 import pyfiglet
 
 """
@@ -31,6 +36,8 @@ PREREQUISITES:
     The parent branch is migrated as a regular changeset, and once migrated will be converted to a branch via Visual Studio.
 
 • The first changeset of all other branches - the 'branch_creation_changesets' list has to be filled.
+• (Optional) Paths that should not be migrated - the 'excluded_paths' list can be filled.
+    Excluded folders are cloaked in the source workspace ('tf workfold /cloak'), so they are never downloaded.
 • An history file of the source TFVC repository.
     Command: tf history '<source_server_path (e.g., $/...)>' /recursive /noprompt /format:detailed /collection:<collection_url> > history.txt
 """
@@ -97,6 +104,61 @@ branch_creation_changesets = [
     1196   # Challange_13-Lavaza3[Obsolete]
 ]
 
+# A list of paths (relative to 'source_server_path') that are excluded from the migration - they are not downloaded, copied, added or verified.
+# • Rules ending with "/" match folders (and everything beneath them), other rules match files.
+# • Rules without "/" (e.g., "bin/", "*.user") match a folder/file name at any depth, rules with "/" are matched against the full relative path.
+# • Rules starting with "re:" are regular expressions matched against the relative path (e.g., "re:^Tools/.*\.exe$").
+excluded_paths = [
+    "bin/",
+    "obj/",
+    "packages/",
+    # "ThirdParty/VendorSDK/",
+]
+
+cloaked_folders = set() # Server paths of the folders that were already cloaked in the source workspace.
+
+# History files larger than this size are scanned by parallel worker processes (multi-GB history files of a full collection).
+history_scan_parallel_threshold = 64 * 1024 * 1024 # 64 MB.
+history_scan_workers = os.cpu_count() or 1
+
+# Adaptive processing strategy - the observed per-stage timings are used to predict whether the targeted (per-file) processing or the
+# bulk (wipe-and-copy) processing is cheaper for each changeset. The model is recalibrated after every changeset and saved to 'cost_model_file',
+# while every prediction is logged next to the actual time in 'cost_log_file' (one JSON object per line).
+# Changesets with renames, undeletes or merges are always processed by the targeted processing, as the bulk processing turns them into
+# deletes and adds (the history of the items is lost and their content is uploaded again).
+adaptive_processing_strategy = False
+cost_model_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replay_cost_model.json")
+cost_log_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replay_cost_log.jsonl")
+cost_model_smoothing = 0.2 # Weight of the latest observation in the moving averages.
+
+# A PAT for the source collection's REST API - the 'tf changeset' output lists only the new path of a renamed item, so the original path
+# (and the sources of merges) are fetched from the REST API. Without it, changesets with renames fall back to the bulk processing.
+source_pat = os.getenv("SOURCE_PAT")
+
+# The merge sources of migrated merge operations are logged to this file (one JSON object per line), as TFVC cannot record a merge between unrelated items.
+merge_history_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "merge_history.jsonl")
+
+# Optional coalescing - runs of consecutive changesets (e.g., many tiny check-ins of the same author) are checked in as a single target changeset
+# with a combined "#<id1>,#<id2>: ..." comment. It trades the one-to-one fidelity of the history for check-in throughput, so it is disabled by default.
+coalesce_changesets = False
+coalesce_same_author = True
+coalesce_time_window_minutes = 10 # The maximal gap between two consecutive changesets of a group.
+coalesce_max_group_size = 20
+
+# Changesets that labels point at - a group always ends at them, so the labels can be recreated on the matching target changeset.
+label_changesets = [
+    # 1500,  # Release_1.0
+]
+
+# The date formats of 'tf history /format:detailed' records (the format depends on the client's locale).
+history_date_formats = [
+    "%A, %B %d, %Y %I:%M:%S %p",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%d/%m/%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S"
+]
+
 def execute_tf_command(command, capture_output=True):
     """
     This function executes a 'TF' command with improved error handling for already-tracked files, and progress display for the 'tf get' command.
@@ -216,32 +278,320 @@ def execute_tf_get_command(command):
     return output.getvalue() # The '.getvalue()' method retrieves all the text that has been accumulated in the StringIO buffer and returns it as a single string. 
     # It is converting the in-memory text stream back into a regular Python string that can be used by the rest of the script.
 
-def parse_history_file(history_file):
+def is_beneath_path(server_path, server_root):
     """
-    This function parses the TFVC repository history file, extracting only changeset IDs.
+    This function checks whether a TFS server path is the root path itself or beneath it (e.g., "$/P/MainOld" is not beneath "$/P/Main").
     """
-    print(f"\033[1m[INFO] Extracting changeset IDs from the '{history_file}' history file...\033[0m")
+    return server_path == server_root or server_path.startswith(server_root.rstrip('/') + '/')
 
-    changeset_ids = set()
-    
-    with open(history_file, 'r', encoding='utf-16le') as f:
-        line_count = 0
-        
-        for line in f:
-            line_count += 1
-            line = line.strip()
+def get_relative_server_path(server_path, server_root=None):
+    """
+    This function converts a TFS server path (e.g. $/SoftwareDev/Dev/bin/App.dll) into a path relative to 'server_root' (e.g. Dev/bin/App.dll),
+    which is 'source_server_path' by default.
+    """
+    server_root = source_server_path if server_root is None else server_root
 
-            if line.startswith("Changeset:"):
-                try:
-                    changeset_id = int(line.split("Changeset:")[1].strip().split()[0])
-                    changeset_ids.add(changeset_id)
+    if is_beneath_path(server_path, server_root):
+        return server_path[len(server_root):].strip('/')
 
-                except Exception as e:
-                    print(f"\n\033[1;31m[ERROR] Error parsing changeset ID from line {line}; error message: {e}\033[0m")
-    
-    changeset_ids_list = sorted(list(changeset_ids))
+    return server_path.lstrip('$').strip('/')
+
+def get_excluded_root(relative_path, folders_only=False):
+    """
+    This function checks the path against the 'excluded_paths' rules ('folders_only' checks only the folder rules).
+
+    Returns: The relative path of the excluded folder that contains the path (or the path itself for file rules), or None if the path is not excluded.
+    """
+    parts = [part for part in relative_path.replace('\\', '/').split('/') if part]
+
+    if not parts:
+        return None
+
+    for rule in excluded_paths:
+        if rule.startswith("re:"):
+            if not folders_only and re.search(rule[3:], '/'.join(parts)):
+                return '/'.join(parts)
+            continue
+
+        is_folder_rule = rule.endswith('/')
+        pattern = rule.strip('/')
+
+        if is_folder_rule:
+            # Checks every ancestor folder (and the path itself, in case it is a folder) against the rule.
+            for index in range(1, len(parts) + 1):
+                candidate = parts[index - 1] if '/' not in pattern else '/'.join(parts[:index])
+
+                if fnmatch.fnmatch(candidate, pattern):
+                    return '/'.join(parts[:index])
+
+        elif not folders_only:
+            candidate = parts[-1] if '/' not in pattern else '/'.join(parts)
+
+            if fnmatch.fnmatch(candidate, pattern):
+                return '/'.join(parts)
+
+    return None
+
+def is_excluded_path(relative_path):
+    """
+    This function checks whether a path (relative to 'source_server_path') is excluded from the migration.
+    """
+    return bool(excluded_paths) and get_excluded_root(relative_path) is not None
+
+def cloak_excluded_folders(server_paths):
+    """
+    This function cloaks the excluded folders that contain the given server paths in the source workspace ('tf workfold /cloak'),
+    so the following 'tf get' commands do not download them.
+    """
+    os.chdir(local_source_path)
+
+    for server_path in server_paths:
+        # File rules cannot be cloaked (cloaking applies to folders only); these files are skipped by the operation filter and the copy engine.
+        excluded_root = get_excluded_root(get_relative_server_path(server_path), folders_only=True)
+
+        if not excluded_root:
+            continue
+
+        folder_server_path = f"{source_server_path.rstrip('/')}/{excluded_root}"
+
+        if folder_server_path in cloaked_folders or any(folder_server_path.startswith(folder + '/') for folder in cloaked_folders):
+            continue
+
+        if execute_tf_command(f'workfold /cloak "{folder_server_path}"'):
+            print(f"\033[1m[INFO] Cloaked excluded folder: '{folder_server_path}'\033[0m")
+
+        else:
+            print(f"\033[1;38;5;214m[WARNING] Could not cloak '{folder_server_path}'; its content will be downloaded but not migrated.\033[0m")
+
+        cloaked_folders.add(folder_server_path) # Failed cloaks are not retried for every changeset.
+
+def apply_workspace_cloaks():
+    """
+    This function cloaks the excluded folders that have a fixed location (folder rules without wildcards) before the migration starts.
+    Folders matched by other rules (e.g., "bin/" at any depth) are cloaked once they first appear in a changeset.
+    """
+    fixed_folders = [rule.strip('/') for rule in excluded_paths
+                     if rule.endswith('/') and '/' in rule.strip('/') and not any(c in rule for c in '*?[')]
+
+    if fixed_folders:
+        print(f"\n\033[1m[INFO] Cloaking {len(fixed_folders)} excluded folder(s) in the source workspace...\033[0m")
+        cloak_excluded_folders([f"{source_server_path.rstrip('/')}/{folder}" for folder in fixed_folders])
+
+def filter_excluded_operations(operations):
+    """
+    This function filters out the operations upon excluded paths.
+    """
+    filtered_operations = [(op, path) for op, path in operations if not is_excluded_path(get_relative_server_path(path))]
+
+    if len(filtered_operations) != len(operations):
+        print(f"\n\033[1m[INFO] Excluded {len(operations) - len(filtered_operations)} operation(s) upon excluded paths.\033[0m")
+
+    return filtered_operations
+
+def detect_history_file_encoding(history_data):
+    """
+    This function detects the encoding of the history file from its BOM, or from its byte pattern when there is no BOM.
+    The 'tf history' output is UTF-16LE when redirected from PowerShell, but can be UTF-8 (or UTF-16BE) depending on the console that produced it.
+
+    Returns: Tuple (encoding, BOM length in bytes, code unit size in bytes).
+    """
+    if history_data[:2] == b'\xff\xfe':
+        return 'utf-16-le', 2, 2
+
+    if history_data[:2] == b'\xfe\xff':
+        return 'utf-16-be', 2, 2
+
+    if history_data[:3] == b'\xef\xbb\xbf':
+        return 'utf-8', 3, 1
+
+    # Without a BOM, mostly-ASCII UTF-16 text has a null byte in every other position (odd positions for LE, even positions for BE).
+    sample = history_data[:4096]
+
+    if sample[1::2].count(0) > len(sample) // 4:
+        return 'utf-16-le', 0, 2
+
+    if sample[0::2].count(0) > len(sample) // 4:
+        return 'utf-16-be', 0, 2
+
+    return 'utf-8', 0, 1
+
+def find_history_record_start(history_data, marker, newline, position, bom_length, unit_size):
+    """
+    This function finds the next "Changeset:" record boundary at or after 'position', directly at the byte level.
+    A boundary is valid only when it is aligned to the encoding's code units and starts a line (comment lines are indented, so they never match).
+    """
+    while True:
+        position = history_data.find(marker, position)
+
+        if position == -1:
+            return -1
+
+        if (position - bom_length) % unit_size == 0 and (position == bom_length or history_data[position - len(newline):position] == newline):
+            return position
+
+        position += 1
+
+def parse_history_record(record_text):
+    """
+    This function parses the header of a single 'tf history /format:detailed' record.
+
+    Returns: Tuple (changeset_id, user, date) or None if the record has no valid changeset ID.
+    """
+    changeset_id = None
+    user = None
+    date = None
+
+    for line in record_text.splitlines():
+        line = line.strip()
+
+        if line.startswith("Changeset:"):
+            try:
+                changeset_id = int(line.split("Changeset:")[1].strip().split()[0])
+
+            except Exception as e:
+                print(f"\n\033[1;31m[ERROR] Error parsing changeset ID from line {line}; error message: {e}\033[0m")
+                return None
 
-    return changeset_ids_list
+        elif line.startswith("User:"):
+            user = line[len("User:"):].strip()
+
+        elif line.startswith("Date:"):
+            date = line[len("Date:"):].strip()
+            break # The header ends with the date; the comment and the items are not needed.
+
+    if changeset_id is None:
+        return None
+
+    return changeset_id, user, date
+
+def scan_history_range(history_file, encoding, bom_length, unit_size, start, end):
+    """
+    This function parses the history records that start within the [start, end) byte range of the memory-mapped history file.
+    It runs in a worker process, so it opens its own mapping of the file.
+    """
+    records = []
+    marker = "Changeset:".encode(encoding)
+    newline = "\n".encode(encoding)
+    header_size = 4096 * unit_size # Only the record's header is decoded - the items list of a large changeset can be huge.
+
+    with open(history_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as history_data:
+            position = find_history_record_start(history_data, marker, newline, start, bom_length, unit_size)
+
+            while position != -1 and position < end:
+                next_position = find_history_record_start(history_data, marker, newline, position + len(marker), bom_length, unit_size)
+                record_end = next_position if next_position != -1 else len(history_data)
+
+                record = parse_history_record(history_data[position:min(record_end, position + header_size)].decode(encoding, errors='replace'))
+
+                if record:
+                    records.append(record)
+
+                position = next_position
+
+    return records
+
+def scan_history_file(history_file):
+    """
+    This function scans the TFVC repository history file ('tf history /format:detailed' output) using a memory mapping.
+    Large files are split into byte ranges that are parsed in parallel worker processes.
+
+    Returns: List of tuples [(changeset_id, user, date), ...] sorted by changeset ID.
+    """
+    file_size = os.path.getsize(history_file)
+
+    if file_size == 0:
+        return []
+
+    with open(history_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as history_data:
+            encoding, bom_length, unit_size = detect_history_file_encoding(history_data)
+
+    print(f"\033[1m[INFO] Detected '{encoding}' encoding ({file_size / 1024 / 1024:.2f} MB).\033[0m")
+
+    if file_size < history_scan_parallel_threshold or history_scan_workers < 2:
+        records = scan_history_range(history_file, encoding, bom_length, unit_size, bom_length, file_size)
+
+    else:
+        # More ranges than workers balance the load, as records are not evenly distributed across the file.
+        range_count = history_scan_workers * 4
+        range_size = ((file_size - bom_length) // range_count // unit_size + 1) * unit_size
+        ranges = [(start, min(start + range_size, file_size)) for start in range(bom_length, file_size, range_size)]
+
+        print(f"\033[1m[INFO] Scanning {len(ranges)} ranges using {history_scan_workers} worker processes...\033[0m")
+        records = []
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=history_scan_workers) as executor:
+            futures = [executor.submit(scan_history_range, history_file, encoding, bom_length, unit_size, start, end) for start, end in ranges]
+
+            for future in futures:
+                records.extend(future.result())
+
+    # The same changeset can appear more than once (e.g. history files that were concatenated), so records are deduplicated by ID.
+    return sorted({record[0]: record for record in records}.values())
+
+def parse_history_date(date_text):
+    """
+    This function parses the date of a history record ('tf history' prints it in the client's locale format).
+
+    Returns: A datetime object, or None if the date format is not recognized.
+    """
+    if not date_text:
+        return None
+
+    for date_format in history_date_formats:
+        try:
+            return datetime.datetime.strptime(date_text, date_format)
+
+        except ValueError:
+            continue
+
+    return None
+
+def group_consecutive_changesets(history_records):
+    """
+    This function groups runs of consecutive changesets that can be checked in as a single target changeset.
+
+    A changeset joins the group of the previous changeset only when:
+    • It has the same author (if 'coalesce_same_author' is set).
+    • It was checked in no more than 'coalesce_time_window_minutes' after the previous changeset.
+    • The group has less than 'coalesce_max_group_size' changesets.
+    • Neither of them is a branch creation changeset, and the previous changeset is not a labeled changeset (a group always ends at a label).
+
+    Returns: List of changeset ID lists [[changeset_id, ...], ...] in history order.
+    """
+    boundary_changesets = set(parent_branch_creation_changesets) | set(branch_creation_changesets)
+    time_window = datetime.timedelta(minutes=coalesce_time_window_minutes)
+
+    groups = []
+    previous_user = None
+    previous_date = None
+
+    for changeset_id, user, date_text in history_records:
+        date = parse_history_date(date_text)
+        current_group = groups[-1] if groups else None
+
+        can_join = (
+            current_group is not None
+            and len(current_group) < coalesce_max_group_size
+            and changeset_id not in boundary_changesets
+            and current_group[-1] not in boundary_changesets
+            and current_group[-1] not in label_changesets
+            and (not coalesce_same_author or (user and user == previous_user))
+            and date is not None and previous_date is not None
+            and datetime.timedelta(0) <= date - previous_date <= time_window
+        )
+
+        if can_join:
+            current_group.append(changeset_id)
+
+        else:
+            groups.append([changeset_id])
+
+        previous_user = user
+        previous_date = date
+
+    return groups
 
 def get_changeset_operations(changeset_details):
     """
@@ -270,21 +620,32 @@ def get_changeset_operations(changeset_details):
                 
             # Parses individual file operations.
             if in_changes_section and line:
-                # Usually, the format will be as follows: "operation $/path/to/file".
-                
-                parts = line.split()
+                # Usually, the format will be as follows: "operation $/path/to/file", or "operation, operation $/path/to/file" for combined changes (e.g., "rename, edit").
+                path_index = line.find('$/')
 
-                if len(parts) >= 2:
-                    operation = parts[0].lower().strip()
-                    file_path = ' '.join(parts[1:]).strip()  # Join in case path has spaces
+                if path_index > 0:
+                    change_types = [change_type.strip().lower() for change_type in line[:path_index].split(',')]
+                    file_path = line[path_index:].strip()
                     
                     # Removes TFS' version notation (e.g., ;X2, ;C123) from file paths.
                     if ';' in file_path:
                         file_path = file_path.split(';')[0]
                     
-                    # Processes only standard operations.
-                    if operation in ['add', 'edit', 'delete', 'rename', 'branch', 'merge']:
-                        file_operations.append((operation, file_path))
+                    # Processes only standard operations - a combined change is reduced to its primary operation (and a content edit, if any).
+                    if 'delete' in change_types:
+                        file_operations.append(('delete', file_path))
+
+                    elif 'undelete' in change_types or 'rename' in change_types:
+                        file_operations.append(('undelete' if 'undelete' in change_types else 'rename', file_path))
+
+                        if 'edit' in change_types:
+                            file_operations.append(('edit', file_path))
+
+                    else:
+                        for operation in ['branch', 'add', 'merge', 'edit']:
+                            if operation in change_types:
+                                file_operations.append((operation, file_path))
+                                break
                         
     except Exception as e:
         print(f"\n\033[1;31m[ERROR] Failed to parse changeset operations: {e}\033[0m")
@@ -422,17 +783,158 @@ def undo_pending_changes():
         print(f"\033[1;31m[ERROR] Failed to undo pending changes: {e}\033[0m")
         return False
 
-def process_changeset_operations(operations):
+def get_changeset_changes(changeset_id):
+    """
+    This function fetches the changes of a source changeset from the REST API, including the original path of renamed items ('sourceServerItem')
+    and the sources of merges ('mergeSources').
+
+    Returns: Dictionary {server_path: change}, or None if the changes could not be fetched.
+    """
+    if not source_pat:
+        return None
+
+    url = f"{source_collection}/_apis/tfvc/changesets/{changeset_id}/changes"
+    headers = {
+        "Accept": "application/json",
+        "Authorization": f"Basic {base64.b64encode(f':{source_pat}'.encode()).decode()}"
+    }
+
+    changes = {}
+    page_size = 1000
+    skip = 0
+
+    try:
+        while True:
+            response = requests.get(url, headers=headers, params={"api-version": "7.1", "$top": page_size, "$skip": skip})
+
+            if response.status_code != 200:
+                print(f"\033[1;31m[ERROR] Failed to fetch the changes of changeset no. {changeset_id}.\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                return None
+
+            page = response.json().get("value", [])
+
+            for change in page:
+                changes[change.get("item", {}).get("path")] = change
+
+            if len(page) < page_size:
+                return changes
+
+            skip += page_size
+
+    except requests.exceptions.RequestException as e:
+        print(f"\033[1;31m[ERROR] An error occurred while fetching the changes of changeset no. {changeset_id}: {e}\033[0m")
+        return None
+
+def convert_server_path_to_target_server(server_path):
+    """
+    This function converts a source TFS server path (e.g. $/SoftwareDev/File.cs) into the respective target TFS server path.
+    """
+    if server_path.startswith(source_server_path):
+        return target_server_path.rstrip('/') + server_path[len(source_server_path):]
+
+    return server_path
+
+def filter_redundant_renames(operations, rename_sources):
+    """
+    This function filters out 'rename' operations of items that are moved together with their renamed parent folder.
+    """
+    renamed_folders = []
+    filtered_operations = []
+
+    # Parents come before their children when sorted by path length.
+    for operation, path in sorted(operations, key=lambda x: len(x[1])):
+        if operation != 'rename':
+            continue
+
+        source_path = rename_sources[path]
+        parent = next(((old, new) for old, new in renamed_folders if path.startswith(new + '/') and source_path == old + path[len(new):]), None)
+
+        if parent:
+            print(f"\033[1m[INFO] Skipping redundant 'rename' operation: '{path}' (parent '{parent[1]}' already being renamed).\033[0m")
+
+        else:
+            renamed_folders.append((source_path, path))
+
+    kept_renames = {new for old, new in renamed_folders}
+
+    for operation, path in operations:
+        if operation != 'rename' or path in kept_renames:
+            filtered_operations.append((operation, path))
+
+    return filtered_operations
+
+def rename_item(source_server_item, server_path):
+    """
+    This function handles rename operations - the item is renamed (moved) in the target workspace with 'tf rename', so it is moved on the server
+    instead of being uploaded again, and its history is preserved.
+    """
+    try:
+        old_local_path = convert_server_path_to_target_local(source_server_item)
+        new_local_path = convert_server_path_to_target_local(server_path)
+
+        os.makedirs(os.path.dirname(new_local_path), exist_ok=True)
+
+        return bool(execute_tf_command(f'rename "{old_local_path}" "{new_local_path}" /noprompt'))
+
+    except Exception as e:
+        print(f"\n\033[1;31m[ERROR] Failed to rename '{source_server_item}' to '{server_path}': {e}\033[0m")
+        return False
+
+def undelete_item(server_path):
+    """
+    This function handles undelete operations - the deleted item is restored in the target repository with 'tf undelete', so its history is preserved.
+    """
+    try:
+        return bool(execute_tf_command(f'undelete "{convert_server_path_to_target_server(server_path)}" /recursive /noprompt'))
+
+    except Exception as e:
+        print(f"\n\033[1;31m[ERROR] Failed to undelete '{server_path}': {e}\033[0m")
+        return False
+
+def log_merge_metadata(changeset_id, server_path, change):
+    """
+    This function logs the merge sources of a migrated merge operation (the merge itself is migrated as a content edit).
+    """
+    merge_sources = [{
+        "source": merge_source.get("serverItem"),
+        "version_from": merge_source.get("versionFrom"),
+        "version_to": merge_source.get("versionTo")
+    } for merge_source in (change or {}).get("mergeSources", [])]
+
+    with open(merge_history_file, "a") as f:
+        f.write(json.dumps({"changeset": changeset_id, "path": server_path, "merge_sources": merge_sources}) + "\n")
+
+def process_changeset_operations(operations, changeset_id=None):
     """
     This function processes each file operation from a changeset individually, rather than using the bulk "copy everything + add everything" approach. In other words, this function checks what operation (e.g. add, edit) has been performed upon each file in the changeset. Reduces unnecessary conflicts and improves performance.
     """
     try:
         print(f"\n\033[1m[INFO] Processing {len(operations)} individual operations...\033[0m")
+
+        # Renames and merges need details the 'tf changeset' output does not include (the original path and the merge sources).
+        changes = {}
+
+        if any(op in ('rename', 'merge') for op, path in operations):
+            changes = get_changeset_changes(changeset_id) or {}
+
+        rename_sources = {path: changes.get(path, {}).get("sourceServerItem") for op, path in operations if op == 'rename'}
+        unresolved_renames = [path for path, source_path in rename_sources.items() if not source_path]
+
+        if unresolved_renames:
+            print(f"\033[1;38;5;214m[WARNING] The original path of {len(unresolved_renames)} renamed item(s) is unknown (e.g. '{unresolved_renames[0]}').\033[0m")
+            return False
+
+        # Renames (parents first) and undeletes are processed before the content operations upon the renamed/restored items.
+        operations = filter_redundant_renames(operations, rename_sources)
+        operation_order = {'rename': 0, 'undelete': 1}
+        operations = sorted(operations, key=lambda x: (operation_order.get(x[0], 2), len(x[1]) if x[0] == 'rename' else 0))
         
         actual_files_added = 0    # Files that were successfully added to TFS.
         already_tracked_files = 0 # Files that were already tracked (not added again).
         skipped_directories = 0   # Directories that were skipped.
         edit_count = 0            # Files that were successfully edited.
+        rename_count = 0          # Items that were successfully renamed or undeleted.
         other_count = 0           # Other operations (delete, etc).
         failed_operations = 0     # Operations that failed.
         
@@ -452,7 +954,51 @@ def process_changeset_operations(operations):
                 print(f"\033[1;36m[DEBUG] Source local file path: {source_local_file_path}\033[0m")
                 print(f"\033[1;36m[DEBUG] Target local file path: {target_local_file_path}\033[0m")
             
-            if operation == 'add':
+            if operation == 'rename':
+                if rename_item(rename_sources[file_path], file_path):
+                    rename_count += 1
+
+                # A renamed folder (or an item whose old path still exists in the target) cannot be replaced by adding content,
+                # so the whole changeset falls back to the bulk processing.
+                elif os.path.isdir(source_local_file_path) or os.path.exists(convert_server_path_to_target_local(rename_sources[file_path])):
+                    print(f"\033[1;31m[ERROR] Failed to rename '{rename_sources[file_path]}' to '{file_path}'.\033[0m")
+                    return False
+
+                # If the renamed file never reached the target (e.g., its old path is outside the migrated scope), its content is added at its new path.
+                elif copy_and_add_file(source_local_file_path, target_local_file_path)[0] in ('success', 'already_tracked'):
+                    actual_files_added += 1
+
+                else:
+                    failed_operations += 1
+
+            elif operation == 'undelete':
+                if undelete_item(file_path):
+                    rename_count += 1
+
+                # If the item cannot be undeleted (e.g. it was deleted more than once), its content is added again.
+                elif copy_and_add_file(source_local_file_path, target_local_file_path)[0] in ('success', 'skipped', 'already_tracked'):
+                    actual_files_added += 1
+
+                else:
+                    failed_operations += 1
+
+            elif operation == 'merge':
+                # A merge is migrated as a content edit (or an add, when the merged item is new), and its merge sources are logged.
+                if os.path.isdir(source_local_file_path):
+                    skipped_directories += 1
+
+                elif os.path.exists(target_local_file_path) and checkout_and_update_file(source_local_file_path, target_local_file_path):
+                    edit_count += 1
+                    log_merge_metadata(changeset_id, file_path, changes.get(file_path))
+
+                elif not os.path.exists(target_local_file_path) and copy_and_add_file(source_local_file_path, target_local_file_path)[0] == 'success':
+                    actual_files_added += 1
+                    log_merge_metadata(changeset_id, file_path, changes.get(file_path))
+
+                else:
+                    failed_operations += 1
+
+            elif operation in ('add', 'branch'):
                 status, success = copy_and_add_file(source_local_file_path, target_local_file_path)
                 
                 if status == 'success':
@@ -487,9 +1033,10 @@ def process_changeset_operations(operations):
         print(f"  • Files already tracked (not added): {already_tracked_files}")
         print(f"  • Directories skipped: {skipped_directories}")
         print(f"  • Edit operations: {edit_count}")
+        print(f"  • Rename/undelete operations: {rename_count}")
         print(f"  • Other operations: {other_count}")
         print(f"  • Failed operations: {failed_operations}")
-        print(f"\n\033[1m[INFO] Azure DevOps should show: {actual_files_added + edit_count + other_count} file changes.\033[0m")
+        print(f"\n\033[1m[INFO] Azure DevOps should show: {actual_files_added + edit_count + rename_count + other_count} file changes.\033[0m")
         print(f"\033[1m*\033[0m" * 80)
         
         return True
@@ -792,76 +1339,146 @@ def filter_redundant_deletes(operations):
     
     return optimized_operations
 
-def process_regular_changeset(changeset_id):
-   """
-   This function processes a regular (non-branch creation) changeset.
+def coalesce_changeset_operations(operations_lists):
+    """
+    This function merges the operations of consecutive changesets into the net operations of the group (one operation per path).
 
-   • For each changeset, the function gets the specific changeset from the source repository and check it into the target repository.
-   """
-   print("\n" + "\033[1m-\033[0m" * 100)
-   print(f"\033[1mPROCESSING REGULAR CHANGESET {changeset_id}\033[0m")
-   print("\033[1m-\033[0m" * 100)
+    • An add that is later deleted within the group cancels out, and a delete that is later re-added becomes an edit.
+    • Renames, undeletes and merges cannot be replayed natively as a part of a group, so the group falls back to the bulk processing.
 
-   # Step 1: Fetches the information about the current processed changeset to use later in check-in.
-   print(f"\n\033[1m[INFO] Fetching changeset details...\033[0m")
-   changeset_details = execute_tf_command(
-       f"changeset {changeset_id} /collection:{source_collection} /noprompt"
-   )
+    Returns: List of tuples [(operation, file_path), ...], or an empty list when the group has to be processed in bulk.
+    """
+    net_operations = {}
 
-   # Analyzes changeset details and provides insights about file count, types, potential issues, etc.
-   operations = analyze_changeset(changeset_details, changeset_id)
+    for operations in operations_lists:
+        # A changeset whose operations could not be parsed leaves the net result unknown.
+        if not operations:
+            return []
+
+        for operation, file_path in operations:
+            if operation in ('rename', 'undelete', 'merge'):
+                print(f"\n\033[1m[INFO] The group has a '{operation}' operation ('{file_path}'); using bulk processing for the whole group.\033[0m")
+                return []
 
-   # Extracts changeset's comment and user details.
-   comment_match = re.search(r"Comment:\s*(.*?)(?:\r?\n\r?\n|\r?\n$|$)", changeset_details, re.DOTALL)
-   user_match = re.search(r"User:\s*(.*?)(?:\r?\n)", changeset_details)
+            previous_operation = net_operations.get(file_path)
 
-   MAX_COMMENT_LENGTH = 2048
+            if operation in ('add', 'branch'):
+                net_operations[file_path] = 'edit' if previous_operation == 'delete' else 'add'
 
-   # Builds the new comment for the check-in.
-   if comment_match:
-       original_comment = comment_match.group(1).strip()
+            elif operation == 'edit':
+                net_operations[file_path] = 'add' if previous_operation == 'add' else 'edit'
+
+            elif operation == 'delete':
+                if previous_operation == 'add':
+                    net_operations.pop(file_path) # The item never existed outside of the group.
+
+                else:
+                    net_operations[file_path] = 'delete'
+
+    return [(operation, file_path) for file_path, operation in net_operations.items()]
+
+def extract_changeset_comment_and_user(changeset_details):
+    """
+    This function extracts the comment and the user of a changeset from the 'tf changeset' command output.
+
+    Returns: Tuple (comment, user) - the comment is cleaned to prevent TFS command line issues; missing values are empty strings.
+    """
+    comment_match = re.search(r"Comment:\s*(.*?)(?:\r?\n\r?\n|\r?\n$|$)", changeset_details or "", re.DOTALL)
+    user_match = re.search(r"User:\s*(.*?)(?:\r?\n)", changeset_details or "")
+
+    original_comment = ""
+    original_user = user_match.group(1).strip() if user_match else ""
+
+    if comment_match:
+        original_comment = comment_match.group(1).strip()
 
         # Cleans comment to prevent TFS command line issues.
-       original_comment = original_comment.replace('\n', ' ').replace('\r', '')
-       original_comment = ' '.join(original_comment.split()) # Removes extra spaces.
-       original_comment = original_comment.replace('"', "'") # Replaces double quotes with single quotes.
+        original_comment = original_comment.replace('\n', ' ').replace('\r', '')
+        original_comment = ' '.join(original_comment.split()) # Removes extra spaces.
+        original_comment = original_comment.replace('"', "'") # Replaces double quotes with single quotes.
 
-   else:
-       original_comment = ""
-   
-   if user_match:
-       original_user = user_match.group(1).strip()
+    return original_comment, original_user
 
-       if original_comment:
-           new_comment = f"#{changeset_id}: {original_comment} ({original_user})"
-           base_part = f"#{changeset_id}: "
-           user_part = f" ({original_user})"
-           available_space = MAX_COMMENT_LENGTH - len(base_part) - len(user_part)
+def build_checkin_comment(changeset_ids, comments_and_users):
+    """
+    This function builds the check-in comment of the migrated changeset(s): "#<id>: <comment> (<user>)".
+    A coalesced group lists all of its changeset IDs ("#<id1>,#<id2>: <comment1> | <comment2> (<user>)"), so the link remapping can still find them.
+    """
+    MAX_COMMENT_LENGTH = 2048
 
-           if len(original_comment) > available_space:
-               truncated_comment = original_comment[:available_space-15] + "...[truncated]"
-               new_comment = f"{base_part}{truncated_comment}{user_part}"
+    original_comment = " | ".join(comment for comment, user in comments_and_users if comment)
+    original_users = []
 
-           else:
-               new_comment = f"{base_part}{original_comment}{user_part}"
-               
-       else:
-           new_comment = f"#{changeset_id}: ({original_user})"
+    for comment, user in comments_and_users:
+        if user and user not in original_users:
+            original_users.append(user)
+
+    original_user = ", ".join(original_users)
+    base_part = ",".join(f"#{changeset_id}" for changeset_id in changeset_ids)
+
+    if not original_comment and not original_user:
+        return base_part
+
+    if not original_comment:
+        return f"{base_part}: ({original_user})"
+
+    base_part = f"{base_part}: "
+    user_part = f" ({original_user})" if original_user else ""
+    available_space = MAX_COMMENT_LENGTH - len(base_part) - len(user_part)
+
+    if len(original_comment) > available_space:
+        original_comment = original_comment[:available_space-15] + "...[truncated]"
+
+    return f"{base_part}{original_comment}{user_part}"
+
+def process_regular_changeset(changeset_id, cost_model=None, stage_timings=None, coalesced_changesets=None):
+   """
+   This function processes a regular (non-branch creation) changeset.
+
+   • For each changeset, the function gets the specific changeset from the source repository and check it into the target repository.
+   • When a cost model is provided, the cheaper processing strategy (targeted or bulk) is chosen for the changeset.
+   • The duration of each stage is recorded in the 'stage_timings' dictionary (if provided).
+   • When 'coalesced_changesets' is provided (the changesets preceding 'changeset_id' in its group), the whole group is checked in as one changeset.
+   """
+   if stage_timings is None:
+       stage_timings = {}
+
+   changeset_ids = (coalesced_changesets or []) + [changeset_id]
+
+   print("\n" + "\033[1m-\033[0m" * 100)
+
+   if len(changeset_ids) > 1:
+       print(f"\033[1mPROCESSING COALESCED CHANGESETS {', '.join(str(group_changeset_id) for group_changeset_id in changeset_ids)}\033[0m")
 
    else:
-       if original_comment:
-           base_part = f"#{changeset_id}: "
-           available_space = MAX_COMMENT_LENGTH - len(base_part)
+       print(f"\033[1mPROCESSING REGULAR CHANGESET {changeset_id}\033[0m")
 
-           if len(original_comment) > available_space:
-               truncated_comment = original_comment[:available_space-15] + "...[truncated]"
-               new_comment = f"{base_part}{truncated_comment}"
+   print("\033[1m-\033[0m" * 100)
 
-           else:
-               new_comment = f"{base_part}{original_comment}"
+   # Step 1: Fetches the information about the current processed changeset(s) to use later in check-in.
+   print(f"\n\033[1m[INFO] Fetching changeset details...\033[0m")
+   stage_start_time = time.time()
+   changesets_details = [
+       execute_tf_command(f"changeset {group_changeset_id} /collection:{source_collection} /noprompt") for group_changeset_id in changeset_ids
+   ]
+   stage_timings["describe"] = time.time() - stage_start_time
 
-       else:
-           new_comment = f"#{changeset_id}"
+   # Analyzes changeset details and provides insights about file count, types, potential issues, etc.
+   operations_lists = [analyze_changeset(changeset_details, group_changeset_id) for changeset_details, group_changeset_id in zip(changesets_details, changeset_ids)]
+   operations = operations_lists[0] if len(operations_lists) == 1 else coalesce_changeset_operations(operations_lists)
+
+   # Extracts changeset's comment and user details, and builds the new comment for the check-in.
+   comments_and_users = [extract_changeset_comment_and_user(changeset_details) for changeset_details in changesets_details]
+   new_comment = build_checkin_comment(changeset_ids, comments_and_users)
+
+   # Excluded folders touched by this changeset are cloaked before the download, and their operations are dropped.
+   if operations and excluded_paths:
+       cloak_excluded_folders([path for op, path in operations if is_excluded_path(get_relative_server_path(path))])
+       operations = filter_excluded_operations(operations)
+
+       if not operations:
+           print(f"\n\033[1m[INFO] All the operations of changeset no. {changeset_id} are upon excluded paths; nothing to migrate.\033[0m")
+           return True
 
    # Step 2: Downloads the exact state of files as they were in the current processed changeset.
    print(f"\n\033[1m[INFO] Fetching the state of the changeset...\033[0m")
@@ -870,9 +1487,11 @@ def process_regular_changeset(changeset_id):
    os.chdir(local_source_path)
    print(f"Current working directory: {os.getcwd()}\n")
 
+   stage_start_time = time.time()
    get_result = execute_tf_command(
        f"get \"{source_server_path}\" /version:C{changeset_id} /recursive"
    )
+   stage_timings["get"] = time.time() - stage_start_time
 
    if not get_result:
        print(f"\n\033[1;31m[ERROR] Failed to fetch the state of changeset no. {changeset_id}.\033[0m")
@@ -888,23 +1507,39 @@ def process_regular_changeset(changeset_id):
    
    if operations:
        operations = filter_redundant_deletes(operations)
+
+   stage_timings["operations"] = len(operations)
+   stage_timings["added"] = len([op for op, path in operations if op == 'add'])
+   stage_timings["deleted"] = len([op for op, path in operations if op == 'delete'])
+
+   if cost_model is not None:
+       strategy, stage_timings["predicted_seconds"] = choose_processing_strategy(cost_model, operations)
+
+       if strategy == 'bulk':
+           operations = []
+
+   stage_timings["strategy"] = 'targeted' if operations else 'bulk'
    
    if operations:
        # Uses targeted approach - only changed files are processed.
        print(f"\n\033[1m[PROGRESS] Using targeted processing for {len(operations)} operations...\033[0m")
+       stage_start_time = time.time()
        
        # Cleans up any existing pending changes first.
        undo_pending_changes()
        
-       success = process_changeset_operations(operations)
+       success = process_changeset_operations(operations, changeset_id)
+       stage_timings["targeted"] = time.time() - stage_start_time
 
        if not success:
            print(f"\n\033[1;31m[ERROR] Failed to process changeset's no. {changeset_id} operations, falling back to bulk processing.\033[0m")
+           undo_pending_changes() # Partially applied operations are undone, so the bulk processing starts from a clean workspace.
            operations = []
    
    if not operations:
        # Falls back to original bulk processing approach.
        print(f"\n\033[1m[PROGRESS] Using bulk processing approach...\033[0m")
+       stage_start_time = time.time()
 
        print(f"\n\033[1m[INFO] Cleaning target workspace directory (preserving .tf metadata)...\033[0m")
        print(f"\033[1m[PROGRESS] Starting clean operation...\033[0m")
@@ -967,6 +1602,8 @@ def process_regular_changeset(changeset_id):
        #else:
            #print(f"\033[1;32m[SUCCESS] Successfully resolved conflicts!\033[0m")
 
+       stage_timings["bulk"] = time.time() - stage_start_time
+
    # Verifies files were successfully staged for check-in.
    final_status = execute_tf_command("status")
 
@@ -980,6 +1617,7 @@ def process_regular_changeset(changeset_id):
 
    max_retries = 3
    retry_count = 0
+   stage_start_time = time.time()
    
    while retry_count <= max_retries:
        print(f"\n\033[1m[PROGRESS] Check-in attempt {retry_count + 1}/{max_retries + 1}...\033[0m")
@@ -991,6 +1629,7 @@ def process_regular_changeset(changeset_id):
        
        if checkin_result:
            #print(f"\n\033[1;32m[SUCCESS] Successfully processed changeset no. {changeset_id}.\033[0m")
+           stage_timings["checkin"] = time.time() - stage_start_time
            return True
        
        print(f"\n\033[1;38;5;214m[WARNING] Check-in attempt {retry_count + 1} failed.\033[0m")
@@ -1017,7 +1656,7 @@ def process_regular_changeset(changeset_id):
    print(f"\n\033[1;31m[ERROR] Failed to check-in the changeset.\033[0m")
    return False
 
-def copy_files_recursively(source_local_directory, target_local_directory):
+def copy_files_recursively(source_local_directory, target_local_directory, relative_directory=""):
     """
     This function copies files from the source workspace (where files are downloaded from the source TFVC server) to the target workspace 
     (where they will be added to the target TFVC server).
@@ -1026,15 +1665,20 @@ def copy_files_recursively(source_local_directory, target_local_directory):
         # Extracts the name of each file, and builds full paths for source and destination directories.
         source_item = os.path.join(source_local_directory, item)
         destination_item = os.path.join(target_local_directory, item)
+        relative_item = f"{relative_directory}/{item}" if relative_directory else item
         
         # Skips the ".tf" directory as it contains each workspace TFS metadata, and copying it would corrupt the target workspace.
         if item == '.tf':
             continue
+
+        # Skips excluded paths (e.g., build outputs left in the source workspace before their folder was cloaked).
+        if is_excluded_path(relative_item):
+            continue
             
         # If the source item is a directory, a respective target directory should exist in the target workspace.
         if os.path.isdir(source_item):
             os.makedirs(destination_item, exist_ok=True) # 'exist_ok=True' means "do not error if directories already exist".
-            copy_files_recursively(source_item, destination_item) # Recursive call.
+            copy_files_recursively(source_item, destination_item, relative_item) # Recursive call.
 
         # The source item is a file.
         else:
@@ -1076,6 +1720,119 @@ def clean_target_workspace_content():
     else:
         print(f"\n\033[1m[INFO] Target workspace was already clean.\033[0m")
 
+def load_cost_model():
+    """
+    This function loads the processing cost model, or creates it with initial estimates when it does not exist yet.
+
+    • 'targeted_seconds_per_operation' - the targeted processing time per operation (a 'tf' command or more per file).
+    • 'bulk_seconds_per_file' - the bulk processing (clean + copy + reconcile) time per file in the workspace tree.
+    """
+    cost_model = {
+        "targeted_seconds_per_operation": 2.0,
+        "bulk_seconds_per_file": 0.005,
+        "targeted_samples": 0,
+        "bulk_samples": 0
+    }
+
+    if os.path.exists(cost_model_file):
+        try:
+            with open(cost_model_file, "r") as f:
+                cost_model.update(json.load(f))
+
+        except Exception as e:
+            print(f"\033[1;38;5;214m[WARNING] Could not load the cost model from '{cost_model_file}'; using initial estimates: {e}\033[0m")
+
+    return cost_model
+
+def count_workspace_files(workspace_path):
+    """
+    This function counts the files in a workspace directory (excluding the TFS metadata and the excluded paths) - the bulk processing cost driver.
+    """
+    file_count = 0
+
+    for directory, subdirectories, files in os.walk(workspace_path):
+        relative_directory = os.path.relpath(directory, workspace_path).replace(os.sep, '/').lstrip('.').lstrip('/')
+        subdirectories[:] = [d for d in subdirectories if d not in ('.tf', '$tf')
+                             and not is_excluded_path(f"{relative_directory}/{d}" if relative_directory else d)]
+        file_count += len(files)
+
+    return file_count
+
+def choose_processing_strategy(cost_model, operations):
+    """
+    This function predicts the cost of the targeted and bulk processing for a changeset, and chooses the cheaper one.
+    'operations' are expected after the redundant deletes were filtered out.
+
+    Returns: Tuple (strategy, predicted_seconds) where strategy is either 'targeted' or 'bulk'.
+    """
+    tree_file_count = cost_model.get("tree_file_count", 0)
+    predicted_targeted = len(operations) * cost_model["targeted_seconds_per_operation"]
+    predicted_bulk = tree_file_count * cost_model["bulk_seconds_per_file"]
+
+    # Without operations (or without a known tree size) only one strategy is possible.
+    if not operations:
+        return 'bulk', predicted_bulk
+
+    # Renames, undeletes and merges are preserved only by the targeted processing. A renamed folder also lists an operation per child
+    # (filtered out only once the rename sources are known), so its operation count does not reflect its cost.
+    if any(op in ('rename', 'undelete', 'merge') for op, path in operations):
+        return 'targeted', predicted_targeted
+
+    if tree_file_count == 0 or predicted_targeted <= predicted_bulk:
+        return 'targeted', predicted_targeted
+
+    print(f"\n\033[1m[INFO] Bulk processing is predicted to be cheaper ({predicted_bulk:.1f}s for {tree_file_count} files vs. {predicted_targeted:.1f}s for {len(operations)} operations).\033[0m")
+
+    return 'bulk', predicted_bulk
+
+def record_changeset_cost(cost_model, changeset_id, stage_timings, success, changeset_group=None):
+    """
+    This function recalibrates the cost model with the observed timings of a processed changeset,
+    logs the prediction next to the actual time, and saves the model.
+
+    For a coalesced group, 'changeset_group' lists all of its changesets (all of them are logged, since the group was replayed as one).
+    """
+    strategy = stage_timings.get("strategy")
+    operations_count = stage_timings.get("operations", 0)
+    tree_file_count = cost_model.get("tree_file_count", 0)
+
+    # Only successful runs of a single strategy are used for the recalibration, so failures and fallbacks do not skew the model.
+    if success and strategy == 'targeted' and 'bulk' not in stage_timings and operations_count:
+        observed = stage_timings["targeted"] / operations_count
+        cost_model["targeted_seconds_per_operation"] += cost_model_smoothing * (observed - cost_model["targeted_seconds_per_operation"])
+        cost_model["targeted_samples"] += 1
+
+    elif success and 'bulk' in stage_timings and 'targeted' not in stage_timings and tree_file_count:
+        observed = stage_timings["bulk"] / tree_file_count
+        cost_model["bulk_seconds_per_file"] += cost_model_smoothing * (observed - cost_model["bulk_seconds_per_file"])
+        cost_model["bulk_samples"] += 1
+
+    # Keeps the tree size estimate up to date without walking the workspace again.
+    cost_model["tree_file_count"] = max(0, tree_file_count + stage_timings.get("added", 0) - stage_timings.get("deleted", 0))
+
+    actual_seconds = stage_timings.get("targeted", 0) + stage_timings.get("bulk", 0)
+    log_entry = {
+        "changeset": changeset_id,
+        "changesets": changeset_group or [changeset_id],
+        "strategy": "targeted+bulk" if 'targeted' in stage_timings and 'bulk' in stage_timings else strategy,
+        "operations": operations_count,
+        "tree_files": tree_file_count,
+        "predicted_seconds": round(stage_timings.get("predicted_seconds", 0), 2),
+        "actual_seconds": round(actual_seconds, 2),
+        "stage_timings": {stage: round(stage_timings[stage], 2) for stage in ("describe", "get", "targeted", "bulk", "checkin") if stage in stage_timings},
+        "success": bool(success)
+    }
+
+    try:
+        with open(cost_log_file, "a") as f:
+            f.write(json.dumps(log_entry) + "\n")
+
+        with open(cost_model_file, "w") as f:
+            json.dump(cost_model, f, indent=4)
+
+    except Exception as e:
+        print(f"\033[1;38;5;214m[WARNING] Could not save the cost model: {e}\033[0m")
+
 def save_migration_state(last_processed_changeset, branch_changeset, all_changesets):
     """
     This function captures the migration state to a local file when encountering a branch creation changeset.
@@ -1183,7 +1940,9 @@ def process_repository_changesets(history_file):
     
     # Fetches all changesets from repository's history file.
     start_time = time.time()
-    all_changesets = parse_history_file(history_file=history_file)
+    print(f"\033[1m[INFO] Extracting changeset IDs from the '{history_file}' history file...\033[0m")
+    history_records = scan_history_file(history_file)
+    all_changesets = [changeset_id for changeset_id, user, date in history_records]
     
     parse_time = time.time() - start_time
     
@@ -1193,14 +1952,34 @@ def process_repository_changesets(history_file):
     
     total_changesets = len(all_changesets)
     print(f"\n\033[1m[INFO] Found {total_changesets} changesets in repository's history file (took {parse_time:.2f} seconds).\033[0m")
+
+    if excluded_paths:
+        apply_workspace_cloaks()
+
+    cost_model = None
+
+    if adaptive_processing_strategy:
+        cost_model = load_cost_model()
+        cost_model["tree_file_count"] = count_workspace_files(local_source_path)
+        print(f"\033[1m[INFO] Adaptive processing strategy enabled ({cost_model['tree_file_count']} files in the source workspace).\033[0m")
+    
+    if coalesce_changesets:
+        changeset_groups = group_consecutive_changesets(history_records)
+        print(f"\033[1m[INFO] Coalescing enabled - {total_changesets} changesets will be checked in as {len(changeset_groups)} changesets.\033[0m")
+
+    else:
+        changeset_groups = [[changeset_id] for changeset_id in all_changesets]
     
     # Counters.
     success_count = 0
     failure_count = 0
     last_processed_changeset = None
+    index = -1
     
-    # Processes the changesets sequentially.
-    for index, changeset_id in enumerate(all_changesets):
+    # Processes the changesets (or the groups of coalesced changesets) sequentially.
+    for changeset_group in changeset_groups:
+        changeset_id = changeset_group[-1] # A group is checked in at the state of its last changeset.
+        index += len(changeset_group) # The index of the group's last changeset.
         progress = (index + 1) / total_changesets * 100 # Calculates progress percentage.
         
         # Checks whether this is an any branch creation changeset.
@@ -1219,19 +1998,23 @@ def process_repository_changesets(history_file):
             return success_count, failure_count, changeset_id
         
         changeset_start_time = time.time()
+        stage_timings = {}
         
         try:
-            result = process_regular_changeset(changeset_id)
+            result = process_regular_changeset(changeset_id, cost_model, stage_timings, changeset_group[:-1])
+
+            if cost_model is not None:
+                record_changeset_cost(cost_model, changeset_id, stage_timings, result, changeset_group)
             
             if result:
-                success_count += 1
+                success_count += len(changeset_group)
                 last_processed_changeset = changeset_id
                 changeset_time = time.time() - changeset_start_time
-                print(f"\n\033[1;32m[SUCCESS] Successfully processed changeset no. {changeset_id} (took {changeset_time:.2f} seconds)!\033[0m")
+                print(f"\n\033[1;32m[SUCCESS] Successfully processed changeset no. {', '.join(str(group_changeset_id) for group_changeset_id in changeset_group)} (took {changeset_time:.2f} seconds)!\033[0m")
 
             else:
-                failure_count += 1
-                print(f"\n\033[1;31m[ERROR] Failed to process changeset no. {changeset_id}.\033[0m")
+                failure_count += len(changeset_group)
+                print(f"\n\033[1;31m[ERROR] Failed to process changeset no. {', '.join(str(group_changeset_id) for group_changeset_id in changeset_group)}.\033[0m")
                 
             # Calculates estimated time remaining.
             elapsed_time = time.time() - start_time
@@ -1249,7 +2032,7 @@ def process_repository_changesets(history_file):
             print(f"• Estimated time remaining: {int(hours)}h {int(minutes)}m {int(seconds)}s")
                 
         except Exception as e:
-            failure_count += 1
+            failure_count += len(changeset_group)
             print(f"\033[1;31m[ERROR] An error occurred while processing changeset no. {changeset_id}: {e}\033[0m")
             traceback.print_exc() # A detailed output of the exception.
     
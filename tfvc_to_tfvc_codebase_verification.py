@@ -9,8 +9,16 @@ import csv
 import re
 import random
 import time
+import bisect
+import codecs
+import collections
+import sqlite3
+import threading
+import concurrent.futures
 import pyfiglet
 
+from tfvc_to_tfvc_codebase import excluded_paths, get_excluded_root, get_relative_server_path, is_beneath_path
+
 load_dotenv()
 
 SOURCE_ORGANIZATION=os.getenv("SOURCE_ORGANIZATION")
@@ -30,9 +38,247 @@ TARGET_AUTHENTICATION_HEADER = {
     "Authorization": f"Basic {base64.b64encode(f':{TARGET_PAT}'.encode()).decode()}"
 }
 
-def get_items(organization, project_name, tfvc_path, authentication_header, recursion="Full"):
+# Optional content-addressed cache of the downloaded item content (shared by the verification runs).
+# Items are keyed by their TFVC hash (MD5), so identical files in sibling branches (and in repeated runs) are downloaded only once.
+CONTENT_CACHE_DIRECTORY = os.getenv("CONTENT_CACHE_DIRECTORY")
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", 20 * 1024 * 1024 * 1024))
+
+# The paths excluded from the migration are excluded from the verification as well - the 'excluded_paths' rules and their matcher are
+# imported from 'tfvc_to_tfvc_codebase.py', so both scripts always exclude the same paths.
+
+# Content verification - 'CONTENT_SAMPLE_SIZE' random files are compared, or all files when it is 0 (full coverage).
+# Files are compared by a bounded pool of worker threads, each holding its own keep-alive connection pool to the source and target servers.
+CONTENT_SAMPLE_SIZE = int(os.getenv("CONTENT_SAMPLE_SIZE", 30))
+CONTENT_VERIFICATION_WORKERS = int(os.getenv("CONTENT_VERIFICATION_WORKERS", 16))
+
+# Content sampling - "uniform" picks the sampled files at random, "stratified" covers as many extensions, size buckets, top-level folders and
+# history ranges as possible, and weights the sample toward risky files: files last modified by changesets that were replayed with the bulk
+# processing (read from the 'replay_cost_log.jsonl' of 'tfvc_to_tfvc_codebase.py'), dot-files and paths of at least 'LONG_PATH_LENGTH' characters.
+# Each risk reason multiplies the weight of a file by 'RISK_WEIGHT'.
+CONTENT_SAMPLING_STRATEGY = os.getenv("CONTENT_SAMPLING_STRATEGY", "stratified")
+REPLAY_COST_LOG_FILE = os.getenv("REPLAY_COST_LOG_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "replay_cost_log.jsonl"))
+LONG_PATH_LENGTH = int(os.getenv("LONG_PATH_LENGTH", 200))
+RISK_WEIGHT = float(os.getenv("RISK_WEIGHT", 4))
+
+# When enabled, files are first compared by the hash (MD5) and size metadata of the source and target items listings, and only
+# mismatching files (or files without a hash) are downloaded for a full-byte comparison.
+VERIFY_BY_METADATA = os.getenv("VERIFY_BY_METADATA", "true").lower() == "true"
+
+# File content is streamed in chunks into incremental hashers, so the memory usage does not depend on the file sizes.
+# • 'CONTENT_MEMORY_LIMIT_BYTES' bounds the chunk buffers of all workers together (the chunk size is derived from the number of workers).
+# • 'HASH_SOURCE_AND_TARGET_CONCURRENTLY' streams the source and target content of a file at the same time (twice the connections).
+CONTENT_MEMORY_LIMIT_BYTES = int(os.getenv("CONTENT_MEMORY_LIMIT_BYTES", 256 * 1024 * 1024))
+HASH_SOURCE_AND_TARGET_CONCURRENTLY = os.getenv("HASH_SOURCE_AND_TARGET_CONCURRENTLY", "true").lower() == "true"
+
+# Tree listing - "full" fetches a path with a single recursive listing, "segmented" splits it into many smaller listings that run in parallel
+# (for huge paths, whose single listing is hundreds of MB and may time out). Folders at 'LISTING_SPLIT_DEPTH' are listed recursively.
+LISTING_MODE = os.getenv("LISTING_MODE", "full")
+LISTING_SPLIT_DEPTH = int(os.getenv("LISTING_SPLIT_DEPTH", 2))
+LISTING_WORKERS = int(os.getenv("LISTING_WORKERS", 8))
+
+# Structure comparison - "full" lists and diffs both trees completely, "digest" compares Merkle-style folder digests top-down and keeps
+# both trees in a snapshot file between runs, so re-verification lists only the folders that changed since the previous run.
+STRUCTURE_COMPARISON_MODE = os.getenv("STRUCTURE_COMPARISON_MODE", "full")
+
+# Point-in-time verification - the trees are also compared at 'POINT_IN_TIME_SAMPLE_SIZE' historical versions (0 disables it).
+# The versions are selected by 'POINT_IN_TIME_STRATEGY' ("uniform", "random" or "latest"), and verified by 'POINT_IN_TIME_WORKERS' in parallel.
+POINT_IN_TIME_SAMPLE_SIZE = int(os.getenv("POINT_IN_TIME_SAMPLE_SIZE", 0))
+POINT_IN_TIME_STRATEGY = os.getenv("POINT_IN_TIME_STRATEGY", "uniform")
+POINT_IN_TIME_WORKERS = int(os.getenv("POINT_IN_TIME_WORKERS", 4))
+
+# Deep label verification - the items of each label (paths and versions, translated into the target changesets) are compared as well,
+# and the item lists of the labels are fetched by 'LABEL_VERIFICATION_WORKERS' in parallel.
+DEEP_LABEL_VERIFICATION = os.getenv("DEEP_LABEL_VERIFICATION", "true").lower() == "true"
+LABEL_VERIFICATION_WORKERS = int(os.getenv("LABEL_VERIFICATION_WORKERS", 8))
+
+# The entire changeset history is fetched in concurrent pages ('$skip' windows).
+CHANGESET_PAGING_WORKERS = int(os.getenv("CHANGESET_PAGING_WORKERS", 4))
+
+# The verification results are kept in a SQLite store, so later runs verify only the files whose versions advanced (or that failed before),
+# and fetch only the changesets created since the previous run. Set to an empty value to disable the store.
+VERIFICATION_STORE_FILE = os.getenv("VERIFICATION_STORE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "verification_store.db"))
+
+# Verification mode - "rest" verifies through the REST APIs of both servers, "local" compares the local source and target workspaces
+# (e.g., the 'local_source_path' and 'local_target_path' of 'tfvc_to_tfvc_codebase.py') without any API calls.
+VERIFICATION_MODE = os.getenv("VERIFICATION_MODE", "rest")
+LOCAL_SOURCE_PATH = os.getenv("LOCAL_SOURCE_PATH", r"P:\Src")
+LOCAL_TARGET_PATH = os.getenv("LOCAL_TARGET_PATH", r"P:\Trgt")
+LOCAL_HASHING_WORKERS = int(os.getenv("LOCAL_HASHING_WORKERS", os.cpu_count() or 1))
+
+thread_local_storage = threading.local()
+
+def get_session():
+    """
+    This function returns the HTTP session of the current thread, so connections are reused (keep-alive) instead of opened per request.
+    'requests.Session' is not guaranteed to be thread-safe, so every worker thread gets its own session.
+    """
+    session = getattr(thread_local_storage, "session", None)
+
+    if session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        thread_local_storage.session = session
+
+    return session
+
+def open_verification_store():
+    """
+    This function opens (or creates) the SQLite store of the verification results, which lets later runs verify only what changed.
+
+    • 'content_results' - the last content result of every source file, with the source and target item versions it was verified at,
+      per verification scope (the source and target organizations, projects and TFVC roots), so runs of other migrations never share results.
+    • 'changesets' - the changesets already fetched from each repository (only newer changesets are fetched by later runs).
+    • 'verification_runs' - the summary of every verification run.
+
+    Returns: A SQLite connection, or None if the store is disabled.
+    """
+    if not VERIFICATION_STORE_FILE:
+        return None
+
+    store = sqlite3.connect(VERIFICATION_STORE_FILE)
+
+    # Content results of stores created before the results were scoped cannot be attributed to a scope, so they are discarded.
+    content_columns = {row[1] for row in store.execute("PRAGMA table_info(content_results)")}
+
+    if content_columns and "source_root" not in content_columns:
+        store.execute("DROP TABLE content_results")
+
+    store.executescript("""
+        CREATE TABLE IF NOT EXISTS content_results (
+            source_organization TEXT, source_project TEXT, source_root TEXT, target_organization TEXT, target_project TEXT, target_root TEXT,
+            source_path TEXT, source_version INTEGER, target_version INTEGER,
+            source_hash TEXT, target_hash TEXT, match INTEGER, method TEXT, error TEXT, verified_at TEXT,
+            PRIMARY KEY (source_organization, source_project, source_root, target_organization, target_project, target_root, source_path)
+        );
+        CREATE TABLE IF NOT EXISTS changesets (
+            repository TEXT, changeset_id INTEGER, comment TEXT, author TEXT, created_date TEXT,
+            PRIMARY KEY (repository, changeset_id)
+        );
+        CREATE TABLE IF NOT EXISTS verification_runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT, verified_at TEXT, passed INTEGER, summary TEXT
+        );
+    """)
+
+    return store
+
+def get_stored_content_results(store, scope):
+    """
+    This function loads the stored content results of a verification scope - a tuple of the source organization, project and TFVC root,
+    and the target organization, project and TFVC root.
+
+    Returns: Dictionary {source_path: (source_version, target_version, match, source_hash, target_hash)}.
+    """
+    return {row[0]: row[1:] for row in store.execute(
+        """SELECT source_path, source_version, target_version, match, source_hash, target_hash FROM content_results
+           WHERE source_organization = ? AND source_project = ? AND source_root = ? AND target_organization = ? AND target_project = ? AND target_root = ?""",
+        scope)}
+
+def save_content_results(store, scope, results):
+    """
+    This function saves content results (dictionaries with the 'source_version' and 'target_version' they were verified at) of a verification
+    scope to the store.
+    """
+    verified_at = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    store.executemany("INSERT OR REPLACE INTO content_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+        (*scope, result["path"], result.get("source_version"), result.get("target_version"), result.get("source_hash"), result.get("target_hash"),
+         int(bool(result["match"])), result.get("method", "content"), result.get("error"), verified_at)
+        for result in results
+    ])
+    store.commit()
+
+def get_stored_changesets(store, repository):
+    """
+    This function loads the stored changesets of a repository (in the shape of the changesets REST API, most recent first).
+    """
+    return [{"changesetId": changeset_id, "comment": comment, "author": {"displayName": author}, "createdDate": created_date}
+            for changeset_id, comment, author, created_date in store.execute(
+                "SELECT changeset_id, comment, author, created_date FROM changesets WHERE repository = ? ORDER BY changeset_id DESC", (repository,))]
+
+def save_changesets(store, repository, changesets):
+    """
+    This function saves fetched changesets of a repository to the store.
+    """
+    store.executemany("INSERT OR REPLACE INTO changesets VALUES (?, ?, ?, ?, ?)", [
+        (repository, changeset['changesetId'], changeset.get('comment', ''), changeset.get('author', {}).get('displayName', ''), changeset.get('createdDate', ''))
+        for changeset in changesets
+    ])
+    store.commit()
+
+def is_excluded_path(tfvc_path, tfvc_root):
+    """
+    This function checks whether a TFVC path (beneath the verified 'tfvc_root') is excluded from the migration (and hence from the verification).
+    """
+    return bool(excluded_paths) and get_excluded_root(get_relative_server_path(tfvc_path, tfvc_root)) is not None
+
+# A compact record of a listed TFVC item (the raw listing objects hold many more fields, such as URLs, that are not needed).
+ItemRecord = collections.namedtuple("ItemRecord", ["path", "size", "hash", "version", "is_folder"])
+
+def iterate_json_array_items(chunks, array_key="value"):
+    """
+    This function parses the objects of a JSON array (the 'value' array of an Azure DevOps list response) incrementally from a stream
+    of byte chunks, so the whole response is never held in memory and the first objects are available before the response ends.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    array_start_pattern = re.compile(r'"' + array_key + r'"\s*:\s*\[')
+    buffer = ""
+    position = 0
+    in_array = False
+
+    for chunk in chunks:
+        buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+
+        if not in_array:
+            match = array_start_pattern.search(buffer)
+
+            if not match:
+                continue
+
+            position = match.end()
+            in_array = True
+
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+
+            if position >= len(buffer):
+                break
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                item, position_after = decoder.raw_decode(buffer, position)
+
+            except json.JSONDecodeError:
+                break # The object is not complete yet - waits for the next chunk.
+
+            yield item
+            position = position_after
+
+def get_items(organization, project_name, tfvc_path, authentication_header, recursion="Full", version=None):
+    """
+    This function fetches all TFVC items of a TFVC path in a project (at the latest version, or at changeset 'version' if provided).
+
+    The response is parsed incrementally into compact 'ItemRecord' records. When 'LISTING_MODE' is "segmented", a full listing
+    is split into many smaller listings (see 'get_items_segmented').
+
+    Returns: List of 'ItemRecord' records, or None if the listing failed.
     """
-    This function fetches all TFVC items of a TFVC path in a project.
+    if recursion == "Full" and LISTING_MODE == "segmented":
+        return get_items_segmented(organization, project_name, tfvc_path, authentication_header, version)
+
+    return get_items_single_listing(organization, project_name, tfvc_path, authentication_header, recursion, version)
+
+def get_items_single_listing(organization, project_name, tfvc_path, authentication_header, recursion="Full", version=None):
+    """
+    This function fetches the TFVC items of a TFVC path with a single listing request (regardless of 'LISTING_MODE').
+
+    Returns: List of 'ItemRecord' records, or None if the listing failed.
     """
     url = f"{organization}/{project_name}/_apis/tfvc/items"
     
@@ -48,6 +294,10 @@ def get_items(organization, project_name, tfvc_path, authentication_header, recu
     else:
         params["scopePath"] = tfvc_path
         params["recursionLevel"] = recursion
+
+    if version:
+        params["versionDescriptor.version"] = version
+        params["versionDescriptor.versionType"] = "changeset"
     
     headers = {
         "Accept": "application/json"
@@ -55,26 +305,149 @@ def get_items(organization, project_name, tfvc_path, authentication_header, recu
     headers.update(authentication_header)
     
     try:
-        response = requests.get(url, headers=headers, params=params)
-        #print(f"[DEBUG] Request's Status Code: {response.status_code}")
+        with get_session().get(url, headers=headers, params=params, stream=True) as response:
+            #print(f"[DEBUG] Request's Status Code: {response.status_code}")
 
-        if response.status_code == 200:
-            return response.json()
-        
-        else:
-            print(f"\033[1;31m[ERROR] Failed to fetch TFVC items from '{tfvc_path}' path.\033[0m")
-            print(f"[DEBUG] Request's Status Code: {response.status_code}")
-            print(f"[DEBUG] Response: {response.text}")
-            return None
+            if response.status_code == 200:
+                return [
+                    ItemRecord(item['path'], item.get('size'), item.get('hashValue'), item.get('version'), item.get('isFolder', False))
+                    for item in iterate_json_array_items(response.iter_content(chunk_size=64 * 1024)) if 'path' in item
+                ]
+            
+            else:
+                print(f"\033[1;31m[ERROR] Failed to fetch TFVC items from '{tfvc_path}' path.\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                print(f"[DEBUG] Response: {response.text}")
+                return None
         
     except requests.exceptions.RequestException as e:
         print(f"\033[1;31m[ERROR] An error occurred while fetching TFVC items: {e}\033[0m")
         return None
-    
-def get_item_content(organization, project_name, tfvc_path, authentication_header):
+
+def get_items_segmented(organization, project_name, tfvc_path, authentication_header, version=None):
+    """
+    This function fetches all TFVC items of a TFVC path by walking its folders breadth-first, instead of a single (huge) full listing.
+
+    • Folders above 'LISTING_SPLIT_DEPTH' are listed one level at a time ("OneLevel"), and their sub-folders are queued for the next level.
+    • Folders at 'LISTING_SPLIT_DEPTH' are listed with a single "Full" listing each (when 'LISTING_SPLIT_DEPTH' is 0, every folder is listed one level at a time).
+    • The listings of each level run in parallel ('LISTING_WORKERS').
+
+    Returns: List of 'ItemRecord' records (the same items as a full listing), or None if any of the listings failed.
+    """
+    records = []
+    current_level = [tfvc_path]
+    depth = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=LISTING_WORKERS) as executor:
+        while current_level:
+            recursion = "Full" if 0 < LISTING_SPLIT_DEPTH <= depth else "OneLevel"
+            futures = {executor.submit(get_items_single_listing, organization, project_name, folder_path, authentication_header, recursion, version): folder_path
+                       for folder_path in current_level}
+            next_level = []
+
+            for future in concurrent.futures.as_completed(futures):
+                folder_path = futures[future]
+                segment = future.result()
+
+                if segment is None:
+                    print(f"\033[1;31m[ERROR] Failed to list the '{folder_path}' segment; the listing is incomplete.\033[0m")
+                    return None
+
+                for record in segment:
+                    # Every listing includes its own folder, which was already listed by its parent (except the root).
+                    if record.path == folder_path and folder_path != tfvc_path:
+                        continue
+
+                    records.append(record)
+
+                    if recursion == "OneLevel" and record.is_folder and record.path != folder_path:
+                        next_level.append(record.path)
+
+            print(f"[DEBUG] Listed {len(current_level)} folder(s) at depth {depth} ({len(records)} items so far).")
+            current_level = next_level
+            depth += 1
+
+    return records
+
+def get_content_cache_path(item_hash):
+    """
+    This function returns the cache location of a TFVC item hash (the base64-encoded MD5 'hashValue' of the items listing).
+    """
+    content_hash = base64.b64decode(item_hash).hex()
+    return os.path.join(CONTENT_CACHE_DIRECTORY, content_hash[:2], content_hash)
+
+def evict_content_cache():
+    """
+    This function evicts the least recently used files (by modification time) until the cache is below 90% of its size cap.
+    """
+    cached_files = []
+
+    for directory, subdirectories, files in os.walk(CONTENT_CACHE_DIRECTORY):
+        for file in files:
+            file_path = os.path.join(directory, file)
+            file_stat = os.stat(file_path)
+            cached_files.append((file_stat.st_mtime, file_stat.st_size, file_path))
+
+    cache_size = sum(size for mtime, size, path in cached_files)
+
+    for mtime, size, file_path in sorted(cached_files):
+        if cache_size <= CONTENT_CACHE_MAX_BYTES * 0.9:
+            break
+
+        try:
+            os.remove(file_path)
+            cache_size -= size
+
+        except OSError:
+            continue
+
+def store_in_content_cache(item_hash, temporary_path, content_md5):
     """
-    This function fetches the content of a TFVC item.
+    This function moves downloaded content (already written to a temporary file) into the cache, only if it matches the item hash reported by the server.
     """
+    if base64.b64encode(content_md5.digest()).decode() != item_hash:
+        os.remove(temporary_path)
+        return
+
+    # The content was written to a temporary file first, so a partially written file is never visible under its hash.
+    os.replace(temporary_path, get_content_cache_path(item_hash))
+
+    # The cache size is checked on a sample of the writes, as it requires walking the cache directory.
+    if random.random() < 0.01:
+        evict_content_cache()
+
+def get_stream_chunk_size(workers):
+    """
+    This function returns the chunk size of the content streams, so the chunk buffers of all workers stay within 'CONTENT_MEMORY_LIMIT_BYTES'
+    (every worker may hold a source and a target chunk at the same time).
+    """
+    return max(4096, min(8 * 1024 * 1024, CONTENT_MEMORY_LIMIT_BYTES // (2 * max(workers, 1))))
+
+def hash_item_content(organization, project_name, tfvc_path, authentication_header, item_hash=None, chunk_size=1024 * 1024):
+    """
+    This function streams the content of a TFVC item in chunks into an incremental SHA-256 hasher, so memory usage is bounded by 'chunk_size'
+    regardless of the item's size (the whole content is never held in memory).
+
+    When the content cache is enabled and the item hash is known, the cache is checked before downloading (and the downloaded content is stored in it).
+
+    Returns: Tuple (sha256_hex, size_in_bytes) or None if the content could not be retrieved.
+    """
+    content_hash = hashlib.sha256()
+    content_size = 0
+
+    if CONTENT_CACHE_DIRECTORY and item_hash:
+        cache_path = get_content_cache_path(item_hash)
+
+        if os.path.exists(cache_path):
+            os.utime(cache_path) # Marks the entry as recently used.
+
+            with open(cache_path, "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    content_hash.update(chunk)
+                    content_size += len(chunk)
+
+            return content_hash.hexdigest(), content_size
+
     url = f"{organization}/{project_name}/_apis/tfvc/items"
     
     params = {
@@ -86,67 +459,163 @@ def get_item_content(organization, project_name, tfvc_path, authentication_heade
         "Accept": "application/octet-stream"
     }
     headers.update(authentication_header)
+
+    cache_file = None
+    temporary_path = None
     
     try:
-        response = requests.get(url, headers=headers, params=params)
-        #print(f"[DEBUG] Request's Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            return response.content
-        
-        else:
-            print(f"\033[1;31m[ERROR] Failed to fetch content for '{tfvc_path}'.\033[0m")
-            print(f"[DEBUG] Request's Status Code: {response.status_code}")
-            print(f"[DEBUG] Response: {response.text}")
-            return None
+        with get_session().get(url, headers=headers, params=params, stream=True) as response:
+            #print(f"[DEBUG] Request's Status Code: {response.status_code}")
+
+            if response.status_code != 200:
+                print(f"\033[1;31m[ERROR] Failed to fetch content for '{tfvc_path}'.\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                print(f"[DEBUG] Response: {response.text}")
+                return None
+
+            if CONTENT_CACHE_DIRECTORY and item_hash:
+                # A unique temporary file per thread, as the same content can be downloaded by several workers at the same time.
+                temporary_path = f"{get_content_cache_path(item_hash)}.{os.getpid()}.{threading.get_ident()}.tmp"
+                os.makedirs(os.path.dirname(temporary_path), exist_ok=True)
+                cache_file = open(temporary_path, "wb")
+                content_md5 = hashlib.md5()
+
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                content_hash.update(chunk)
+                content_size += len(chunk)
+
+                if cache_file:
+                    cache_file.write(chunk)
+                    content_md5.update(chunk)
+
+        if cache_file:
+            cache_file.close()
+
+            # A failure to cache the content does not fail the verification of the item (the temporary file is removed below).
+            try:
+                store_in_content_cache(item_hash, temporary_path, content_md5)
+
+            except OSError as e:
+                print(f"\033[1;38;5;214m[WARNING] Failed to store the content of '{tfvc_path}' in the content cache: {e}\033[0m")
+
+        return content_hash.hexdigest(), content_size
         
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, OSError) as e:
         print(f"\033[1;31m[ERROR] An error occurred while fetching item content: {e}\033[0m")
         return None
 
-def get_labels(organization, project_name, authentication_header):
+    finally:
+        # Removes the temporary file of an interrupted download.
+        if cache_file and not cache_file.closed:
+            cache_file.close()
+
+        if temporary_path and os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+def get_labels(organization, project_name, authentication_header, page_size=100):
     """
-    This function fetches all labels of a TFVC repository.
+    This function fetches all labels of a TFVC repository (page by page).
+
+    Returns: Dictionary {"count": ..., "value": [...]}, or None if the labels could not be retrieved.
     """
     url = f"{organization}/{project_name}/_apis/tfvc/labels"
     
-    params = {
-        "api-version": "7.1"
-    }
-    
     headers = {
         "Accept": "application/json"
     }
     headers.update(authentication_header)
+
+    labels = []
     
     try:
-        response = requests.get(url, headers=headers, params=params)
-        #print(f"[DEBUG] Request's Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            #print(f"\n{response.json()}\n")
-            return response.json()
-        
-        else:
-            print(f"\033[1;31m[ERROR] Failed to fetch TFVC labels.\033[0m")
-            print(f"[DEBUG] Request's Status Code: {response.status_code}")
-            print(f"[DEBUG] Response: {response.text}")
-            return None
+        while True:
+            params = {
+                "api-version": "7.1",
+                "$top": page_size,
+                "$skip": len(labels)
+            }
+
+            response = get_session().get(url, headers=headers, params=params)
+            #print(f"[DEBUG] Request's Status Code: {response.status_code}")
+            
+            if response.status_code != 200:
+                print(f"\033[1;31m[ERROR] Failed to fetch TFVC labels.\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                print(f"[DEBUG] Response: {response.text}")
+                return None
+
+            labels_page = response.json().get('value', [])
+            labels.extend(labels_page)
+
+            if len(labels_page) < page_size:
+                return {"count": len(labels), "value": labels}
         
     except requests.exceptions.RequestException as e:
         print(f"\033[1;31m[ERROR] An error occurred while fetching labels: {e}\033[0m")
         return None
 
-def get_changesets(organization, project_name, authentication_header, top=100):
+def get_label_items(organization, project_name, label_id, authentication_header, page_size=1000):
     """
-    This function fetches recent changesets of a TFVC repository.
+    This function fetches the items of a TFVC label (page by page).
+
+    Returns: Dictionary {item_path: changeset_version}, or None if the items could not be retrieved.
+    """
+    url = f"{organization}/{project_name}/_apis/tfvc/labels/{label_id}/items"
+
+    headers = {
+        "Accept": "application/json"
+    }
+    headers.update(authentication_header)
+
+    label_items = {}
+    fetched_count = 0
+
+    try:
+        while True:
+            params = {
+                "api-version": "7.1",
+                "$top": page_size,
+                "$skip": fetched_count
+            }
+
+            response = get_session().get(url, headers=headers, params=params)
+
+            if response.status_code != 200:
+                print(f"\033[1;31m[ERROR] Failed to fetch the items of label '{label_id}'.\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                print(f"[DEBUG] Response: {response.text}")
+                return None
+
+            items_page = response.json().get('value', [])
+            fetched_count += len(items_page)
+
+            for item in items_page:
+                label_items[item['path']] = item.get('version', item.get('changesetVersion'))
+
+            if len(items_page) < page_size:
+                return label_items
+
+    except requests.exceptions.RequestException as e:
+        print(f"\033[1;31m[ERROR] An error occurred while fetching the items of label '{label_id}': {e}\033[0m")
+        return None
+
+def get_changesets_page(organization, project_name, authentication_header, skip=0, top=100, from_id=None):
+    """
+    This function fetches a single page (window) of changesets of a TFVC repository, from the most recent one (down to changeset 'from_id', if provided).
+
+    Returns: List of changesets, or None if the request failed.
     """
     url = f"{organization}/{project_name}/_apis/tfvc/changesets"
     
     params = {
         "api-version": "7.1",
-        "$top": top  # Get the most recent changesets
+        "$top": top,
+        "$skip": skip,
+        "maxCommentLength": 2048 # The comments are truncated to 80 characters by default.
     }
+
+    if from_id:
+        params["searchCriteria.fromId"] = from_id
     
     headers = {
         "Accept": "application/json"
@@ -154,11 +623,11 @@ def get_changesets(organization, project_name, authentication_header, top=100):
     headers.update(authentication_header)
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = get_session().get(url, headers=headers, params=params)
         #print(f"[DEBUG] Request's Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            return response.json()
+            return response.json().get('value', [])
         
         else:
             print(f"\033[1;31m[ERROR] Failed to fetch changesets.\033[0m")
@@ -170,6 +639,114 @@ def get_changesets(organization, project_name, authentication_header, top=100):
         print(f"\033[1;31m[ERROR] An error occurred while fetching changesets: {e}\033[0m")
         return None
 
+def get_changesets(organization, project_name, authentication_header, top=None, page_size=1000, workers=CHANGESET_PAGING_WORKERS, from_id=None):
+    """
+    This function fetches the changesets of a TFVC repository - the 'top' most recent ones, or the entire history when 'top' is None
+    (only the changesets from changeset 'from_id' onwards, if provided).
+
+    The entire history is fetched in concurrent '$skip' windows ('workers' pages at a time) until a partial page is returned.
+    """
+    if top:
+        changesets = get_changesets_page(organization, project_name, authentication_header, 0, top)
+        return {"count": len(changesets), "value": changesets} if changesets is not None else None
+
+    changesets = {}
+    skip = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            pages = list(executor.map(lambda window_skip: get_changesets_page(organization, project_name, authentication_header, window_skip, page_size, from_id),
+                                      range(skip, skip + workers * page_size, page_size)))
+
+            if any(page is None for page in pages):
+                return None
+
+            # Changesets are deduplicated by ID, as the windows shift when changesets are created while the history is fetched.
+            for page in pages:
+                changesets.update((changeset['changesetId'], changeset) for changeset in page)
+
+            if any(len(page) < page_size for page in pages):
+                break
+
+            skip += workers * page_size
+
+    print(f"[DEBUG] Fetched {len(changesets)} changesets from '{organization}/{project_name}'.")
+
+    return {"count": len(changesets), "value": sorted(changesets.values(), key=lambda changeset: changeset['changesetId'], reverse=True)}
+
+def get_changesets_incrementally(store, organization, project_name, authentication_header):
+    """
+    This function returns the entire changeset history of a TFVC repository, fetching only the changesets created since the previous run
+    (the earlier ones are loaded from the verification store).
+    """
+    repository = f"{organization}/{project_name}"
+    stored_changesets = get_stored_changesets(store, repository)
+    from_id = stored_changesets[0]['changesetId'] + 1 if stored_changesets else None
+
+    new_changesets = get_changesets(organization, project_name, authentication_header, from_id=from_id)
+
+    if new_changesets is None:
+        return None
+
+    save_changesets(store, repository, new_changesets['value'])
+    print(f"[DEBUG] {len(stored_changesets)} changesets of '{repository}' were loaded from the store, {new_changesets['count']} were fetched.")
+
+    changesets = {changeset['changesetId']: changeset for changeset in stored_changesets + new_changesets['value']}
+
+    return {"count": len(changesets), "value": sorted(changesets.values(), key=lambda changeset: changeset['changesetId'], reverse=True)}
+
+def parse_engine_comment(comment):
+    """
+    This function parses the check-in comment of 'tfvc_to_tfvc_codebase.py': "#<id>: <comment> (<user>)", or "#<id1>,#<id2>: ..." for a coalesced group.
+    """
+    match = re.match(r"#(\d+(?:,#\d+)*)(?::\s*(.*))?$", comment, re.DOTALL)
+
+    if not match:
+        return None
+
+    # A truncated comment is compared up to the truncation mark.
+    extracted_comment = (match.group(2) or "").split("...[truncated]")[0]
+
+    return [int(source_id) for source_id in match.group(1).replace('#', '').split(',')], extracted_comment, "full" if extracted_comment else "id_only"
+
+def parse_migrated_from_comment(comment):
+    """
+    This function parses "Migrated from changeset no. <id>: <original_comment>" comments.
+    """
+    match = re.match(r"Migrated from changeset no\. (\d+): (.*)", comment, re.DOTALL)
+
+    return ([int(match.group(1))], match.group(2), "full") if match else None
+
+def parse_migrated_changeset_comment(comment):
+    """
+    This function parses "Migrated changeset no. <id> - recreated the '<branch>' branch" comments (branch creation changesets).
+    """
+    match = re.match(r"Migrated changeset no\. (\d+).*", comment, re.DOTALL)
+
+    return ([int(match.group(1))], None, "id_only") if match else None
+
+# The comment parsers of the migrated changesets, tried in order - a parser returns a tuple (source_changeset_ids, extracted_comment, match_type)
+# or None if the comment is not in its format. A new comment format is supported by adding its parser to this list.
+CHANGESET_COMMENT_PARSERS = [
+    parse_engine_comment,
+    parse_migrated_from_comment,
+    parse_migrated_changeset_comment
+]
+
+def parse_changeset_comment(comment):
+    """
+    This function extracts the source changeset reference of a target changeset comment using the registered comment parsers.
+
+    Returns: Tuple (source_changeset_ids, extracted_comment, match_type) or None if the comment does not reference a source changeset.
+    """
+    for parser in CHANGESET_COMMENT_PARSERS:
+        parsed = parser(comment or "")
+
+        if parsed:
+            return parsed
+
+    return None
+
 def compare_structure(source_organization, source_project_name, source_header, source_tfvc_path, target_organization, target_project_name, 
                      target_header, target_tfvc_path, results_folder):
     """
@@ -180,15 +757,15 @@ def compare_structure(source_organization, source_project_name, source_header, s
     source_tfvc_items = get_items(source_organization, source_project_name, source_tfvc_path, source_header)
     target_tfvc_items = get_items(target_organization, target_project_name, target_tfvc_path, target_header)
     
-    if not source_tfvc_items or not target_tfvc_items:
+    if source_tfvc_items is None or target_tfvc_items is None:
         return {"success": False, "error": "Failed to retrieve repository structure"}
     
-    # Creates a lookup dictionaries by TFVC path.
-    source_dictionary = {item['path']: item for item in source_tfvc_items.get('value', [])}
+    # Creates a lookup dictionaries by TFVC path (excluded paths are not part of the migration, so they are not compared).
+    source_dictionary = {item.path: item for item in source_tfvc_items if not is_excluded_path(item.path, source_tfvc_path)}
 
     # Normalizes the target paths by replacing the target root path with the source root path. This creates a consistent basis for comparison.
-    target_dictionary = {item['path'].replace(target_tfvc_path, source_tfvc_path): item 
-                  for item in target_tfvc_items.get('value', [])}
+    target_dictionary = {item.path.replace(target_tfvc_path, source_tfvc_path): item 
+                  for item in target_tfvc_items if not is_excluded_path(item.path, target_tfvc_path)}
     
     source_counter = len(source_dictionary)
     target_counter = len(target_dictionary)
@@ -217,7 +794,7 @@ def compare_structure(source_organization, source_project_name, source_header, s
                 writer.writerow([
                     "MISSING FROM TARGET", 
                     path,
-                    source_dictionary[path].get('size', 'N/A')
+                    source_dictionary[path].size if source_dictionary[path].size is not None else 'N/A'
                 ])
             
             # Writes extra items.
@@ -227,7 +804,7 @@ def compare_structure(source_organization, source_project_name, source_header, s
                 writer.writerow([
                     "EXTRA IN TARGET", 
                     actual_target_path,
-                    target_dictionary[path].get('size', 'N/A')
+                    target_dictionary[path].size if target_dictionary[path].size is not None else 'N/A'
                 ])
     
     return {
@@ -239,27 +816,582 @@ def compare_structure(source_organization, source_project_name, source_header, s
         "matching_count": len(source_paths.intersection(target_paths))
     }
 
+def compare_file_content(file, source_organization, source_project_name, source_header, source_tfvc_path,
+                         target_organization, target_project_name, target_header, target_tfvc_path, fetch_executor=None, chunk_size=1024 * 1024):
+    """
+    This function compares the content of a single file of a source and target TFVC repositories.
+
+    The content is streamed into SHA-256 hashers (never held in memory as a whole). When 'fetch_executor' is provided, the target content is
+    streamed by it while the source content is streamed, so both downloads run concurrently.
+    """
+    source_file_path = file.path
+
+    try:
+        target_file_path = source_file_path.replace(source_tfvc_path, target_tfvc_path)
+
+        if fetch_executor:
+            target_future = fetch_executor.submit(hash_item_content, target_organization, target_project_name, target_file_path, target_header, None, chunk_size)
+
+        source_file_digest = hash_item_content(source_organization, source_project_name, source_file_path, source_header, file.hash, chunk_size)
+        target_file_digest = target_future.result() if fetch_executor else \
+            hash_item_content(target_organization, target_project_name, target_file_path, target_header, None, chunk_size)
+
+        if source_file_digest is None:
+            return {"path": source_file_path, "match": False, "error": "Failed to retrieve source content"}
+
+        if target_file_digest is None:
+            return {"path": source_file_path, "match": False, "error": "Failed to retrieve target content"}
+
+        """
+        Uses SHA-256 hash to compare the content of the files.
+        
+        • The same file will always produce the same hash.
+        • Different files will almost always produce different hashes.
+        • Even a small change in the file will produce a completely different hash.
+        """
+        source_file_hash, source_file_size = source_file_digest
+        target_file_hash, target_file_size = target_file_digest
+
+        return {
+            "path": source_file_path,
+            "match": source_file_hash == target_file_hash,
+            "source_hash": source_file_hash,
+            "target_hash": target_file_hash,
+            "bytes": source_file_size + target_file_size
+        }
+
+    except Exception as e:
+        return {"path": source_file_path, "match": False, "error": str(e)}
+
+def get_changed_paths(organization, project_name, tfvc_path, authentication_header, from_changeset_id):
+    """
+    This function fetches the TFVC paths changed under a TFVC path since a changeset (including the original paths of renamed items).
+
+    Returns: Tuple (changed_paths, latest_changeset_id) or None if the changes could not be retrieved.
+    """
+    headers = {
+        "Accept": "application/json"
+    }
+    headers.update(authentication_header)
+
+    changed_paths = set()
+    latest_changeset_id = from_changeset_id
+    changeset_ids = []
+    page_size = 1000
+
+    try:
+        while True:
+            params = {
+                "api-version": "7.1",
+                "searchCriteria.itemPath": tfvc_path,
+                "searchCriteria.fromId": from_changeset_id + 1,
+                "$top": page_size,
+                "$skip": len(changeset_ids)
+            }
+
+            response = get_session().get(f"{organization}/{project_name}/_apis/tfvc/changesets", headers=headers, params=params)
+
+            if response.status_code != 200:
+                print(f"\033[1;31m[ERROR] Failed to fetch the changesets of '{tfvc_path}' since changeset no. {from_changeset_id}.\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                return None
+
+            page = [changeset['changesetId'] for changeset in response.json().get('value', [])]
+            changeset_ids.extend(page)
+
+            if len(page) < page_size:
+                break
+
+        for changeset_id in changeset_ids:
+            latest_changeset_id = max(latest_changeset_id, changeset_id)
+            skip = 0
+
+            while True:
+                params = {
+                    "api-version": "7.1",
+                    "$top": page_size,
+                    "$skip": skip
+                }
+
+                response = get_session().get(f"{organization}/{project_name}/_apis/tfvc/changesets/{changeset_id}/changes", headers=headers, params=params)
+
+                if response.status_code != 200:
+                    print(f"\033[1;31m[ERROR] Failed to fetch the changes of changeset no. {changeset_id}.\033[0m")
+                    print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                    return None
+
+                changes = response.json().get('value', [])
+
+                for change in changes:
+                    changed_paths.add(change.get('item', {}).get('path'))
+                    changed_paths.add(change.get('sourceServerItem'))
+
+                if len(changes) < page_size:
+                    break
+
+                skip += page_size
+
+    except requests.exceptions.RequestException as e:
+        print(f"\033[1;31m[ERROR] An error occurred while fetching changed paths: {e}\033[0m")
+        return None
+
+    changed_paths.discard(None)
+
+    return changed_paths, latest_changeset_id
+
+def get_latest_changeset_id(organization, project_name, tfvc_path, authentication_header):
+    """
+    This function fetches the ID of the latest changeset under a TFVC path (None if it could not be retrieved).
+    """
+    headers = {
+        "Accept": "application/json"
+    }
+    headers.update(authentication_header)
+
+    params = {
+        "api-version": "7.1",
+        "searchCriteria.itemPath": tfvc_path,
+        "$top": 1
+    }
+
+    try:
+        response = get_session().get(f"{organization}/{project_name}/_apis/tfvc/changesets", headers=headers, params=params)
+
+        if response.status_code == 200 and response.json().get('value'):
+            return response.json()['value'][0]['changesetId']
+
+        print(f"\033[1;31m[ERROR] Failed to fetch the latest changeset under '{tfvc_path}'.\033[0m")
+        print(f"[DEBUG] Request's Status Code: {response.status_code}")
+
+    except requests.exceptions.RequestException as e:
+        print(f"\033[1;31m[ERROR] An error occurred while fetching the latest changeset: {e}\033[0m")
+
+    return None
+
+def get_relative_path(tfvc_path, tfvc_root):
+    """
+    This function returns a TFVC path relative to the verified TFVC root ("" for the root itself).
+    """
+    return tfvc_path[len(tfvc_root):].strip('/') if is_beneath_path(tfvc_path, tfvc_root) else tfvc_path
+
+def remove_snapshot_subtree(snapshot, relative_folder):
+    """
+    This function removes a folder and everything beneath it from a tree snapshot.
+    """
+    prefix = f"{relative_folder}/"
+    snapshot["files"] = {path: entry for path, entry in snapshot["files"].items() if not path.startswith(prefix)}
+    snapshot["folders"] = [folder for folder in snapshot["folders"] if folder != relative_folder and not folder.startswith(prefix)]
+
+def apply_snapshot_listing(snapshot, tfvc_root, relative_folder, records, recursion):
+    """
+    This function replaces the content of a folder in a tree snapshot with a fresh listing of it.
+
+    • A "Full" listing replaces the whole subtree.
+    • A "OneLevel" listing replaces the direct children - sub-folders that no longer exist are removed with their subtrees.
+
+    Returns: The sub-folders that are not in the snapshot yet (their content has to be listed as well).
+    """
+    prefix = f"{relative_folder}/" if relative_folder else ""
+    listed = [(get_relative_path(record.path, tfvc_root), record) for record in records
+              if not is_excluded_path(record.path, tfvc_root) and get_relative_path(record.path, tfvc_root) != relative_folder]
+    new_folders = []
+
+    if recursion == "Full":
+        if relative_folder:
+            remove_snapshot_subtree(snapshot, relative_folder)
+            snapshot["folders"].append(relative_folder)
+
+        else:
+            snapshot["files"], snapshot["folders"] = {}, [""]
+
+    else:
+        listed_folders = {path for path, record in listed if record.is_folder}
+        known_folders = set(snapshot["folders"])
+
+        for path in [path for path in snapshot["files"] if path.startswith(prefix) and '/' not in path[len(prefix):]]:
+            del snapshot["files"][path]
+
+        for folder in [folder for folder in known_folders if folder.startswith(prefix) and folder and '/' not in folder[len(prefix):]]:
+            if folder not in listed_folders:
+                remove_snapshot_subtree(snapshot, folder)
+
+        new_folders = sorted(listed_folders - known_folders)
+
+    known_folders = set(snapshot["folders"])
+
+    for path, record in listed:
+        if record.is_folder:
+            if path not in known_folders and recursion == "Full":
+                snapshot["folders"].append(path)
+
+        else:
+            snapshot["files"][path] = f"{record.hash}:{record.size}"
+
+    return new_folders
+
+def refresh_tree_snapshot(snapshot, organization, project_name, tfvc_path, authentication_header):
+    """
+    This function brings a tree snapshot ({"latest_changeset", "files": {relative_path: "hash:size"}, "folders": [relative_path, ...]})
+    up to date with the current state of a TFVC path.
+
+    Without a snapshot, the whole tree is listed. Otherwise, only the folders changed since the snapshot's latest changeset are listed
+    again, so the number of API calls depends on the size of the change and not on the size of the repository.
+
+    Returns: The refreshed snapshot ("latest_changeset" is None if it could not be retrieved, and then the snapshot must not be reused),
+    or None if the tree could not be listed.
+    """
+    if snapshot and snapshot.get("tfvc_path") == tfvc_path and snapshot.get("organization") == organization and snapshot.get("latest_changeset"):
+        changes = get_changed_paths(organization, project_name, tfvc_path, authentication_header, snapshot["latest_changeset"])
+
+        if changes is not None:
+            changed_paths, latest_changeset_id = changes
+
+            # Every changed item changes the children of its parent folder, and a changed folder may have changed beneath it as well.
+            changed_folders = set()
+
+            for changed_path in changed_paths:
+                relative_path = get_relative_path(changed_path, tfvc_path)
+
+                if is_beneath_path(changed_path, tfvc_path) and not is_excluded_path(changed_path, tfvc_path):
+                    changed_folders.add(relative_path.rsplit('/', 1)[0] if '/' in relative_path else "")
+
+            print(f"[DEBUG] {len(changed_paths)} path(s) changed under '{tfvc_path}' since changeset no. {snapshot['latest_changeset']}; listing {len(changed_folders)} folder(s).")
+
+            folders_to_list = [(folder, "OneLevel") for folder in sorted(changed_folders, key=lambda folder: folder.count('/'))]
+
+            while folders_to_list:
+                relative_folder, recursion = folders_to_list.pop(0)
+
+                # A folder that was removed by the listing of its parent no longer exists.
+                if relative_folder and relative_folder not in snapshot["folders"] and recursion == "OneLevel":
+                    continue
+
+                folder_path = f"{tfvc_path}/{relative_folder}" if relative_folder else tfvc_path
+                records = get_items(organization, project_name, folder_path, authentication_header, recursion)
+
+                if records is None:
+                    print("\033[1;38;5;214m[WARNING] Failed to refresh the tree snapshot; listing the whole tree...\033[0m")
+                    break
+
+                folders_to_list.extend((folder, "Full") for folder in apply_snapshot_listing(snapshot, tfvc_path, relative_folder, records, recursion))
+
+            else:
+                snapshot["latest_changeset"] = latest_changeset_id
+                return snapshot
+
+    latest_changeset_id = get_latest_changeset_id(organization, project_name, tfvc_path, authentication_header)
+    records = get_items(organization, project_name, tfvc_path, authentication_header)
+
+    if records is None:
+        return None
+
+    snapshot = {"organization": organization, "tfvc_path": tfvc_path, "latest_changeset": latest_changeset_id, "files": {}, "folders": [""]}
+    apply_snapshot_listing(snapshot, tfvc_path, "", records, "Full")
+
+    return snapshot
+
+def build_folder_digests(snapshot):
+    """
+    This function computes a Merkle-style digest for every folder of a tree snapshot - the hash of its files' names, hashes and sizes,
+    and of its sub-folders' names and digests. Two folders with the same digest have identical subtrees.
+
+    Returns: Tuple (folder_digests, folder_children) where 'folder_children' maps a folder to its {name: entry} children
+    ("f:<hash>:<size>" for files, "d:<relative_path>" for sub-folders).
+    """
+    folder_children = {folder: {} for folder in snapshot["folders"]}
+
+    for path, entry in snapshot["files"].items():
+        parent, name = path.rsplit('/', 1) if '/' in path else ("", path)
+        folder_children.setdefault(parent, {})[name] = f"f:{entry}"
+
+    folder_digests = {}
+
+    # Folders are processed bottom-up, so the digests of all sub-folders are known when their parent folder is processed.
+    for folder in sorted(folder_children, key=lambda folder: folder.count('/') if folder else -1, reverse=True):
+        entries = []
+
+        for name, entry in sorted(folder_children[folder].items()):
+            entries.append(f"{name}|{entry}" if entry.startswith('f:') else f"{name}|d:{folder_digests[entry[2:]]}")
+
+        folder_digests[folder] = hashlib.sha256("\n".join(entries).encode()).hexdigest()
+
+        # Registers the folder in its parent (its entry points to its digest).
+        if folder:
+            parent, name = folder.rsplit('/', 1) if '/' in folder else ("", folder)
+            folder_children.setdefault(parent, {})[name] = f"d:{folder}"
+
+    return folder_digests, folder_children
+
+def compare_structure_digests(source_organization, source_project_name, source_header, source_tfvc_path, target_organization, target_project_name,
+                              target_header, target_tfvc_path, results_folder):
+    """
+    This function compares the structure (and file hashes) of a source and target TFVC repositories using Merkle-style folder digests.
+
+    The folder digests are compared top-down, descending only into folders whose digests differ, so the comparison work depends on the
+    size of the difference. The trees are kept in a snapshot file between runs and only their changed folders are listed again,
+    so re-verification after small fixes costs a few API calls.
+    """
+    print(f"[INFO] Comparing repository structures using folder digests...")
+
+    snapshot_file = f"{results_folder}/structure_snapshot.json"
+    snapshots = {}
+
+    if os.path.exists(snapshot_file):
+        try:
+            with open(snapshot_file, "r") as f:
+                snapshots = json.load(f)
+
+        except Exception as e:
+            print(f"\033[1;38;5;214m[WARNING] Could not load the tree snapshot from '{snapshot_file}': {e}\033[0m")
+
+    source_snapshot = refresh_tree_snapshot(snapshots.get("source"), source_organization, source_project_name, source_tfvc_path, source_header)
+    target_snapshot = refresh_tree_snapshot(snapshots.get("target"), target_organization, target_project_name, target_tfvc_path, target_header)
+
+    if source_snapshot is None or target_snapshot is None:
+        return {"success": False, "error": "Failed to retrieve repository structure"}
+
+    # A snapshot without a known latest changeset cannot be refreshed incrementally, so it is not saved (the next run lists the whole tree).
+    with open(snapshot_file, "w") as f:
+        json.dump({side: snapshot for side, snapshot in (("source", source_snapshot), ("target", target_snapshot)) if snapshot["latest_changeset"]}, f)
+
+    source_digests, source_children = build_folder_digests(source_snapshot)
+    target_digests, target_children = build_folder_digests(target_snapshot)
+
+    differences = []
+    folders_to_compare = [""]
+    compared_folders = 0
+
+    while folders_to_compare:
+        folder = folders_to_compare.pop()
+        compared_folders += 1
+
+        if source_digests[folder] == target_digests[folder]:
+            continue
+
+        source_folder_children = source_children[folder]
+        target_folder_children = target_children[folder]
+
+        for name in sorted(set(source_folder_children) | set(target_folder_children)):
+            source_entry = source_folder_children.get(name)
+            target_entry = target_folder_children.get(name)
+            path = f"{folder}/{name}" if folder else name
+
+            if source_entry and target_entry and source_entry.startswith('d:') and target_entry.startswith('d:'):
+                if source_digests[path] != target_digests[path]:
+                    folders_to_compare.append(path)
+
+            elif source_entry is None:
+                differences.append(("EXTRA IN TARGET", f"{target_tfvc_path}/{path}"))
+
+            elif target_entry is None:
+                differences.append(("MISSING FROM TARGET", f"{source_tfvc_path}/{path}"))
+
+            elif source_entry != target_entry:
+                differences.append(("DIFFERENT", f"{source_tfvc_path}/{path}"))
+
+    print(f"[DEBUG] Compared {compared_folders} out of {len(source_digests)} folders.")
+
+    # Outputs the results to a CSV file.
+    with open(f"{results_folder}/structure_comparison.csv", "w", newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Status", "TFVC Path"])
+
+        if not differences:
+            writer.writerow(["INFO", f"'{source_tfvc_path}' and '{target_tfvc_path}' are identical"])
+
+        for status, path in differences:
+            writer.writerow([status, path])
+
+    source_count = len(source_snapshot["files"]) + len(source_snapshot["folders"])
+    target_count = len(target_snapshot["files"]) + len(target_snapshot["folders"])
+    missing_count = sum(1 for status, path in differences if status == "MISSING FROM TARGET")
+    extra_count = sum(1 for status, path in differences if status == "EXTRA IN TARGET")
+
+    return {
+        "success": True,
+        "source_count": source_count,
+        "target_count": target_count,
+        "missing_count": missing_count,
+        "extra_count": extra_count,
+        "different_count": sum(1 for status, path in differences if status == "DIFFERENT"),
+        "compared_folders": compared_folders
+    }
+
+def get_target_files(target_organization, target_project_name, target_header, source_tfvc_path, target_tfvc_path):
+    """
+    This function lists the files of the target TFVC path, keyed by their corresponding source path.
+
+    Returns: Dictionary {source_path: ItemRecord}, or None if the target items could not be listed.
+    """
+    target_tfvc_items = get_items(target_organization, target_project_name, target_tfvc_path, target_header)
+
+    if target_tfvc_items is None:
+        return None
+
+    # Normalizes the target paths by replacing the target root path with the source root path.
+    return {item.path.replace(target_tfvc_path, source_tfvc_path): item for item in target_tfvc_items if not item.is_folder}
+
+def compare_content_metadata(files, target_files):
+    """
+    This function compares source files with their target counterparts using only the items listing metadata (no content is downloaded).
+
+    TFVC keeps an MD5 hash ('hashValue') and a size for every file, so files whose hash and size match are identical.
+    Files with a mismatching hash or size, files without a hash, and files that are missing from the target listing need a full-byte comparison.
+
+    Returns: Tuple (metadata_results, files_to_download).
+    """
+    metadata_results = []
+    files_to_download = []
+
+    for file in files:
+        target_file = target_files.get(file.path)
+
+        if file.hash and target_file and file.hash == target_file.hash and file.size == target_file.size:
+            metadata_results.append({
+                "path": file.path,
+                "match": True,
+                "method": "metadata",
+                "source_hash": base64.b64decode(file.hash).hex(),
+                "target_hash": base64.b64decode(target_file.hash).hex()
+            })
+
+        else:
+            files_to_download.append(file)
+
+    return metadata_results, files_to_download
+
+def load_bulk_changesets():
+    """
+    This function loads the source changesets that the migration engine replayed with the bulk processing (from its 'replay_cost_log.jsonl').
+    All changesets of a bulk-processed coalesced group are included.
+
+    Returns: Set of changeset IDs (empty when the log is not available).
+    """
+    bulk_changesets = set()
+
+    if not REPLAY_COST_LOG_FILE or not os.path.exists(REPLAY_COST_LOG_FILE):
+        return bulk_changesets
+
+    try:
+        with open(REPLAY_COST_LOG_FILE, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+
+                log_entry = json.loads(line)
+
+                # The strategy is null when the changeset failed before a strategy was chosen; a coalesced group lists all of its changesets.
+                if "bulk" in (log_entry.get("strategy") or ""):
+                    bulk_changesets.update(log_entry.get("changesets") or [log_entry["changeset"]])
+
+    except (OSError, ValueError, KeyError) as e:
+        print(f"\033[1;38;5;214m[WARNING] Failed to read the replay cost log '{REPLAY_COST_LOG_FILE}': {e}\033[0m")
+
+    return bulk_changesets
+
+def get_risk_reasons(file, tfvc_root, bulk_changesets):
+    """
+    This function lists the reasons a file is more likely than others to have been migrated incorrectly.
+    """
+    risk_reasons = []
+
+    if file.version in bulk_changesets:
+        risk_reasons.append("bulk")
+
+    if file.path.rsplit('/', 1)[-1].startswith('.'):
+        risk_reasons.append("dot-file") # Dot-files are copied by a special path of 'copy_and_add_file'.
+
+    if len(file.path) - len(tfvc_root) >= LONG_PATH_LENGTH:
+        risk_reasons.append("long path")
+
+    return risk_reasons
+
+def get_sampling_stratum(file, tfvc_root, changeset_boundaries):
+    """
+    This function returns the stratum of a file - its extension, size bucket, top-level folder and last-modified changeset range.
+    """
+    name = file.path.rsplit('/', 1)[-1]
+    extension = os.path.splitext(name)[1].lower() if not name.startswith('.') or name.count('.') > 1 else name.lower()
+
+    size = file.size or 0
+    size_bucket = 0 if size == 0 else min(len(str(size)) // 2 + 1, 5) # Empty, <10B, <1KB, <100KB, <10MB, larger.
+
+    relative_parts = get_relative_path(file.path, tfvc_root).split('/')
+    top_folder = relative_parts[0] if len(relative_parts) > 1 else ""
+
+    changeset_range = sum(1 for boundary in changeset_boundaries if (file.version or 0) > boundary)
+
+    return (extension, size_bucket, top_folder, changeset_range)
+
+def select_stratified_sample(files, sample_size, tfvc_root):
+    """
+    This function selects a stratified, risk-weighted sample of files.
+
+    • The files are grouped into strata by their extension, size bucket, top-level folder and last-modified changeset range (quartiles).
+    • Within each stratum, the files are ordered by a weighted random key, so risky files (touched by bulk-processed changesets, dot-files
+      and long paths) are more likely to come first.
+    • The sample is taken round-robin over the strata (one file of each stratum per round), so as many strata as possible are covered.
+    """
+    bulk_changesets = load_bulk_changesets()
+
+    versions = sorted(file.version or 0 for file in files)
+    changeset_boundaries = [versions[len(versions) * quartile // 4] for quartile in range(1, 4)]
+
+    strata = collections.defaultdict(list)
+    risk_reasons = {}
+
+    for file in files:
+        risk_reasons[file.path] = get_risk_reasons(file, tfvc_root, bulk_changesets)
+        weight = RISK_WEIGHT ** len(risk_reasons[file.path])
+
+        # Weighted random sampling without replacement (a random key raised to the power of 1 / weight; the highest keys are taken first).
+        strata[get_sampling_stratum(file, tfvc_root, changeset_boundaries)].append((random.random() ** (1 / weight), file))
+
+    for stratum_files in strata.values():
+        stratum_files.sort(key=lambda keyed_file: keyed_file[0], reverse=True)
+
+    files_sample = []
+    round_index = 0
+
+    while len(files_sample) < sample_size:
+        round_files = sorted((stratum_files[round_index] for stratum_files in strata.values() if round_index < len(stratum_files)),
+                             key=lambda keyed_file: keyed_file[0], reverse=True)
+
+        files_sample.extend(file for key, file in round_files[:sample_size - len(files_sample)])
+        round_index += 1
+
+    risky_count = sum(1 for file in files_sample if risk_reasons[file.path])
+    print(f"[INFO] Stratified sample: {len(files_sample)} files from {len(strata)} strata "
+          f"({len({get_sampling_stratum(file, tfvc_root, changeset_boundaries) for file in files_sample})} covered), "
+          f"{risky_count} risky files ({sum(1 for reasons in risk_reasons.values() if reasons)} in the repository, "
+          f"{len(bulk_changesets)} bulk-processed changesets).")
+
+    return files_sample
+
 def sample_content(source_organization, source_project_name, source_header, source_tfvc_path, 
                   target_organization, target_project_name, target_header, target_tfvc_path, 
-                  results_folder, sample_size=50):
+                  results_folder, sample_size=50, workers=CONTENT_VERIFICATION_WORKERS, store=None):
     """
     The function compares the actual content of files of a source and target TFVC repositories. 
     
-    Rather than comparing every single file (which could be very time-consuming for large repositories), 
-    the function uses statistical sampling to check a representative subset of files.
+    • When 'sample_size' is set, a sample of files is compared (statistical sampling of large repositories) - a uniform random sample,
+      or a stratified, risk-weighted sample (see 'select_stratified_sample') when 'CONTENT_SAMPLING_STRATEGY' is "stratified".
+    • When 'sample_size' is 0 (or None), every file is compared (full coverage).
+
+    Files are compared concurrently by a bounded pool of workers, and each result is written to the CSV file as soon as it is available.
+    When 'VERIFY_BY_METADATA' is enabled, files whose listing hash and size match are not downloaded at all.
+    When a verification 'store' is provided, files that matched before (at their current versions) are not verified again.
     """
-    print(f"[INFO] Sampling content of {sample_size} files...")
-    
     source_tfvc_items = get_items(source_organization, source_project_name, source_tfvc_path, source_header)
 
-    if not source_tfvc_items:
+    if source_tfvc_items is None:
         return {"success": False, "error": "Failed to retrieve source items"}
     
-    total_items = len(source_tfvc_items.get('value', []))
+    total_items = len(source_tfvc_items)
     print(f"[DEBUG] Total TFVC items fetched from source: {total_items}")
     
     # Filters for files only (not folders).
-    files = [item for item in source_tfvc_items.get('value', []) if 'path' in item and '.' in item['path'].split('/')[-1]]
+    files = [item for item in source_tfvc_items if not item.is_folder and not is_excluded_path(item.path, source_tfvc_path)]
 
     print(f"[DEBUG] Files identified: {len(files)}")
 
@@ -267,122 +1399,207 @@ def sample_content(source_organization, source_project_name, source_header, sour
     if not files:
         print("\n\033[1;38;5;214m[WARNING] No files found; Examining response structure...\033[0m")
         
-        if source_tfvc_items.get('value') and len(source_tfvc_items.get('value')) > 0:
-            first_item = source_tfvc_items.get('value')[0]
-            print(f"[DEBUG] First item properties: {list(first_item.keys())}")
-            print(f"[DEBUG] First item sample: {json.dumps(first_item, indent=2)[:500]}\n")
+        if source_tfvc_items:
+            print(f"[DEBUG] First item sample: {source_tfvc_items[0]}\n")
         
         return {"success": False, "error": "No files found in source path"}
     
-    sample_size = min(sample_size, len(files))
-    files_sample = random.sample(files, sample_size) if len(files) > sample_size else files
+    store_scope = (source_organization, source_project_name, source_tfvc_path, target_organization, target_project_name, target_tfvc_path)
+    stored_results = get_stored_content_results(store, store_scope) if store else {}
+
+    if sample_size:
+        sample_size = min(sample_size, len(files))
+
+        if len(files) <= sample_size:
+            files_sample = files
+
+        elif CONTENT_SAMPLING_STRATEGY == "stratified":
+            files_sample = select_stratified_sample(files, sample_size, source_tfvc_path)
+
+        else:
+            files_sample = random.sample(files, sample_size)
+
+        # Files that failed in a previous run are always verified again.
+        failed_files = [file for file in files if file.path in stored_results and not stored_results[file.path][2]]
+        files_sample = list({file.path: file for file in failed_files + files_sample}.values())
+        print(f"[INFO] Sampling content of {len(files_sample)} files ({len(failed_files)} failed in a previous run)...")
+
+    else:
+        files_sample = files
+        print(f"[INFO] Comparing content of all {len(files_sample)} files (full coverage)...")
+
+    target_files = None
+
+    if VERIFY_BY_METADATA or store:
+        target_files = get_target_files(target_organization, target_project_name, target_header, source_tfvc_path, target_tfvc_path)
+
+        if target_files is None:
+            print("\033[1;38;5;214m[WARNING] Failed to retrieve the target items listing; all files will be compared by their content.\033[0m")
+
+    stored_matches = []
+    files_to_verify = files_sample
+
+    # Files that matched in a previous run are not verified again, unless the source or the target item has a newer version since.
+    if stored_results and target_files is not None:
+        files_to_verify = []
+
+        for file in files_sample:
+            stored_result = stored_results.get(file.path)
+            target_file = target_files.get(file.path)
+
+            if stored_result and stored_result[2] and target_file and (stored_result[0], stored_result[1]) == (file.version, target_file.version):
+                stored_matches.append({"path": file.path, "match": True, "method": "stored", "source_hash": stored_result[3], "target_hash": stored_result[4]})
+
+            else:
+                files_to_verify.append(file)
+
+        print(f"[INFO] {len(stored_matches)} files are unchanged since they were verified; {len(files_to_verify)} files will be verified.")
     
-    print(f"[DEBUG] Files to compare: {len(files_sample)}")
+    metadata_results = []
+    files_to_download = files_to_verify
+
+    if VERIFY_BY_METADATA and target_files is not None:
+        metadata_results, files_to_download = compare_content_metadata(files_to_verify, target_files)
+
+        print(f"[INFO] {len(metadata_results)} files matched by their hash and size metadata; {len(files_to_download)} files will be downloaded.")
+
+    print(f"[DEBUG] Files to download and compare: {len(files_to_download)} ({workers} workers)")
     
-    results = []
+    compared_count = 0
+    match_count = 0
     error_count = 0
-    
-    for file in tqdm.tqdm(files_sample, desc="Comparing files"):
-        try:
-            source_file_path = file['path']
-            target_file_path = source_file_path.replace(source_tfvc_path, target_tfvc_path)
-            print("\n")
-            print(f"[DEBUG] Comparing: '{source_file_path}' → '{target_file_path}'")
-            
-            source_file_content = get_item_content(source_organization, source_project_name, source_file_path, source_header)
-
-            if source_file_content is None:
-                error_count += 1
-                results.append({
-                    "path": source_file_path,
-                    "match": False,
-                    "error": "Failed to retrieve source content"
-                })
-                continue
-                
-            target_file_content = get_item_content(target_organization, target_project_name, target_file_path, target_header)
-
-            if target_file_content is None:
-                error_count += 1
-                results.append({
-                    "path": source_file_path,
-                    "match": False,
-                    "error": "Failed to retrieve target content"
-                })
-                continue
-            
-            """
-            Uses SHA-256 hash to compare the content of the files.
-            
-            • The same file will always produce the same hash.
-            • Different files will almost always produce different hashes.
-            • Even a small change in the file will produce a completely different hash.
-            """
-            source_file_hash = hashlib.sha256(source_file_content).hexdigest()
-            target_file_hash = hashlib.sha256(target_file_content).hexdigest()
-            
-            match = source_file_hash == target_file_hash
-            
-            results.append({
-                "path": source_file_path,
-                "match": match,
-                "source_hash": source_file_hash,
-                "target_hash": target_file_hash
-            })
+    compared_bytes = 0
+    start_time = time.time()
+    results_file = f"{results_folder}/content_comparison.csv"
+
+    def write_result(writer, result):
+        """
+        This function is a helper function that writes a single comparison result to the CSV file.
+        """
+        writer.writerow([
+            result["path"], 
+            result["match"], 
+            result.get("method", "content"),
+            result.get("source_hash", "N/A"), 
+            result.get("target_hash", "N/A"),
+            result.get("error", "")
+        ])
+
+    new_results = list(metadata_results) # The results of this run (saved to the store).
+    chunk_size = get_stream_chunk_size(workers)
+    fetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers) if HASH_SOURCE_AND_TARGET_CONCURRENTLY else None
+
+    print(f"[DEBUG] Streaming content in {chunk_size // 1024} KB chunks (up to {CONTENT_MEMORY_LIMIT_BYTES // 1024 // 1024} MB of buffers).")
 
-        except Exception as e:
-            print(f"\033[1;31m[ERROR] An error occurred while comparing file '{file.get('path', 'unknown')}': {e}\033[0m")
-            error_count += 1
-            results.append({
-                "path": file.get('path', 'unknown'),
-                "match": False,
-                "error": str(e)
-            })
-    
-    print(f"\n[INFO] Comparison complete:")
-    print(f"• Files compared: {len(results)}")
-    print(f"• Errors encountered: {error_count}")
-    
-    # Outputs the results to a CSV file.
     try:
-        with open(f"{results_folder}/content_comparison.csv", "w", newline='') as f:
+        with open(results_file, "w", newline='') as f, \
+             concurrent.futures.ThreadPoolExecutor(max_workers=workers) as compare_executor:
             writer = csv.writer(f)
-            writer.writerow(["Path", "Match", "Source Hash", "Target Hash", "Error"])
-            
-            for result in results:
-                writer.writerow([
-                    result["path"], 
-                    result["match"], 
-                    result.get("source_hash", "N/A"), 
-                    result.get("target_hash", "N/A"),
-                    result.get("error", "")
-                ])
+            writer.writerow(["Path", "Match", "Method", "Source Hash", "Target Hash", "Error"])
+
+            for result in stored_matches + metadata_results:
+                compared_count += 1
+                match_count += 1
+                write_result(writer, result)
+
+            files_iterator = iter(files_to_download)
+            pending_comparisons = set()
+
+            with tqdm.tqdm(total=len(files_to_download), desc="Comparing files", unit="file") as progress_bar:
+                while True:
+                    # Keeps a bounded number of comparisons in flight, so memory usage does not grow with the number of files.
+                    for file in files_iterator:
+                        pending_comparisons.add(compare_executor.submit(compare_file_content, file,
+                                                                        source_organization, source_project_name, source_header, source_tfvc_path,
+                                                                        target_organization, target_project_name, target_header, target_tfvc_path,
+                                                                        fetch_executor, chunk_size))
+
+                        if len(pending_comparisons) >= workers * 4:
+                            break
+
+                    if not pending_comparisons:
+                        break
+
+                    completed_comparisons, pending_comparisons = concurrent.futures.wait(pending_comparisons, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                    for future in completed_comparisons:
+                        result = future.result()
+                        compared_count += 1
+                        compared_bytes += result.get("bytes", 0)
+
+                        if result["match"]:
+                            match_count += 1
+
+                        elif "error" in result:
+                            error_count += 1
+                            tqdm.tqdm.write(f"\033[1;31m[ERROR] '{result['path']}': {result['error']}\033[0m")
 
-        print(f"\n[INFO] Results written to '{results_folder}/content_comparison.csv'.")
+                        write_result(writer, result)
+                        new_results.append(result)
+
+                    f.flush() # Streams the results, so they can be followed (and are kept) while a long verification runs.
+
+                    elapsed_time = max(time.time() - start_time, 0.001)
+                    progress_bar.update(len(completed_comparisons))
+                    progress_bar.set_postfix(matched=match_count, errors=error_count, mb_per_second=f"{compared_bytes / 1024 / 1024 / elapsed_time:.2f}")
+
+        print(f"\n[INFO] Results written to '{results_file}'.")
 
     except Exception as e:
-        print(f"\n\033[1;31m[ERROR] An error occurred while writing to '{results_folder}/content_comparison.csv': {e}\033[0m")
-    
-    match_count = sum(1 for result in results if result["match"])
+        print(f"\n\033[1;31m[ERROR] An error occurred while writing to '{results_file}': {e}\033[0m")
+
+    finally:
+        if fetch_executor:
+            fetch_executor.shutdown()
+
+    if store:
+        source_versions = {file.path: file.version for file in files_to_verify}
+
+        for result in new_results:
+            result["source_version"] = source_versions.get(result["path"])
+            result["target_version"] = target_files[result["path"]].version if target_files and result["path"] in target_files else None
+
+        save_content_results(store, store_scope, new_results)
+
+    elapsed_time = max(time.time() - start_time, 0.001)
+
+    print(f"\n[INFO] Comparison complete:")
+    print(f"• Files compared: {compared_count} ({len(stored_matches)} unchanged since verified, {len(metadata_results)} by metadata, {len(new_results) - len(metadata_results)} by content)")
+    print(f"• Errors encountered: {error_count}")
+    print(f"• Throughput: {compared_count / elapsed_time:.2f} files/second, {compared_bytes / 1024 / 1024 / elapsed_time:.2f} MB/second")
     
     return {
         "success": True,
-        "sample_size": len(results),
+        "sample_size": compared_count,
         "match_count": match_count,
-        "match_percentage": (match_count / len(results)) * 100 if results else 0,
-        "error_count": error_count
+        "match_percentage": (match_count / compared_count) * 100 if compared_count else 0,
+        "coverage_percentage": (compared_count / len(files)) * 100,
+        "error_count": error_count,
+        "stored_match_count": len(stored_matches),
+        "metadata_match_count": len(metadata_results),
+        "downloaded_count": len(new_results) - len(metadata_results),
+        "files_per_second": round(compared_count / elapsed_time, 2)
     }
 
 def compare_changesets(source_organization, source_project_name, source_header, 
                   target_organization, target_project_name, target_header, 
-                  results_folder, sample_size=50):
+                  results_folder, sample_size=None, store=None):
     """
-    This function compares recent changesets between a source and target TFVC repositories.
+    This function compares the changesets of a source and target TFVC repositories - the entire history, or the 'sample_size' most recent ones.
+    With a verification 'store', only the changesets created since the previous run are fetched.
+
+    Target changesets are matched to source changesets by the source references in their comments ('CHANGESET_COMMENT_PARSERS'),
+    and the result is a complete report of the matched, missing (gaps) and duplicated source changesets.
     """
-    print(f"[INFO] Comparing recent {sample_size} changesets...")
+    print(f"[INFO] Comparing {f'recent {sample_size}' if sample_size else 'all'} changesets...")
     
-    source_changesets = get_changesets(source_organization, source_project_name, source_header, sample_size)
-    target_changesets = get_changesets(target_organization, target_project_name, target_header, sample_size)
+    if store and not sample_size:
+        source_changesets = get_changesets_incrementally(store, source_organization, source_project_name, source_header)
+        target_changesets = get_changesets_incrementally(store, target_organization, target_project_name, target_header)
+
+    else:
+        source_changesets = get_changesets(source_organization, source_project_name, source_header, sample_size)
+        target_changesets = get_changesets(target_organization, target_project_name, target_header, sample_size)
     
     if not source_changesets or not target_changesets:
         return {"success": False, "error": "Failed to retrieve changesets"}
@@ -397,7 +1614,7 @@ def compare_changesets(source_organization, source_project_name, source_header,
     def normalize_comment_for_comparison(comment):
         """
         This function is a helper function that normalizes a comment string for more reliable comparison as follows:
-        • Removes or normalizes double quotes.
+        • Removes or normalizes double quotes (the migration replaces double quotes with single quotes, so both are removed).
         • Removes extra whitespace.
         • Handles truncation.
         """
@@ -405,81 +1622,69 @@ def compare_changesets(source_organization, source_project_name, source_header,
             return ""
         
         # Replaces double escaped quotes ("") with single quotes (") and then removes any remaining quotes.
-        normalized = comment.replace('""', '"').replace('"', '')
+        normalized = comment.replace('""', '"').replace('"', '').replace("'", '')
         
         # Remove extra whitespace and trim
         normalized = ' '.join(normalized.split())
         
         return normalized.strip()
 
-    # Creates a lookup dictionary of source changesets by ID and comment.
-    source_changesets_dictionary = {str(cs.get('changesetId')): {
+    # Creates a lookup dictionary of source changesets by ID.
+    source_changesets_dictionary = {cs.get('changesetId'): {
         'comment': cs.get('comment', ''),
         'author': cs.get('author', {}).get('displayName', ''),
         'date': cs.get('createdDate', '')
     } for cs in source_cs}
     
-    matched_ids = []  # Stores source changeset numbers that were found in the target.
-    migrated_changesets = []  # Stores target changeset numbers that reference source changesets.
+    target_changesets_by_source_id = {} # Maps each referenced source changeset ID to the target changesets that reference it.
+    unreferenced_target_changesets = [] # Target changesets without a source reference (e.g., manually created branches).
     match_details = [] # Stores detailed information about each match.
 
-    for target_changeset in target_cs:
+    for target_changeset in sorted(target_cs, key=lambda cs: cs.get('changesetId', 0)):
         target_changeset_comment = target_changeset.get('comment', '')
         target_changeset_id = target_changeset.get('changesetId', 'N/A')
-        
-        # Tries different regex patterns.
-        # Pattern 1: "Migrated from changeset no. {changeset_id}: {original_comment}"
-        pattern1 = re.match(r"Migrated from changeset no\. (\d+): (.*)", target_changeset_comment)
+        parsed_comment = parse_changeset_comment(target_changeset_comment)
+
+        if not parsed_comment:
+            unreferenced_target_changesets.append(target_changeset_id)
+            continue
+
+        source_ids, extracted_comment, match_type = parsed_comment
+
+        for source_id in source_ids:
+            target_changesets_by_source_id.setdefault(source_id, []).append(target_changeset_id)
 
-        # Pattern 2: "Migrated changeset no. {changeset_id} - recreated the 'branch' branch"
-        pattern2 = re.match(r"Migrated changeset no\. (\d+).*", target_changeset_comment)
-        
-        extracted_id = None
-        extracted_comment = None
-        match_type = None
-        
-        if pattern1:
-            extracted_id = pattern1.group(1)
-            extracted_comment = pattern1.group(2)
-            match_type = "full" # A 'full' match occurs when both the source changeset ID and comment are found in the target changeset comment.
-
-        elif pattern2:
-            extracted_id = pattern2.group(1)
-            match_type = "id_only" # An 'id_only' match occurs when only the source changeset ID is found in the target changeset comment.
-        
-        if extracted_id:
-            migrated_changesets.append(target_changeset_id)
-            
             # Checks whether this ID is among the source changesets.
-            if extracted_id in source_changesets_dictionary:
-                matched_ids.append(extracted_id)
-                
-                # Prepare match details for CSV
-                source_comment = source_changesets_dictionary[extracted_id]['comment']
-                comment_match = False
-                
-                if match_type == "full" and extracted_comment:
-                    normalized_source = normalize_comment_for_comparison(source_comment)
-                    normalized_extracted = normalize_comment_for_comparison(extracted_comment)
-                    # Checks whether the extracted comment is contained in the source comment.
-                    if (normalized_source in normalized_extracted or 
-                        normalized_extracted in normalized_source or
-                        normalized_source.startswith(normalized_extracted) or 
-                        normalized_extracted.startswith(normalized_source)):
-                        comment_match = True
-                
-                match_details.append({
-                    "source_id": extracted_id,
-                    "target_id": target_changeset_id,
-                    "match_type": match_type,
-                    "source_comment": source_comment,
-                    "target_comment": target_changeset_comment,
-                    "extracted_comment": extracted_comment if extracted_comment else "N/A",
-                    "comment_match": comment_match
-                })
-    
-    # Counts unique source changesets that were matched.
-    unique_matched_ids = set(matched_ids)
+            if source_id not in source_changesets_dictionary:
+                continue
+
+            source_comment = source_changesets_dictionary[source_id]['comment']
+            comment_match = False
+            
+            if match_type == "full" and extracted_comment:
+                normalized_source = normalize_comment_for_comparison(source_comment)
+                normalized_extracted = normalize_comment_for_comparison(extracted_comment)
+                # Checks whether the extracted comment is contained in the source comment.
+                if (normalized_source in normalized_extracted or 
+                    normalized_extracted in normalized_source or
+                    normalized_source.startswith(normalized_extracted) or 
+                    normalized_extracted.startswith(normalized_source)):
+                    comment_match = True
+            
+            match_details.append({
+                "source_id": source_id,
+                "target_id": target_changeset_id,
+                "match_type": match_type,
+                "source_comment": source_comment,
+                "target_comment": target_changeset_comment,
+                "extracted_comment": extracted_comment if extracted_comment else "N/A",
+                "comment_match": comment_match
+            })
+
+    matched_ids = {source_id for source_id in target_changesets_by_source_id if source_id in source_changesets_dictionary}
+    missing_ids = sorted(source_id for source_id in source_changesets_dictionary if source_id not in matched_ids)
+    duplicate_ids = sorted(source_id for source_id in matched_ids if len(target_changesets_by_source_id[source_id]) > 1)
+    unknown_ids = sorted(source_id for source_id in target_changesets_by_source_id if source_id not in source_changesets_dictionary)
     
     # Outputs the results to a CSV file.
     with open(f"{results_folder}/changeset_comparison.csv", "w", newline='') as f:
@@ -491,50 +1696,378 @@ def compare_changesets(source_organization, source_project_name, source_header,
             writer.writerow([
                 match["source_id"],
                 match["target_id"],
-                match["match_type"],
+                "duplicate" if match["source_id"] in duplicate_ids else match["match_type"],
                 match["source_comment"],
                 match["target_comment"],
                 match["extracted_comment"],
                 match["comment_match"]
             ])
         
-        # Writes any source changesets that were not matched.
-        for source_id, source_data in source_changesets_dictionary.items():
-            if source_id not in matched_ids:
-                writer.writerow([
-                    source_id,
-                    "NOT FOUND",
-                    "no_match",
-                    source_data["comment"],
-                    "N/A",
-                    "N/A",
-                    "False"
-                ])
+        # Writes the source changesets that were not matched (gaps).
+        for source_id in missing_ids:
+            writer.writerow([source_id, "NOT FOUND", "no_match", source_changesets_dictionary[source_id]["comment"], "N/A", "N/A", "False"])
+
+        # Writes the target changesets that reference unknown source changesets.
+        for source_id in unknown_ids:
+            for target_changeset_id in target_changesets_by_source_id[source_id]:
+                writer.writerow([source_id, target_changeset_id, "unknown_source", "N/A", "N/A", "N/A", "False"])
+
+    # Gaps are reported as ranges of consecutive missing source changesets (in the source history order).
+    source_positions = {source_id: position for position, source_id in enumerate(sorted(source_changesets_dictionary))}
+    gap_ranges = []
+
+    for source_id in missing_ids:
+        if gap_ranges and source_positions[source_id] == source_positions[gap_ranges[-1][1]] + 1:
+            gap_ranges[-1][1] = source_id
+
+        else:
+            gap_ranges.append([source_id, source_id])
+
+    with open(f"{results_folder}/changeset_gaps.csv", "w", newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Type", "From Source ID", "To Source ID", "Count", "Target IDs"])
+
+        for first_id, last_id in gap_ranges:
+            writer.writerow(["GAP", first_id, last_id, source_positions[last_id] - source_positions[first_id] + 1, "N/A"])
+
+        for source_id in duplicate_ids:
+            writer.writerow(["DUPLICATE", source_id, source_id, len(target_changesets_by_source_id[source_id]), ' '.join(map(str, target_changesets_by_source_id[source_id]))])
     
     # Calculates match percentages.
-    id_match_percentage = (len(unique_matched_ids) / source_changesets_count) * 100 if source_changesets_count > 0 else 0
+    id_match_percentage = (len(matched_ids) / source_changesets_count) * 100 if source_changesets_count > 0 else 0
     
-    # Counts full matches (id + comment match).
-    full_matches = sum(1 for match in match_details if match["comment_match"])
+    # Counts full matches (id + comment match) - once per source changeset.
+    full_matches = len({match["source_id"] for match in match_details if match["comment_match"]})
     full_match_percentage = (full_matches / source_changesets_count) * 100 if source_changesets_count > 0 else 0
     
     return {
         "success": True,
         "source_count": source_changesets_count,
         "target_count": target_changesets_count,
-        "matched_source_ids": len(unique_matched_ids),
-        "migrated_target_changesets": len(migrated_changesets),
+        "matched_source_ids": len(matched_ids),
+        "migrated_target_changesets": target_changesets_count - len(unreferenced_target_changesets),
         "full_matches": full_matches,
         "id_match_percentage": id_match_percentage,
         "full_match_percentage": full_match_percentage,
-        "unmatched_source_ids": [id for id in source_changesets_dictionary.keys() if id not in unique_matched_ids]
+        "unmatched_source_ids": [str(source_id) for source_id in missing_ids],
+        "gap_count": len(gap_ranges),
+        "duplicate_source_ids": [str(source_id) for source_id in duplicate_ids],
+        "unknown_source_ids": [str(source_id) for source_id in unknown_ids]
+    }
+
+def get_migrated_changeset_mapping(organization, project_name, tfvc_path, authentication_header):
+    """
+    This function maps source changesets to the target changesets they were migrated into, by the source references in their
+    comments ('CHANGESET_COMMENT_PARSERS').
+
+    A coalesced group ('#<id1>,#<id2>: ...') is checked in at the state of its last changeset, so only its last changeset is mapped.
+
+    Returns: Dictionary {source_changeset_id: target_changeset_id}, or None if the target changesets could not be retrieved.
+    """
+    url = f"{organization}/{project_name}/_apis/tfvc/changesets"
+
+    headers = {
+        "Accept": "application/json"
+    }
+    headers.update(authentication_header)
+
+    changeset_mapping = {}
+    fetched_count = 0
+    page_size = 1000
+
+    try:
+        while True:
+            params = {
+                "api-version": "7.1",
+                "searchCriteria.itemPath": tfvc_path,
+                "$top": page_size,
+                "$skip": fetched_count,
+                "maxCommentLength": 2048
+            }
+
+            response = get_session().get(url, headers=headers, params=params)
+
+            if response.status_code != 200:
+                print(f"\033[1;31m[ERROR] Failed to fetch changesets.\033[0m")
+                print(f"[DEBUG] Request's Status Code: {response.status_code}")
+                print(f"[DEBUG] Response: {response.text}")
+                return None
+
+            changesets = response.json().get('value', [])
+            fetched_count += len(changesets)
+
+            for changeset in changesets:
+                parsed_comment = parse_changeset_comment(changeset.get('comment', ''))
+
+                if parsed_comment:
+                    source_id = parsed_comment[0][-1]
+
+                    # The most recent target changeset wins (e.g., a changeset that was migrated again after a failure).
+                    changeset_mapping[source_id] = max(changeset_mapping.get(source_id, 0), changeset['changesetId'])
+
+            if len(changesets) < page_size:
+                break
+
+    except requests.exceptions.RequestException as e:
+        print(f"\033[1;31m[ERROR] An error occurred while fetching changesets: {e}\033[0m")
+        return None
+
+    return changeset_mapping
+
+def select_verification_changesets(source_changeset_ids, sample_size, strategy):
+    """
+    This function selects the source changesets whose versions are verified.
+
+    • "uniform" - evenly spaced over the history (always including the first and the last changeset).
+    • "random" - a random sample.
+    • "latest" - the most recent changesets.
+    """
+    source_changeset_ids = sorted(source_changeset_ids)
+
+    if len(source_changeset_ids) <= sample_size:
+        return source_changeset_ids
+
+    if strategy == "random":
+        return sorted(random.sample(source_changeset_ids, sample_size))
+
+    if strategy == "latest":
+        return source_changeset_ids[-sample_size:]
+
+    if sample_size == 1:
+        return source_changeset_ids[-1:]
+
+    step = (len(source_changeset_ids) - 1) / (sample_size - 1)
+
+    return sorted({source_changeset_ids[round(index * step)] for index in range(sample_size)})
+
+def compare_tree_versions(source_organization, source_project_name, source_header, source_tfvc_path, source_changeset_id,
+                          target_organization, target_project_name, target_header, target_tfvc_path, target_changeset_id):
+    """
+    This function compares the trees of a source and target TFVC repositories at specific changesets, by their paths and files' hashes and sizes.
+
+    Returns: List of differences [(status, source_tfvc_path), ...], or None if either tree could not be listed.
+    """
+    source_tfvc_items = get_items(source_organization, source_project_name, source_tfvc_path, source_header, version=source_changeset_id)
+    target_tfvc_items = get_items(target_organization, target_project_name, target_tfvc_path, target_header, version=target_changeset_id)
+
+    if source_tfvc_items is None or target_tfvc_items is None:
+        return None
+
+    source_dictionary = {item.path: item for item in source_tfvc_items if not is_excluded_path(item.path, source_tfvc_path)}
+    target_dictionary = {item.path.replace(target_tfvc_path, source_tfvc_path): item
+                         for item in target_tfvc_items if not is_excluded_path(item.path, target_tfvc_path)}
+
+    differences = [("MISSING FROM TARGET", path) for path in source_dictionary.keys() - target_dictionary.keys()]
+    differences += [("EXTRA IN TARGET", path) for path in target_dictionary.keys() - source_dictionary.keys()]
+
+    for path in source_dictionary.keys() & target_dictionary.keys():
+        source_item = source_dictionary[path]
+        target_item = target_dictionary[path]
+
+        if not source_item.is_folder and (source_item.hash != target_item.hash or source_item.size != target_item.size):
+            differences.append(("DIFFERENT", path))
+
+    return sorted(differences, key=lambda difference: difference[1])
+
+def verify_point_in_time(source_organization, source_project_name, source_header, source_tfvc_path,
+                         target_organization, target_project_name, target_header, target_tfvc_path,
+                         results_folder, sample_size=10, strategy="uniform", workers=4):
+    """
+    This function verifies the migrated history - the source tree at sampled changesets is compared with the target tree at the
+    target changesets they were migrated into, so a version that was corrupted during the replay (and fixed later) is detected as well.
+    The versions are verified in parallel.
+    """
+    print(f"[INFO] Verifying the trees at {sample_size} sampled changeset versions ('{strategy}' sampling)...")
+
+    changeset_mapping = get_migrated_changeset_mapping(target_organization, target_project_name, target_tfvc_path, target_header)
+
+    if not changeset_mapping:
+        return {"success": False, "error": "Failed to map source changesets to target changesets"}
+
+    verified_changesets = select_verification_changesets(changeset_mapping.keys(), sample_size, strategy)
+    results = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(compare_tree_versions, source_organization, source_project_name, source_header, source_tfvc_path, source_changeset_id,
+                            target_organization, target_project_name, target_header, target_tfvc_path, changeset_mapping[source_changeset_id]): source_changeset_id
+            for source_changeset_id in verified_changesets
+        }
+
+        for future in tqdm.tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc="Verifying versions"):
+            results[futures[future]] = future.result()
+
+    # Outputs the results to a CSV file.
+    with open(f"{results_folder}/point_in_time_comparison.csv", "w", newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Source Changeset", "Target Changeset", "Status", "TFVC Path"])
+
+        for source_changeset_id in sorted(results):
+            target_changeset_id = changeset_mapping[source_changeset_id]
+            differences = results[source_changeset_id]
+
+            if differences is None:
+                writer.writerow([source_changeset_id, target_changeset_id, "ERROR", "Failed to list the trees"])
+
+            elif not differences:
+                writer.writerow([source_changeset_id, target_changeset_id, "IDENTICAL", "N/A"])
+
+            for status, path in differences or []:
+                writer.writerow([source_changeset_id, target_changeset_id, status, path])
+
+    matching_versions = [source_changeset_id for source_changeset_id, differences in results.items() if differences == []]
+    failed_versions = [source_changeset_id for source_changeset_id, differences in results.items() if differences is None]
+
+    return {
+        "success": True,
+        "verified_count": len(results),
+        "matching_count": len(matching_versions),
+        "error_count": len(failed_versions),
+        "mismatching_changesets": sorted(str(source_changeset_id) for source_changeset_id, differences in results.items() if differences)
+    }
+
+def translate_changeset_version(source_version, changeset_mapping, mapped_source_ids):
+    """
+    This function translates a source changeset version into the target changeset that holds the same state.
+
+    The version is mapped by the first migrated source changeset at or after it, since a coalesced group is mapped by its last changeset.
+
+    Returns: The target changeset ID, or None if the version is later than every migrated changeset.
+    """
+    index = bisect.bisect_left(mapped_source_ids, source_version)
+
+    return changeset_mapping[mapped_source_ids[index]] if index < len(mapped_source_ids) else None
+
+def compare_label_items(label_name, source_label_items, target_label_items, source_tfvc_path, target_tfvc_path, changeset_mapping, mapped_source_ids):
+    """
+    This function compares the items (paths and versions) of a label in the source and target repositories.
+
+    Only the items beneath the verified paths (that are not excluded) are compared; the source versions are translated into the
+    target changesets before they are compared.
+
+    Returns: List of mismatches [(label_name, mismatch_type, path, source_version, expected_target_version, target_version), ...].
+    """
+    source_items = {path: version for path, version in source_label_items.items()
+                    if is_beneath_path(path, source_tfvc_path) and not is_excluded_path(path, source_tfvc_path)}
+
+    # Normalizes the target paths by replacing the target root path with the source root path.
+    target_items = {source_tfvc_path + path[len(target_tfvc_path):]: version for path, version in target_label_items.items()
+                    if is_beneath_path(path, target_tfvc_path)}
+
+    mismatches = []
+
+    for path, source_version in sorted(source_items.items()):
+        if path not in target_items:
+            mismatches.append((label_name, "MISSING FROM TARGET LABEL", path, source_version, "N/A", "N/A"))
+            continue
+
+        expected_version = translate_changeset_version(source_version, changeset_mapping, mapped_source_ids)
+
+        if expected_version is None:
+            mismatches.append((label_name, "UNMAPPED VERSION", path, source_version, "N/A", target_items[path]))
+
+        elif expected_version != target_items[path]:
+            mismatches.append((label_name, "WRONG VERSION", path, source_version, expected_version, target_items[path]))
+
+    for path in sorted(target_items.keys() - source_items.keys()):
+        mismatches.append((label_name, "EXTRA IN TARGET LABEL", path, "N/A", "N/A", target_items[path]))
+
+    return mismatches
+
+def verify_label_items(source_organization, source_project_name, source_header, source_tfvc_path, source_labels,
+                       target_organization, target_project_name, target_header, target_tfvc_path, target_labels,
+                       results_folder, workers=LABEL_VERIFICATION_WORKERS):
+    """
+    This function verifies that every label of both repositories points at the same items, at the same (translated) versions.
+
+    The labels are verified concurrently by a pool of workers (with a bounded number of labels in flight), and the item lists of the
+    source and target sides of each label are fetched concurrently.
+
+    Returns: Dictionary {"success": ..., "verified_count": ..., "mismatching_labels": [...], "mismatch_count": ...}.
+    """
+    print(f"[INFO] Verifying the items of {len(source_labels)} labels ({workers} workers)...")
+
+    changeset_mapping = get_migrated_changeset_mapping(target_organization, target_project_name, target_tfvc_path, target_header)
+
+    if changeset_mapping is None:
+        return {"success": False, "error": "Failed to map source changesets to target changesets"}
+
+    mapped_source_ids = sorted(changeset_mapping)
+    mismatching_labels = []
+    mismatch_count = 0
+    failed_labels = []
+
+    def verify_label(name, fetch_executor):
+        """
+        This function is a helper function that fetches the items of a label on both sides (concurrently) and compares them.
+
+        Returns: Tuple (name, mismatches), where mismatches is None if the items could not be retrieved.
+        """
+        target_future = fetch_executor.submit(get_label_items, target_organization, target_project_name, target_labels[name]['id'], target_header)
+        source_label_items = get_label_items(source_organization, source_project_name, source_labels[name]['id'], source_header)
+        target_label_items = target_future.result()
+
+        if source_label_items is None or target_label_items is None:
+            return name, None
+
+        return name, compare_label_items(name, source_label_items, target_label_items, source_tfvc_path, target_tfvc_path,
+                                         changeset_mapping, mapped_source_ids)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as verify_executor, \
+         concurrent.futures.ThreadPoolExecutor(max_workers=workers) as fetch_executor, \
+         open(f"{results_folder}/label_items_comparison.csv", "w", newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Label Name", "Type", "Path", "Source Version", "Expected Target Version", "Target Version"])
+
+        label_names = iter(sorted(source_labels))
+        pending_labels = set()
+
+        with tqdm.tqdm(total=len(source_labels), desc="Verifying labels", unit="label") as progress_bar:
+            while True:
+                # Keeps a bounded number of labels in flight, so memory usage does not grow with the number of labels.
+                for name in label_names:
+                    pending_labels.add(verify_executor.submit(verify_label, name, fetch_executor))
+
+                    if len(pending_labels) >= workers * 2:
+                        break
+
+                if not pending_labels:
+                    break
+
+                completed_labels, pending_labels = concurrent.futures.wait(pending_labels, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in completed_labels:
+                    name, mismatches = future.result()
+
+                    if mismatches is None:
+                        failed_labels.append(name)
+                        writer.writerow([name, "FAILED TO RETRIEVE ITEMS", "N/A", "N/A", "N/A", "N/A"])
+
+                    elif mismatches:
+                        mismatching_labels.append(name)
+                        mismatch_count += len(mismatches)
+                        writer.writerows(mismatches)
+
+                progress_bar.update(len(completed_labels))
+
+    print(f"[INFO] {len(mismatching_labels)} of {len(source_labels)} labels have mismatching items ({mismatch_count} mismatches); "
+          f"the items of {len(failed_labels)} labels could not be retrieved.")
+
+    return {
+        "success": not failed_labels,
+        "verified_count": len(source_labels) - len(failed_labels),
+        "mismatching_labels": sorted(mismatching_labels),
+        "mismatch_count": mismatch_count
     }
 
 def compare_labels(source_organization, source_project_name, source_header, # REVIEW.
                    target_organization, target_project_name, target_headers, 
-                   results_folder):
+                   results_folder, source_tfvc_path=None, target_tfvc_path=None):
     """
     This function compares labels between a source and target TFVC repositories.
+
+    When 'DEEP_LABEL_VERIFICATION' is enabled (and the verified paths are provided), the items of the labels that exist in both
+    repositories are compared as well (see 'verify_label_items').
     """
     print(f"[INFO] Comparing repository labels...")
     
@@ -576,7 +2109,7 @@ def compare_labels(source_organization, source_project_name, source_header, # RE
             for name in extra_labels:
                 writer.writerow(["EXTRA IN TARGET", name, target_labels_dictionary[name].get('owner', {}).get('displayName', 'N/A')])
     
-    return {
+    label_comparison_results = {
         "success": True,
         "source_count": source_labels_count,
         "target_count": target_labels_count,
@@ -585,6 +2118,17 @@ def compare_labels(source_organization, source_project_name, source_header, # RE
         "matching_count": len(source_names.intersection(target_names))
     }
 
+    if DEEP_LABEL_VERIFICATION and source_tfvc_path and target_tfvc_path:
+        matching_names = source_names.intersection(target_names)
+
+        label_comparison_results["items"] = verify_label_items(source_organization, source_project_name, source_header, source_tfvc_path,
+                                                               {name: source_labels_dictionary[name] for name in matching_names},
+                                                               target_organization, target_project_name, target_headers, target_tfvc_path,
+                                                               {name: target_labels_dictionary[name] for name in matching_names},
+                                                               results_folder)
+
+    return label_comparison_results
+
 def output_summary_report(results, results_folder):
     """
     Write verification summary to JSON file and print to console.
@@ -613,7 +2157,7 @@ def output_summary_report(results, results_folder):
     print(f"└──Extra TFVC Items: {results['structure']['extra']}")
     
     print("\nContent Check:", "✅ PASSED" if content_result else "❌ FAILED")
-    print(f"├──Sample Size: {results['content']['sample_size']}")
+    print(f"├──Sample Size: {results['content']['sample_size']} ({results['content']['coverage_percentage']:.2f}% of the files)")
     print(f"└──Match Percentage: {results['content']['match_percentage']:.2f}%")
     
     print("\nChangesets Check:", "✅ PASSED" if changesets_result else "❌ FAILED")
@@ -622,22 +2166,35 @@ def output_summary_report(results, results_folder):
     print(f"├──Matched Source IDs: {results['changesets']['matched_source_ids']} ({results['changesets']['id_match_percentage']:.2f}%)")
     print(f"├──Full Matches (changeset id + changeset comment): {results['changesets']['full_matches']} ({results['changesets']['full_match_percentage']:.2f}%)")
     
+    print(f"├──Duplicated Source IDs: {', '.join(results['changesets']['duplicate_source_ids'][:20]) or 'None'}")
+    
     if "unmatched_source_ids" in results["changesets"] and results["changesets"]["unmatched_source_ids"]:
-        print(f"└──Unmatched Source IDs: {', '.join(results['changesets']['unmatched_source_ids'])}")
+        unmatched_source_ids = results['changesets']['unmatched_source_ids']
+        print(f"└──Unmatched Source IDs ({results['changesets']['gap_count']} gaps): {', '.join(unmatched_source_ids[:20])}{' ...' if len(unmatched_source_ids) > 20 else ''}")
     
 
     print("\nLabels Check:", "✅ PASSED" if labels_result else "❌ FAILED")
     print(f"├──Source Labels: {results['labels']['source_count']}")
     print(f"├──Target Labels: {results['labels']['target_count']}")
     print(f"├──Missing Labels: {results['labels']['missing']}")
-    print(f"└──Extra Labels: {results['labels']['extra']}")
+    print(f"├──Extra Labels: {results['labels']['extra']}")
+
+    mismatching_labels = results['labels']['mismatching_labels']
+    print(f"└──Labels With Mismatching Items ({results['labels']['item_mismatches']} mismatches): {', '.join(mismatching_labels[:20]) or 'None'}{' ...' if len(mismatching_labels) > 20 else ''}")
+
+    if "point_in_time" in results:
+        print("\nPoint-in-Time Check:", "✅ PASSED" if results["point_in_time"]["passed"] else "❌ FAILED")
+        print(f"├──Verified Versions: {results['point_in_time']['verified_count']}")
+        print(f"├──Matching Versions: {results['point_in_time']['matching_count']}")
+        print(f"└──Mismatching Source Changesets: {', '.join(results['point_in_time']['mismatching_changesets']) or 'None'}")
     
     print(f"\nDetailed results saved in the '{os.path.dirname(os.path.abspath(__file__))}' folder.")
 
 def tfvc_codebase_verification(source_organization, source_project_name, source_header, source_tfvc_path,
                      target_organization, target_project_name, target_header, target_tfvc_path):
     """
-    This function verifies a TFVC-to-TFVC migration by comparing the structure, content, changesets, and labels.
+    This function verifies a TFVC-to-TFVC migration by comparing the structure, content, changesets, and labels
+    (and the trees at sampled historical versions, if 'POINT_IN_TIME_SAMPLE_SIZE' is set).
     """
     ascii_art = pyfiglet.figlet_format("by codewizard", font="ogre")
     print(ascii_art)
@@ -654,26 +2211,43 @@ def tfvc_codebase_verification(source_organization, source_project_name, source_
     # Gets the script's directory to save the CSV files there.
     results_folder = os.path.dirname(os.path.abspath(__file__))
     
-    structure_comparison_results = compare_structure(source_organization, source_project_name, source_header, source_tfvc_path,
-                                          target_organization, target_project_name, target_header, target_tfvc_path, results_folder)
+    structure_comparison = compare_structure_digests if STRUCTURE_COMPARISON_MODE == "digest" else compare_structure
+    structure_comparison_results = structure_comparison(source_organization, source_project_name, source_header, source_tfvc_path,
+                                              target_organization, target_project_name, target_header, target_tfvc_path, results_folder)
     
+    store = open_verification_store()
+
     content_comparison_results = sample_content(source_organization, source_project_name, source_header, source_tfvc_path,
-                                     target_organization, target_project_name, target_header, target_tfvc_path, results_folder, 30)
+                                     target_organization, target_project_name, target_header, target_tfvc_path, results_folder, CONTENT_SAMPLE_SIZE,
+                                     store=store)
     
     changeset_comparison_results = compare_changesets(source_organization, source_project_name, source_header,
-                                           target_organization, target_project_name, target_header, results_folder, 30)
+                                           target_organization, target_project_name, target_header, results_folder, store=store)
     
     label_comparison_results = compare_labels(source_organization, source_project_name, source_header,
-                                   target_organization, target_project_name, target_header, results_folder)
+                                   target_organization, target_project_name, target_header, results_folder, source_tfvc_path, target_tfvc_path)
+
+    point_in_time_results = None
+
+    if POINT_IN_TIME_SAMPLE_SIZE:
+        point_in_time_results = verify_point_in_time(source_organization, source_project_name, source_header, source_tfvc_path,
+                                                     target_organization, target_project_name, target_header, target_tfvc_path,
+                                                     results_folder, POINT_IN_TIME_SAMPLE_SIZE, POINT_IN_TIME_STRATEGY, POINT_IN_TIME_WORKERS)
     
     # Determines if checks passed.
     structure_match = structure_comparison_results.get("missing_count", 1) == 0 if structure_comparison_results.get("success", False) else False
     content_match = content_comparison_results.get("match_percentage", 0) == 100 if content_comparison_results.get("success", False) else False
     changeset_match = changeset_comparison_results.get("id_match_percentage", 0) >= 87 if changeset_comparison_results.get("success", False) else False
     label_match = label_comparison_results.get("missing_count", 1) == 0 if label_comparison_results.get("success", False) else False
+    label_items_results = label_comparison_results.get("items")
+
+    if label_items_results is not None:
+        label_match = label_match and label_items_results.get("success", False) and not label_items_results["mismatching_labels"]
+    point_in_time_match = point_in_time_results is None or (point_in_time_results.get("success", False)
+                                                            and point_in_time_results["matching_count"] == point_in_time_results["verified_count"])
     
     # Calculates overall migration status.
-    verification_passed = structure_match and content_match and changeset_match and label_match
+    verification_passed = structure_match and content_match and changeset_match and label_match and point_in_time_match
     verification_duration = round(time.time() - start_time, 2)
     
     # Creates summary report.
@@ -690,6 +2264,7 @@ def tfvc_codebase_verification(source_organization, source_project_name, source_
         "content": {
             "passed": content_match,
             "sample_size": content_comparison_results.get("sample_size", 0),
+            "coverage_percentage": content_comparison_results.get("coverage_percentage", 0),
             "match_percentage": content_comparison_results.get("match_percentage", 0)
         },
         "changesets": {
@@ -700,20 +2275,254 @@ def tfvc_codebase_verification(source_organization, source_project_name, source_
             "full_matches": changeset_comparison_results.get("full_matches", 0),
             "id_match_percentage": changeset_comparison_results.get("id_match_percentage", 0),
             "full_match_percentage": changeset_comparison_results.get("full_match_percentage", 0),
-            "unmatched_source_ids": changeset_comparison_results.get("unmatched_source_ids", [])
+            "unmatched_source_ids": changeset_comparison_results.get("unmatched_source_ids", []),
+            "gap_count": changeset_comparison_results.get("gap_count", 0),
+            "duplicate_source_ids": changeset_comparison_results.get("duplicate_source_ids", [])
         },
         "labels": {
             "passed": label_match,
             "source_count": label_comparison_results.get("source_count", 0),
             "target_count": label_comparison_results.get("target_count", 0),
             "missing": label_comparison_results.get("missing_count", 0),
-            "extra": label_comparison_results.get("extra_count", 0)
+            "extra": label_comparison_results.get("extra_count", 0),
+            "mismatching_labels": label_items_results.get("mismatching_labels", []) if label_items_results else [],
+            "item_mismatches": label_items_results.get("mismatch_count", 0) if label_items_results else 0
         }
     }
+
+    if point_in_time_results is not None:
+        summary["point_in_time"] = {
+            "passed": point_in_time_match,
+            "verified_count": point_in_time_results.get("verified_count", 0),
+            "matching_count": point_in_time_results.get("matching_count", 0),
+            "mismatching_changesets": point_in_time_results.get("mismatching_changesets", [])
+        }
     
     output_summary_report(summary, results_folder)
+
+    if store:
+        store.execute("INSERT INTO verification_runs (verified_at, passed, summary) VALUES (?, ?, ?)",
+                      (time.strftime("%Y-%m-%d %H:%M:%S"), int(verification_passed), json.dumps(summary)))
+        store.commit()
+        store.close()
     
     return verification_passed
 
+def list_local_files(workspace_path):
+    """
+    This function lists the files and folders of a local workspace (skipping the TFS metadata folders and the excluded paths).
+
+    Returns: Tuple (files, folders, errors) - dictionary {relative_path: size_in_bytes} (None when the size could not be read),
+    set of the relative folder paths, and dictionary {relative_path: error} of the files and folders that could not be read
+    (relative paths use "/" separators, as TFVC paths do).
+    """
+    local_files = {}
+    local_folders = set()
+    errors = {}
+
+    def record_walk_error(error):
+        relative_path = os.path.relpath(error.filename, workspace_path).replace(os.sep, '/')
+        errors[relative_path] = str(error)
+
+    for directory, subdirectories, files in os.walk(workspace_path, onerror=record_walk_error):
+        relative_directory = os.path.relpath(directory, workspace_path).replace(os.sep, '/')
+        relative_directory = "" if relative_directory == "." else relative_directory
+
+        subdirectories[:] = [subdirectory for subdirectory in subdirectories if subdirectory not in ('.tf', '$tf')
+                             and not is_excluded_path(f"{relative_directory}/{subdirectory}", "")]
+        local_folders.update(f"{relative_directory}/{subdirectory}" if relative_directory else subdirectory for subdirectory in subdirectories)
+
+        for file in files:
+            relative_path = f"{relative_directory}/{file}" if relative_directory else file
+
+            if is_excluded_path(relative_path, ""):
+                continue
+
+            try:
+                local_files[relative_path] = os.path.getsize(os.path.join(directory, file))
+
+            except OSError as e:
+                local_files[relative_path] = None
+                errors[relative_path] = str(e)
+
+    return local_files, local_folders, errors
+
+def hash_local_file_pair(source_file, target_file):
+    """
+    This function computes the SHA-256 hashes of a source and target workspace file in chunks (it runs in a worker process).
+
+    Returns: Tuple (source_hash, target_hash, error) - the hashes are None (and 'error' is set) if a file could not be read
+    (e.g., a locked file or a path beyond the Windows path length limit).
+    """
+    file_hashes = []
+
+    for file_path in (source_file, target_file):
+        content_hash = hashlib.sha256()
+
+        try:
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    content_hash.update(chunk)
+
+        except OSError as e:
+            return None, None, str(e)
+
+        file_hashes.append(content_hash.hexdigest())
+
+    return file_hashes[0], file_hashes[1], None
+
+def compare_local_workspaces(source_workspace_path, target_workspace_path, results_folder, workers=LOCAL_HASHING_WORKERS):
+    """
+    This function compares the structure (files and folders, including empty folders) and the content of every file of the local
+    source and target workspaces (no API calls are made).
+
+    Files with different sizes are different without hashing them; the other files are hashed in parallel by a pool of worker processes.
+    Files and folders that could not be read are reported as errors (and counted as differences), without stopping the comparison.
+    Both workspaces have to be at the compared version (e.g., 'tf get' of the latest version) before the comparison.
+    """
+    print(f"[INFO] Comparing the local workspaces '{source_workspace_path}' and '{target_workspace_path}'...")
+
+    source_files, source_folders, source_errors = list_local_files(source_workspace_path)
+    target_files, target_folders, target_errors = list_local_files(target_workspace_path)
+
+    missing_files = sorted(source_files.keys() - target_files.keys())
+    extra_files = sorted(target_files.keys() - source_files.keys())
+    common_files = sorted(source_files.keys() & target_files.keys())
+    missing_folders = sorted(source_folders - target_folders)
+    extra_folders = sorted(target_folders - source_folders)
+
+    # Unreadable files (and folders whose content could not be listed) of either workspace.
+    error_paths = {path: f"Target: {error}" for path, error in target_errors.items()}
+    error_paths.update({path: f"Source: {error}" for path, error in source_errors.items()})
+    readable_files = [path for path in common_files if source_files[path] is not None and target_files[path] is not None]
+
+    different_size_files = [path for path in readable_files if source_files[path] != target_files[path]]
+    files_to_hash = [path for path in readable_files if source_files[path] == target_files[path]]
+    hashed_bytes = sum(source_files[path] * 2 for path in files_to_hash)
+
+    print(f"[DEBUG] {len(common_files)} common files ({len(different_size_files)} with different sizes); hashing {len(files_to_hash)} file pairs "
+          f"({hashed_bytes / 1024 / 1024:.2f} MB) using {workers} worker processes...")
+
+    start_time = time.time()
+    different_content_files = []
+    hash_error_count = 0
+
+    with open(f"{results_folder}/local_workspace_comparison.csv", "w", newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Status", "Relative Path", "Source Hash", "Target Hash", "Error"])
+
+        for path in missing_files:
+            writer.writerow(["MISSING FROM TARGET", path, "N/A", "N/A", ""])
+
+        for path in extra_files:
+            writer.writerow(["EXTRA IN TARGET", path, "N/A", "N/A", ""])
+
+        for path in missing_folders:
+            writer.writerow(["FOLDER MISSING FROM TARGET", path, "N/A", "N/A", ""])
+
+        for path in extra_folders:
+            writer.writerow(["FOLDER EXTRA IN TARGET", path, "N/A", "N/A", ""])
+
+        for path in different_size_files:
+            writer.writerow(["DIFFERENT SIZE", path, "N/A", "N/A", ""])
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            file_hashes = executor.map(hash_local_file_pair,
+                                       [os.path.join(source_workspace_path, path) for path in files_to_hash],
+                                       [os.path.join(target_workspace_path, path) for path in files_to_hash],
+                                       chunksize=64)
+
+            for path, (source_hash, target_hash, error) in tqdm.tqdm(zip(files_to_hash, file_hashes), total=len(files_to_hash), desc="Hashing files", unit="file"):
+                if error:
+                    error_paths[path] = error
+                    hash_error_count += 1
+
+                elif source_hash != target_hash:
+                    different_content_files.append(path)
+                    writer.writerow(["DIFFERENT CONTENT", path, source_hash, target_hash, ""])
+
+        for path, error in sorted(error_paths.items()):
+            writer.writerow(["ERROR", path, "N/A", "N/A", error])
+
+    elapsed_time = max(time.time() - start_time, 0.001)
+    match_count = len(files_to_hash) - len(different_content_files) - hash_error_count
+
+    print(f"\n[INFO] Comparison complete:")
+    print(f"• Files compared: {len(common_files)}")
+    print(f"• Folders compared: {len(source_folders | target_folders)} ({len(missing_folders)} missing, {len(extra_folders)} extra)")
+    print(f"• Errors encountered: {len(error_paths)}")
+    print(f"• Throughput: {len(files_to_hash) / elapsed_time:.2f} file pairs/second, {hashed_bytes / 1024 / 1024 / elapsed_time:.2f} MB/second")
+
+    return {
+        "success": True,
+        "source_count": len(source_files),
+        "target_count": len(target_files),
+        "missing_count": len(missing_files),
+        "extra_count": len(extra_files),
+        "missing_folder_count": len(missing_folders),
+        "extra_folder_count": len(extra_folders),
+        "error_count": len(error_paths),
+        "different_count": len(different_size_files) + len(different_content_files) + len(error_paths),
+        "match_percentage": (match_count / len(common_files)) * 100 if common_files else 0
+    }
+
+def local_workspace_verification(source_workspace_path, target_workspace_path):
+    """
+    This function verifies a TFVC-to-TFVC migration by comparing the local source and target workspaces (structure and content of every file).
+    """
+    ascii_art = pyfiglet.figlet_format("by codewizard", font="ogre")
+    print(ascii_art)
+
+    start_time = time.time()
+
+    print("\n" + "\033[1m=\033[0m" * 100)
+    print("\033[1mSTARTING LOCAL WORKSPACE VERIFICATION\033[0m")
+    print("\033[1m=\033[0m" * 100)
+
+    # Gets the script's directory to save the CSV files there.
+    results_folder = os.path.dirname(os.path.abspath(__file__))
+
+    comparison_results = compare_local_workspaces(source_workspace_path, target_workspace_path, results_folder)
+
+    structure_match = comparison_results["missing_count"] == 0 and comparison_results["missing_folder_count"] == 0
+    content_match = comparison_results["different_count"] == 0
+    verification_passed = structure_match and content_match
+
+    summary = {
+        "verification_passed": verification_passed,
+        "duration_seconds": round(time.time() - start_time, 2),
+        "local_workspaces": comparison_results
+    }
+
+    with open(f"{results_folder}/verification_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print("\n" + "\033[1m=\033[0m" * 100)
+    print("\033[1mLOCAL WORKSPACE VERIFICATION RESULTS\033[0m")
+    print("\033[1m=\033[0m" * 100)
+
+    print(f"• Overall Verification: {'✅ PASSED' if verification_passed else '❌ FAILED'}")
+    print(f"• Verification Duration: {summary['duration_seconds']} seconds")
+
+    print("\nStructure Check:", "✅ PASSED" if structure_match else "❌ FAILED")
+    print(f"├──Source Files: {comparison_results['source_count']}")
+    print(f"├──Target Files: {comparison_results['target_count']}")
+    print(f"├──Missing Files: {comparison_results['missing_count']}")
+    print(f"├──Extra Files: {comparison_results['extra_count']}")
+    print(f"├──Missing Folders: {comparison_results['missing_folder_count']}")
+    print(f"└──Extra Folders: {comparison_results['extra_folder_count']}")
+
+    print("\nContent Check:", "✅ PASSED" if content_match else "❌ FAILED")
+    print(f"├──Different Files: {comparison_results['different_count']} ({comparison_results['error_count']} could not be read)")
+    print(f"└──Match Percentage: {comparison_results['match_percentage']:.2f}%")
+
+    print(f"\nDetailed results saved in the '{results_folder}' folder.")
+
+    return verification_passed
+
 if __name__ == "__main__":
-    tfvc_codebase_verification(SOURCE_ORGANIZATION, SOURCE_PROJECT, SOURCE_AUTHENTICATION_HEADER, "$/TFS-based test project", TARGET_ORGANIZATION, TARGET_PROJECT, TARGET_AUTHENTICATION_HEADER, "$/Magnolia")
\ No newline at end of file
+    if VERIFICATION_MODE == "local":
+        local_workspace_verification(LOCAL_SOURCE_PATH, LOCAL_TARGET_PATH)
+
+    else:
+        tfvc_codebase_verification(SOURCE_ORGANIZATION, SOURCE_PROJECT, SOURCE_AUTHENTICATION_HEADER, "$/TFS-based test project", TARGET_ORGANIZATION, TARGET_PROJECT, TARGET_AUTHENTICATION_HEADER, "$/Magnolia")
\ No newline at end of file